@@ -0,0 +1,236 @@
+"""
+Streamlit AppTest로 모든 페이지를 헤드리스로 실행해 스크립트 재실행(rerun) 시간과 최대 메모리를 측정합니다.
+Streamlit은 위젯을 조작할 때마다 스크립트 전체를 다시 실행하므로, 이 시간이 곧 사용자가 느끼는 응답 시간입니다.
+
+차트 다운샘플링(LTTB)은 종목이 많을 때의 비용을 따로 재어, 정해진 시간 안에 끝나는지 확인합니다.
+
+사용법 (저장소 루트에서 실행):
+    python benchmarks/bench_pages.py                    # 측정 후 baseline.json과 비교, 회귀가 있으면 종료 코드 1
+    python benchmarks/bench_pages.py --update-baseline  # 현재 측정값을 새 기준값으로 저장
+    python benchmarks/bench_pages.py --only 02          # 이름에 '02'가 들어간 시나리오만 측정
+
+주식 페이지는 네트워크 없이 측정할 수 있도록 로컬(합성 데이터) 제공자와 임시 가격 저장소를 사용합니다.
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+import warnings
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+BASELINE_PATH = Path(__file__).resolve().parent / "baseline.json"
+
+# utils 모듈이 환경 변수를 읽기 전에 오프라인 설정을 적용
+os.environ.setdefault("MARKET_DATA_PROVIDER", "local")
+os.environ.setdefault("WARMUP_ON_START", "0") # 백그라운드 예열 스레드가 측정에 끼어들지 않도록
+os.environ.setdefault("PRICE_STORE_DIR", tempfile.mkdtemp(prefix="bench_prices_"))
+sys.path.insert(0, str(REPO_ROOT)) # 페이지 스크립트가 utils 패키지를 찾을 수 있도록
+
+import streamlit as st # noqa: E402
+from streamlit.testing.v1 import AppTest # noqa: E402
+
+warnings.filterwarnings("ignore", message="Glyph .* missing from font") # matplotlib 한글 글꼴 경고 무시
+
+DEFAULT_TIMEOUT_SEC = 120
+TIME_TOLERANCE = 0.5 # 기준값보다 50% 이상 느려지면 회귀로 판단
+TIME_SLACK_SEC = 0.05 # 아주 짧은 단계의 측정 오차로 실패하지 않도록 허용하는 절대 차이
+MEMORY_TOLERANCE = 0.5
+MEMORY_SLACK_MB = 5.0
+
+# 차트 다운샘플링 측정: (종목 수, 종목당 점 개수). 주식 페이지의 최대 규모(1000종목)까지 확인
+DOWNSAMPLE_CASES = [(500, 5000), (1000, 5000)]
+DOWNSAMPLE_TIME_LIMIT_SEC = 2.0 # 이 시간을 넘으면 회귀로 판단 (느린 CI 머신을 고려한 여유 포함)
+
+
+def select(label, value, sidebar=False):
+    """라벨이 label인 selectbox의 값을 바꾸는 단계를 만듭니다."""
+    def action(at):
+        widgets = at.sidebar.selectbox if sidebar else at.selectbox
+        next(w for w in widgets if w.label == label).set_value(value)
+    return action
+
+
+def slide(key, value):
+    """키가 key인 slider의 값을 바꾸는 단계를 만듭니다."""
+    def action(at):
+        at.slider(key=key).set_value(value)
+    return action
+
+
+def map_page_steps():
+    return [
+        ("도시 선택: 샌프란시스코", select("도시 선택:", "샌프란시스코", sidebar=True)),
+        ("카테고리 선택: 맛집", select("카테고리 선택:", "맛집", sidebar=True)),
+        ("도시 선택: 전체", select("도시 선택:", "전체", sidebar=True)),
+    ]
+
+
+# 시나리오: (이름, 스크립트 경로, [(단계 이름, 위젯 조작 함수), ...])
+SCENARIOS = [
+    ("main", "main.py", map_page_steps()),
+    ("00_travel", "pages/00_캘리포니아 여행.py", map_page_steps()),
+    ("01_stocks", "pages/01_주식데이터시각화.py", [
+        ("기업 선택: NVIDIA", select("기업을 선택하세요:", "NVIDIA")),
+        ("기업 선택: Tesla", select("기업을 선택하세요:", "Tesla")),
+    ]),
+    ("02_photosynthesis", "pages/02_환경요인과 광합성.py", [
+        ("빛의 세기 800", slide("light_slider", 800)),
+        ("온도 30", slide("temp_slider", 30)),
+        ("CO2 600", slide("co2_slider", 600)),
+    ]),
+]
+
+
+def clear_caches():
+    st.cache_data.clear()
+    st.cache_resource.clear()
+
+
+def run_scenario(script, steps):
+    """처음 실행과 각 위젯 조작 후의 재실행을 차례로 수행하며 {단계 이름: 걸린 시간(초)}을 반환합니다."""
+    clear_caches()
+    timings = {}
+    at = AppTest.from_file(str(REPO_ROOT / script), default_timeout=DEFAULT_TIMEOUT_SEC)
+
+    start = time.perf_counter()
+    at.run()
+    timings["첫 실행"] = time.perf_counter() - start
+    check_no_exception(at, script, "첫 실행")
+
+    for step_name, action in steps:
+        action(at)
+        start = time.perf_counter()
+        at.run()
+        timings[step_name] = time.perf_counter() - start
+        check_no_exception(at, script, step_name)
+    return timings
+
+
+def check_no_exception(at, script, step_name):
+    if at.exception:
+        raise RuntimeError(f"{script} [{step_name}] 실행 중 예외 발생: {at.exception[0].value}")
+
+
+def measure(scenarios, repeats):
+    """시나리오마다 시간은 repeats번 측정한 중앙값을, 메모리는 별도 1회 실행의 최대 할당량을 기록합니다."""
+    results = {}
+    for name, script, steps in scenarios:
+        run_scenario(script, steps) # 워밍업: 모듈 import 등 프로세스당 한 번뿐인 비용을 측정에서 제외
+        runs = [run_scenario(script, steps) for _ in range(repeats)]
+        step_times = {step: statistics.median(run[step] for run in runs) for step in runs[0]}
+
+        # tracemalloc은 실행을 느리게 하므로 시간 측정과 분리해 한 번만 실행
+        tracemalloc.start()
+        run_scenario(script, steps)
+        _, peak_bytes = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        results[name] = {"steps": step_times, "peak_memory_mb": peak_bytes / 1024 / 1024}
+        print_scenario(name, results[name])
+    return results
+
+
+def measure_downsample(repeats):
+    """합성 가격으로 downsample_long을 repeats번 실행해 {케이스 이름: 중앙값(초)}을 반환합니다."""
+    import numpy as np
+    import pandas as pd
+    from utils.downsample import CHART_WIDTH_PX, downsample_long
+
+    results = {}
+    rng = np.random.default_rng(0)
+    print("\n▶ downsample (LTTB)")
+    for n_series, n_points in DOWNSAMPLE_CASES:
+        prices = pd.DataFrame(
+            100 * np.exp(np.cumsum(rng.normal(0, 0.02, size=(n_points, n_series)), axis=0)),
+            index=pd.bdate_range("2000-01-03", periods=n_points, name="Date"),
+            columns=[f"T{i:04d}" for i in range(n_series)],
+        )
+        prices.iloc[:n_points // 2, ::3] = np.nan # 상장일이 다른 종목 섞기
+        timings = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            downsample_long(prices, CHART_WIDTH_PX) # 주식 페이지와 같은 시리즈당 점 개수
+            timings.append(time.perf_counter() - start)
+        name = f"{n_series}종목 x {n_points}점"
+        results[name] = statistics.median(timings)
+        print(f"    {name:<24} {results[name] * 1000:8.1f} ms")
+    return results
+
+
+def find_slow_downsample(results):
+    return [
+        f"downsample [{name}]: {seconds * 1000:.1f} ms > 제한 {DOWNSAMPLE_TIME_LIMIT_SEC * 1000:.0f} ms"
+        for name, seconds in results.items() if seconds > DOWNSAMPLE_TIME_LIMIT_SEC
+    ]
+
+
+def print_scenario(name, result):
+    print(f"\n▶ {name} (최대 메모리 {result['peak_memory_mb']:.1f} MB)")
+    for step, seconds in result["steps"].items():
+        print(f"    {step:<24} {seconds * 1000:8.1f} ms")
+
+
+def find_regressions(results, baseline):
+    """기준값보다 허용 범위를 넘어 느려지거나 메모리를 더 쓰는 항목을 찾아 설명 문자열 목록으로 반환합니다."""
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        base = baseline[name]
+        for step, seconds in result["steps"].items():
+            base_seconds = base["steps"].get(step)
+            if base_seconds is None:
+                continue
+            if seconds > base_seconds * (1 + TIME_TOLERANCE) and seconds - base_seconds > TIME_SLACK_SEC:
+                regressions.append(f"{name} [{step}]: {base_seconds * 1000:.1f} ms → {seconds * 1000:.1f} ms")
+        base_memory = base["peak_memory_mb"]
+        memory = result["peak_memory_mb"]
+        if memory > base_memory * (1 + MEMORY_TOLERANCE) and memory - base_memory > MEMORY_SLACK_MB:
+            regressions.append(f"{name} [최대 메모리]: {base_memory:.1f} MB → {memory:.1f} MB")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Streamlit 페이지 재실행 벤치마크")
+    parser.add_argument("--repeats", type=int, default=3, help="시간 측정 반복 횟수 (중앙값 사용)")
+    parser.add_argument("--only", help="이름에 이 문자열이 포함된 시나리오만 실행")
+    parser.add_argument("--update-baseline", action="store_true", help="측정값을 baseline.json에 저장")
+    parser.add_argument("--output", help="측정 결과를 저장할 JSON 파일 경로")
+    args = parser.parse_args()
+
+    scenarios = [s for s in SCENARIOS if not args.only or args.only in s[0]]
+    results = measure(scenarios, args.repeats)
+    downsample_results = measure_downsample(args.repeats) if not args.only or args.only in "downsample" else {}
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, ensure_ascii=False, indent=2), encoding="utf-8")
+
+    if args.update_baseline:
+        baseline = json.loads(BASELINE_PATH.read_text(encoding="utf-8")) if BASELINE_PATH.exists() else {}
+        baseline.update(results)
+        BASELINE_PATH.write_text(json.dumps(baseline, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+        print(f"\n기준값을 저장했습니다: {BASELINE_PATH}")
+        return 0
+
+    if not BASELINE_PATH.exists():
+        print("\n기준값 파일이 없습니다. --update-baseline 으로 먼저 생성하세요.")
+        return 0
+
+    regressions = find_regressions(results, json.loads(BASELINE_PATH.read_text(encoding="utf-8")))
+    regressions += find_slow_downsample(downsample_results)
+    if regressions:
+        print("\n❌ 성능 회귀가 감지되었습니다:")
+        for line in regressions:
+            print(f"  - {line}")
+        return 1
+    print("\n✅ 기준값 대비 성능 회귀가 없습니다.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
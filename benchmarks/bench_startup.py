@@ -0,0 +1,152 @@
+"""
+새 프로세스에서 각 페이지를 처음 실행할 때의 시작 시간(콜드 스타트)을 측정합니다.
+컨테이너가 새로 뜨거나 사용자가 다른 페이지로 처음 이동할 때 겪는 시간으로, 모듈 import 비용이 대부분을 차지합니다.
+
+- 첫 화면 표시(time-to-first-paint): 스크립트 실행을 시작해 첫 요소(제목 등)를 브라우저로 보내기까지 걸린 시간
+- 전체 실행: 첫 실행이 끝나기까지 걸린 시간
+- import 프로파일(--profile): 페이지 실행 중에 새로 불러온 최상위 모듈과 누적 import 시간
+
+사용법 (저장소 루트에서 실행):
+    python benchmarks/bench_startup.py               # 모든 페이지 측정
+    python benchmarks/bench_startup.py --profile     # 페이지별로 오래 걸린 import도 함께 출력
+    python benchmarks/bench_startup.py --check       # main.py의 첫 화면 표시 시간이 목표를 넘으면 종료 코드 1 (CI용)
+"""
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+# main.py 첫 화면 표시 시간 목표. Streamlit 자체의 첫 실행 비용(빈 페이지도 약 0.3초)을 포함하며, 느린 CI 머신을 고려해 여유를 둠
+MAIN_FIRST_PAINT_TARGET_SEC = 0.5
+DEFAULT_TIMEOUT_SEC = 120
+
+PAGES = [
+    ("main", "main.py"),
+    ("00_travel", "pages/00_캘리포니아 여행.py"),
+    ("01_stocks", "pages/01_주식데이터시각화.py"),
+    ("02_photosynthesis", "pages/02_환경요인과 광합성.py"),
+]
+
+# 자식 프로세스에서 실행하는 측정 코드. Streamlit 자체를 불러온 뒤(서버가 이미 떠 있는 상태에 해당) 페이지를 한 번 실행함
+CHILD_CODE = """
+import json, sys, time
+import streamlit
+from streamlit.runtime.scriptrunner_utils.script_run_context import ScriptRunContext
+from streamlit.testing.v1 import AppTest
+
+first_delta = []
+_enqueue = ScriptRunContext.enqueue
+def enqueue(self, msg):
+    if not first_delta and msg.WhichOneof("type") == "delta":
+        first_delta.append(time.perf_counter())
+    return _enqueue(self, msg)
+ScriptRunContext.enqueue = enqueue
+
+script, timeout, MARKER = sys.argv[1], float(sys.argv[2]), sys.argv[3]
+at = AppTest.from_file(script, default_timeout=timeout)
+modules_before = set(sys.modules)
+sys.stderr.write("%s\\n" % MARKER)
+sys.stderr.flush()
+start = time.perf_counter()
+at.run()
+end = time.perf_counter()
+print(json.dumps({
+    "first_paint": first_delta[0] - start if first_delta else None,
+    "total": end - start,
+    "exception": at.exception[0].value if at.exception else None,
+    "new_modules": sorted({name.split(".")[0] for name in set(sys.modules) - modules_before}),
+}))
+"""
+
+RUN_MARKER = "--- page run ---" # 자식 프로세스가 페이지 실행 직전에 stderr로 찍는 표시 (이후의 import만 집계)
+IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def child_env():
+    env = dict(os.environ)
+    # 네트워크 없이, 백그라운드 예열 없이 페이지 스크립트만 측정
+    env.setdefault("MARKET_DATA_PROVIDER", "local")
+    env.setdefault("PRICE_STORE_DIR", tempfile.mkdtemp(prefix="bench_prices_"))
+    env.setdefault("WARMUP_ON_START", "0")
+    env.pop("PERF_TRACE", None)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(REPO_ROOT), env.get("PYTHONPATH")]))
+    return env
+
+
+def run_child(script, profile=False):
+    """새 파이썬 프로세스에서 script를 한 번 실행하고 측정 결과와 (profile이면) import 시간 표를 반환합니다."""
+    command = [sys.executable, *(["-X", "importtime"] if profile else []), "-c", CHILD_CODE,
+               str(REPO_ROOT / script), str(DEFAULT_TIMEOUT_SEC), RUN_MARKER]
+    proc = subprocess.run(command, cwd=REPO_ROOT, env=child_env(), capture_output=True, text=True, timeout=DEFAULT_TIMEOUT_SEC * 2)
+    if proc.returncode != 0:
+        raise RuntimeError(f"{script} 측정 실패:\n{proc.stderr[-2000:]}")
+    result = json.loads(proc.stdout.strip().splitlines()[-1])
+    if result["exception"]:
+        raise RuntimeError(f"{script} 실행 중 예외 발생: {result['exception']}")
+    if profile:
+        result["imports"] = top_level_imports(proc.stderr, set(result["new_modules"]))
+    return result
+
+
+def top_level_imports(importtime_log, packages):
+    """-X importtime 출력 중 페이지 실행 이후 부분에서, packages에 속한 최상위 import의 누적 시간(초)을 큰 순서로 반환합니다."""
+    cumulative = {}
+    importtime_log = importtime_log.split(RUN_MARKER, 1)[-1]
+    for _, cumulative_us, indent, name in IMPORTTIME_LINE.findall(importtime_log):
+        if len(indent) == 1 and name.split(".")[0] in packages:
+            cumulative[name] = cumulative.get(name, 0) + int(cumulative_us) / 1e6
+    return sorted(cumulative.items(), key=lambda item: item[1], reverse=True)
+
+
+def measure(pages, repeats, profile):
+    results = {}
+    for name, script in pages:
+        runs = [run_child(script) for _ in range(repeats)]
+        result = {
+            "first_paint": statistics.median(run["first_paint"] for run in runs),
+            "total": statistics.median(run["total"] for run in runs),
+        }
+        print(f"\n▶ {name}")
+        print(f"    첫 화면 표시              {result['first_paint'] * 1000:8.1f} ms")
+        print(f"    전체 실행                 {result['total'] * 1000:8.1f} ms")
+        if profile:
+            print("    오래 걸린 import:")
+            for module, seconds in run_child(script, profile=True)["imports"][:10]:
+                print(f"      {module:<28} {seconds * 1000:8.1f} ms")
+        results[name] = result
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Streamlit 페이지 콜드 스타트 측정")
+    parser.add_argument("--repeats", type=int, default=3, help="페이지별 측정 횟수 (중앙값 사용)")
+    parser.add_argument("--only", help="이름에 이 문자열이 포함된 페이지만 측정")
+    parser.add_argument("--profile", action="store_true", help="페이지별 import 시간 표 출력")
+    parser.add_argument("--check", action="store_true", help="main.py 첫 화면 표시 시간이 목표 이내인지 확인")
+    parser.add_argument("--output", help="측정 결과를 저장할 JSON 파일 경로")
+    args = parser.parse_args()
+
+    pages = [p for p in PAGES if (not args.only or args.only in p[0]) and (not args.check or p[0] == "main")]
+    results = measure(pages, args.repeats, args.profile)
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, ensure_ascii=False, indent=2), encoding="utf-8")
+
+    if args.check:
+        first_paint = results["main"]["first_paint"]
+        if first_paint > MAIN_FIRST_PAINT_TARGET_SEC:
+            print(f"\n❌ main.py 첫 화면 표시 {first_paint * 1000:.0f} ms > 목표 {MAIN_FIRST_PAINT_TARGET_SEC * 1000:.0f} ms")
+            return 1
+        print(f"\n✅ main.py 첫 화면 표시 {first_paint * 1000:.0f} ms ≤ 목표 {MAIN_FIRST_PAINT_TARGET_SEC * 1000:.0f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1 @@
+# pytest가 저장소 루트를 sys.path에 넣어 tests/에서 utils 패키지를 불러올 수 있도록 하는 파일
@@ -1,9 +1,10 @@
 import streamlit as st
-import folium
-from streamlit_folium import st_folium
-import pandas as pd # 데이터 관리를 위해 pandas 추가
+
+from utils.perf import start_rerun
+from utils.warmup import preload_modules
 
 st.set_page_config(page_title="캘리포니아 관광 가이드", layout="wide")
+perf = start_rerun("main") # 재실행 구간별 시간 측정 (PERF_TRACE=1 또는 ?perf=1 일 때만 동작)
 
 st.title("🌴 캘리포니아 관광 & 맛집 가이드")
 st.markdown("""
@@ -11,36 +12,21 @@ st.markdown("""
 관광명소부터 현지인 맛집까지, 이 가이드 하나면 여행 준비 끝!
 """)
 
-# 관광지와 맛집 데이터 (DataFrame으로 관리하여 유연성 확보)
-locations_data = {
-    "name": [
-        "샌프란시스코 금문교", "인앤아웃 버거 (In-N-Out)", "요세미티 국립공원",
-        "필즈 커피 (Philz Coffee)", "디즈니랜드 리조트", "Roscoe's Chicken and Waffles",
-        "샌디에이고 라호야 비치", "그리피스 천문대", "산타모니카 피어", "게티 센터"
-    ],
-    "type": [
-        "관광지", "맛집", "관광지", "맛집", "관광지", "맛집", "관광지", "관광지", "관광지", "관광지"
-    ],
-    "desc": [
-        "세계에서 가장 아름다운 현수교 중 하나. 인생샷 명소📸",
-        "캘리포니아의 국민버거! 비밀 메뉴 ‘애니멀 스타일’ 꼭 도전🍔",
-        "대자연의 경이로움이 펼쳐지는 절경의 국립공원⛰️",
-        "직접 블렌딩한 개성있는 커피☕ 로컬 감성 충만!",
-        "꿈과 환상의 나라! 가족 단위 여행객에게 추천🎢",
-        "프라이드 치킨 + 와플의 황홀한 조합🍗🧇",
-        "바다사자도 구경하고, 에메랄드빛 바다에서 힐링🐬",
-        "할리우드 사인을 볼 수 있는 최고의 뷰포인트. LA 야경 감상에 최고!🌃",
-        "태평양의 아름다운 노을을 감상하며 즐길 수 있는 LA 대표 해변 유원지🎡",
-        "웅장한 건축물과 세계적인 예술 작품들을 무료로 감상할 수 있는 곳🏛️"
-    ],
-    "lat": [
-        37.8199, 37.8080, 37.8651, 37.7749, 33.8121, 34.0900, 32.8500, 34.1185, 34.0089, 34.0781
-    ],
-    "lon": [
-        -122.4783, -122.4098, -119.5383, -122.4194, -117.9190, -118.3446, -117.2720, -118.3004, -118.4984, -118.4757
-    ]
-}
-df = pd.DataFrame(locations_data)
+# 지도 관련 모듈은 불러오는 데 오래 걸리므로(folium만 0.5초 이상) 제목과 소개 글을 먼저 보낸 뒤 불러옴
+import folium
+from streamlit_folium import st_folium
+
+from utils.poi_list import render_poi_list
+from utils.poi_map import get_marker_layer_cache, get_poi_store, select_visible
+from utils.poi_store import CITY_AREAS
+
+# 관광지와 맛집 데이터 (data/california_pois.csv를 프로세스당 한 번만 읽어 모든 세션과 페이지가 공유)
+store = get_poi_store()
+# 이 페이지는 관광지와 맛집만 보여줍니다. (숙소는 여행 가이드 페이지에서 함께 보여줌)
+PAGE_TYPES = ("관광지", "맛집")
+
+# 렌더링한 마커 레이어를 장소 집합별로 보관하는 캐시 (도시별 전체 카테고리 조합은 백그라운드에서 미리 렌더링됨)
+marker_layers = get_marker_layer_cache(PAGE_TYPES)
 
 st.markdown("---")
 
@@ -50,59 +36,67 @@ st.markdown("---")
 
 # 사이드바 추가
 st.sidebar.header("필터링 옵션")
-# 사용자 입력: 지역 선택 (예시로 도시명 추가)
-city_options = ["전체"] + sorted(list(set(["샌프란시스코", "로스앤젤레스", "요세미티", "샌디에이고"]))) # 도시 추가
+# 사용자 입력: 지역 선택 (도시 구역은 utils/poi_store.py의 CITY_AREAS에서 도시 중심과 반경으로 관리)
+city_options = ["전체"] + sorted(CITY_AREAS)
 selected_city = st.sidebar.selectbox("도시 선택:", city_options)
 
 # 사용자 입력: 카테고리 선택
-type_options = ["전체"] + list(df["type"].unique())
+type_options = ["전체", *PAGE_TYPES]
 selected_type = st.sidebar.selectbox("카테고리 선택:", type_options)
 
-# 데이터 필터링
-filtered_df = df.copy()
-if selected_city != "전체":
-    if selected_city == "샌프란시스코":
-        filtered_df = filtered_df[filtered_df["name"].isin(["샌프란시스코 금문교", "인앤아웃 버거 (In-N-Out)", "필즈 커피 (Philz Coffee)"])]
-    elif selected_city == "로스앤젤레스":
-        filtered_df = filtered_df[filtered_df["name"].isin(["디즈니랜드 리조트", "Roscoe's Chicken and Waffles", "그리피스 천문대", "산타모니카 피어", "게티 센터"])]
-    elif selected_city == "요세미티":
-        filtered_df = filtered_df[filtered_df["name"].isin(["요세미티 국립공원"])]
-    elif selected_city == "샌디에이고":
-        filtered_df = filtered_df[filtered_df["name"].isin(["샌디에이고 라호야 비치"])]
-
-if selected_type != "전체":
-    filtered_df = filtered_df[filtered_df["type"] == selected_type]
-
-# 지도 초기화 (필터링된 데이터의 중앙을 기준으로)
-if not filtered_df.empty:
-    center_lat = filtered_df["lat"].mean()
-    center_lon = filtered_df["lon"].mean()
-    m = folium.Map(location=[center_lat, center_lon], zoom_start=6)
-else: # 필터링된 데이터가 없을 경우 기본값으로 초기화
-    m = folium.Map(location=[36.7783, -119.4179], zoom_start=6)
-
-
-# 마커 추가
-for idx, loc in filtered_df.iterrows(): # DataFrame 반복 시 iterrows 사용
-    icon_color = "blue" if loc["type"] == "관광지" else "red"
-    folium.Marker(
-        location=[loc["lat"], loc["lon"]],
-        popup=f"<b>{loc['name']}</b><br>{loc['desc']}",
-        tooltip=loc["name"],
-        icon=folium.Icon(color=icon_color)
-    ).add_to(m)
-
-st_data = st_folium(m, width=1000, height=600)
+# 데이터 필터링 (미리 계산한 도시·카테고리별 행 위치로 고르고, DataFrame은 화면에 보여줄 행만 꺼냄)
+with perf.span("poi_filter"):
+    positions = store.select(
+        city=None if selected_city == "전체" else selected_city,
+        types=PAGE_TYPES if selected_type == "전체" else [selected_type]
+    )
+
+# 지도가 마지막으로 알려 준 화면 범위와 확대 수준. 필터가 바뀌면 지도를 새로 그리므로 이전 값은 버림
+if st.session_state.get("poi_map_filter") != (selected_city, selected_type):
+    st.session_state.pop("poi_map", None)
+    st.session_state["poi_map_filter"] = (selected_city, selected_type)
+map_state = st.session_state.get("poi_map") or {}
+
+with perf.span("viewport_query"):
+    # 화면 안에 있는 장소만, 확대 수준별 상한까지 지도로 보냄
+    visible_positions = select_visible(store.index, positions, map_state.get("bounds"), map_state.get("zoom") or 6)
+
+with perf.span("map_build"):
+    # 지도 초기화 (필터링된 데이터의 중앙을 기준으로)
+    if len(positions):
+        center_lat = store.lat[positions].mean()
+        center_lon = store.lon[positions].mean()
+        m = folium.Map(location=[center_lat, center_lon], zoom_start=6)
+    else: # 필터링된 데이터가 없을 경우 기본값으로 초기화
+        m = folium.Map(location=[36.7783, -119.4179], zoom_start=6)
+
+    # 마커 추가 (관광지는 파란색, 맛집은 빨간색, 숙소는 초록색)
+    # 장소가 많으면 마커를 하나씩 만들지 않고, 브라우저에서 그리는 클러스터 레이어 하나로 보냄
+    # 마커는 기본 지도와 분리된 레이어로 보내, 화면을 옮길 때 지도를 다시 만들지 않고 마커만 바꿈
+    # 같은 장소 집합을 이미 그린 적이 있으면 렌더링해 둔 레이어를 그대로 씀
+    markers, high_volume = marker_layers.get(visible_positions)
+
+with perf.span("map_render"):
+    st_data = st_folium(
+        m, key="poi_map", feature_group_to_add=markers,
+        returned_objects=["bounds", "zoom"], # 화면을 옮기거나 확대할 때만 다시 실행
+        width=1000, height=600
+    )
+if len(visible_positions) < len(positions):
+    st.caption(f"지도에는 현재 화면 범위의 장소 {len(visible_positions):,}곳을 표시합니다 (전체 {len(positions):,}곳). 지도를 옮기거나 확대하면 그 범위의 장소를 불러와요.")
+elif high_volume:
+    st.caption(f"장소가 {len(positions):,}곳이라 가까운 장소끼리 묶어서 표시합니다. 지도를 확대하면 개별 장소가 보여요.")
 
 st.markdown("---")
 
 ## ✨ 세부 정보 및 추천
 
 # 필터링된 결과 목록 출력
-if not filtered_df.empty:
+if len(positions):
     st.markdown("### 📝 선택된 장소 목록:")
-    for idx, row in filtered_df.iterrows():
-        st.markdown(f"- **{row['name']}** ({row['type']}): {row['desc']}")
+    with perf.span("list_render"):
+        # 행마다 st.markdown을 부르지 않고, 현재 쪽의 목록을 한 번에 만들어 요소 하나로 보냄
+        render_poi_list(store, positions, key="poi_list_page")
 else:
     st.info("선택하신 조건에 해당하는 장소가 없습니다. 다른 필터를 시도해 보세요.")
 
@@ -110,3 +104,6 @@ st.markdown("---")
 
 st.markdown("### ℹ️ Tip")
 st.info("지도에서 마커를 클릭하면 설명이 나와요. 맛집은 **빨간색**, 관광지는 **파란색**이에요. 왼쪽 사이드바에서 원하는 **도시**와 **카테고리**를 선택하여 맞춤 정보를 확인해 보세요!")
+
+perf.finish()
+preload_modules() # 다른 페이지로 처음 이동할 때 기다리지 않도록, 화면을 다 그린 뒤 무거운 모듈을 백그라운드에서 불러 둠
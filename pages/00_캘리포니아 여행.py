@@ -1,9 +1,11 @@
+import numpy as np
 import streamlit as st
-import folium
-from streamlit_folium import st_folium
-import pandas as pd
+
+from utils.perf import start_rerun
+from utils.warmup import preload_modules
 
 st.set_page_config(page_title="캘리포니아 여행 가이드", layout="wide")
+perf = start_rerun("00_travel") # 재실행 구간별 시간 측정 (PERF_TRACE=1 또는 ?perf=1 일 때만 동작)
 
 st.title("🌴 캘리포니아 여행 가이드")
 st.markdown("""
@@ -18,44 +20,31 @@ video_id = "6I6kvtPRnwc"  # YouTube 로고 영상 (임시)
 st.video(f"https://www.youtube.com/watch?v=6I6kvtPRnwc")
 st.markdown("---")
 
-# 관광지, 맛집, 숙소 데이터 (DataFrame으로 관리)
-locations_data = {
-    "name": [
-        "샌프란시스코 금문교", "인앤아웃 버거 (In-N-Out)", "요세미티 국립공원",
-        "필즈 커피 (Philz Coffee)", "디즈니랜드 리조트", "Roscoe's Chicken and Waffles",
-        "샌디에이고 라호야 비치", "그리피스 천문대", "산타모니카 피어", "게티 센터",
-        "페어몬트 샌프란시스코", "더 비벌리 힐스 호텔", "요세미티 밸리 롯지", "맨체스터 그랜드 하얏트 샌디에이고"
-    ],
-    "type": [
-        "관광지", "맛집", "관광지", "맛집", "관광지", "맛집", "관광지", "관광지", "관광지", "관광지",
-        "숙소", "숙소", "숙소", "숙소"
-    ],
-    "desc": [
-        "세계에서 가장 아름다운 현수교 중 하나. 인생샷 명소📸",
-        "캘리포니아의 국민버거! 비밀 메뉴 ‘애니멀 스타일’ 꼭 도전🍔",
-        "대자연의 경이로움이 펼쳐지는 절경의 국립공원⛰️",
-        "직접 블렌딩한 개성있는 커피☕ 로컬 감성 충만!",
-        "꿈과 환상의 나라! 가족 단위 여행객에게 추천🎢",
-        "프라이드 치킨 + 와플의 황홀한 조합🍗🧇",
-        "바다사자도 구경하고, 에메랄드빛 바다에서 힐링🐬",
-        "할리우드 사인을 볼 수 있는 최고의 뷰포인트. LA 야경 감상에 최고!🌃",
-        "태평양의 아름다운 노을을 감상하며 즐길 수 있는 LA 대표 해변 유원지🎡",
-        "웅장한 건축물과 세계적인 예술 작품들을 무료로 감상할 수 있는 곳🏛️",
-        "샌프란시스코의 상징적인 럭셔리 호텔, 아름다운 도시 전망 제공🏨",
-        "할리우드 스타들이 사랑하는 역사적인 럭셔리 호텔. 고급스러운 휴식을 즐겨보세요!✨",
-        "요세미티 국립공원 내에 위치한 숙소로 주요 명소 접근성이 뛰어납니다🏕️",
-        "샌디에이고 다운타운에 위치한 대형 호텔, 아름다운 베이 전망이 일품입니다🌊"
-    ],
-    "lat": [
-        37.8199, 37.8080, 37.8651, 37.7749, 33.8121, 34.0900, 32.8500, 34.1185, 34.0089, 34.0781,
-        37.7922, 34.0768, 37.7479, 32.7099
-    ],
-    "lon": [
-        -122.4783, -122.4098, -119.5383, -122.4194, -117.9190, -118.3446, -117.2720, -118.3004, -118.4984, -118.4757,
-        -122.4106, -118.4116, -119.6644, -117.1654
-    ]
-}
-df = pd.DataFrame(locations_data)
+# 지도 관련 모듈은 불러오는 데 오래 걸리므로(folium만 0.5초 이상) 제목과 소개 글을 먼저 보낸 뒤 불러옴
+import folium
+from streamlit_folium import st_folium
+
+from utils.itinerary import MAX_ROUTE_STOPS, distance_matrix, plan_route, route_length
+from utils.poi_list import render_poi_list
+from utils.poi_map import get_marker_layer_cache, get_poi_store, select_visible
+from utils.poi_store import CITY_AREAS
+
+# 관광지, 맛집, 숙소 데이터 (data/california_pois.csv를 프로세스당 한 번만 읽어 모든 세션과 페이지가 공유)
+store = get_poi_store()
+
+# 렌더링한 마커 레이어를 장소 집합별로 보관하는 캐시 (도시별 전체 카테고리 조합은 백그라운드에서 미리 렌더링됨)
+marker_layers = get_marker_layer_cache()
+
+# 여행 동선: 고른 장소들의 거리 행렬과 방문 순서. 출발지나 왕복 여부만 바꿀 때는 거리 행렬을 다시 계산하지 않음
+@st.cache_data(show_spinner=False, max_entries=16)
+def get_distance_matrix(stops):
+    return distance_matrix(store.lat[stops], store.lon[stops])
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def plan_itinerary(stops, start, round_trip):
+    dist = get_distance_matrix(stops)
+    route = plan_route(dist, start=int(np.flatnonzero(stops == start)[0]), round_trip=round_trip)
+    return stops[route], route_length(dist, route)
 
 st.markdown("---")
 
@@ -65,65 +54,98 @@ st.markdown("---")
 
 # 사이드바 추가
 st.sidebar.header("필터링 옵션")
-# 사용자 입력: 지역 선택
-city_options = ["전체"] + sorted(list(set(["샌프란시스코", "로스앤젤레스", "요세미티", "샌디에이고"])))
+# 사용자 입력: 지역 선택 (도시 구역은 utils/poi_store.py의 CITY_AREAS에서 도시 중심과 반경으로 관리)
+city_options = ["전체"] + sorted(CITY_AREAS)
 selected_city = st.sidebar.selectbox("도시 선택:", city_options)
 
 # 사용자 입력: 카테고리 선택
-type_options = ["전체"] + list(df["type"].unique())
+type_options = ["전체"] + store.types
 selected_type = st.sidebar.selectbox("카테고리 선택:", type_options)
 
-# 데이터 필터링
-filtered_df = df.copy()
-if selected_city != "전체":
-    # 도시별 장소 분류 로직 업데이트 (숙소 포함)
-    if selected_city == "샌프란시스코":
-        filtered_df = filtered_df[(filtered_df["name"].isin(["샌프란시스코 금문교", "인앤아웃 버거 (In-N-Out)", "필즈 커피 (Philz Coffee)", "페어몬트 샌프란시스코"]))]
-    elif selected_city == "로스앤젤레스":
-        filtered_df = filtered_df[(filtered_df["name"].isin(["디즈니랜드 리조트", "Roscoe's Chicken and Waffles", "그리피스 천문대", "산타모니카 피어", "게티 센터", "더 비벌리 힐스 호텔"]))]
-    elif selected_city == "요세미티":
-        filtered_df = filtered_df[(filtered_df["name"].isin(["요세미티 국립공원", "요세미티 밸리 롯지"]))]
-    elif selected_city == "샌디에이고":
-        filtered_df = filtered_df[(filtered_df["name"].isin(["샌디에이고 라호야 비치", "맨체스터 그랜드 하얏트 샌디에이고"]))]
-
-if selected_type != "전체":
-    filtered_df = filtered_df[(filtered_df["type"] == selected_type)]
-
-# 지도 초기화 (필터링된 데이터의 중앙을 기준으로)
-if not filtered_df.empty:
-    center_lat = filtered_df["lat"].mean()
-    center_lon = filtered_df["lon"].mean()
-    m = folium.Map(location=[center_lat, center_lon], zoom_start=6)
-else:
-    m = folium.Map(location=[36.7783, -119.4179], zoom_start=6) # 캘리포니아 중앙
-
-# 마커 추가
-for idx, loc in filtered_df.iterrows():
-    if loc["type"] == "관광지":
-        icon_color = "blue"
-    elif loc["type"] == "맛집":
-        icon_color = "red"
-    else: # 숙소
-        icon_color = "green" # 숙소는 초록색으로 표시
-
-    folium.Marker(
-        location=[loc["lat"], loc["lon"]],
-        popup=f"<b>{loc['name']}</b><br>{loc['desc']}",
-        tooltip=loc["name"],
-        icon=folium.Icon(color=icon_color)
-    ).add_to(m)
-
-st_data = st_folium(m, width=1000, height=600)
+# 데이터 필터링 (미리 계산한 도시·카테고리별 행 위치로 고르고, DataFrame은 화면에 보여줄 행만 꺼냄)
+with perf.span("poi_filter"):
+    positions = store.select(
+        city=None if selected_city == "전체" else selected_city,
+        types=None if selected_type == "전체" else [selected_type]
+    )
+
+# 지도가 마지막으로 알려 준 화면 범위와 확대 수준. 필터가 바뀌면 지도를 새로 그리므로 이전 값은 버림
+if st.session_state.get("poi_map_filter") != (selected_city, selected_type):
+    st.session_state.pop("poi_map", None)
+    st.session_state["poi_map_filter"] = (selected_city, selected_type)
+map_state = st.session_state.get("poi_map") or {}
+
+# 사용자 입력: 여행 동선 (고른 장소를 짧게 도는 순서를 계산해 지도에 선으로 표시)
+st.sidebar.header("🧭 여행 동선 짜기")
+names = store.frame["name"]
+route_stops = np.empty(0, dtype=np.int64)
+if len(positions):
+    if st.sidebar.checkbox(f"현재 필터의 장소 모두 방문 (최대 {MAX_ROUTE_STOPS}곳)", key="route_all"):
+        route_stops = positions[:MAX_ROUTE_STOPS]
+    else:
+        picked = st.sidebar.multiselect(
+            "방문할 장소:", positions[:MAX_ROUTE_STOPS].tolist(),
+            format_func=lambda i: names.iat[i], max_selections=MAX_ROUTE_STOPS, key="route_picked"
+        )
+        route_stops = np.sort(np.array(picked, dtype=np.int64))
+route = None
+if len(route_stops) >= 2:
+    route_start = st.sidebar.selectbox("출발지:", route_stops.tolist(), format_func=lambda i: names.iat[i], key="route_start")
+    round_trip = st.sidebar.toggle("출발지로 돌아오기", key="route_round_trip")
+    with perf.span("route_solve"):
+        route, route_km = plan_itinerary(route_stops, route_start, round_trip)
+
+with perf.span("viewport_query"):
+    # 화면 안에 있는 장소만, 확대 수준별 상한까지 지도로 보냄
+    visible_positions = select_visible(store.index, positions, map_state.get("bounds"), map_state.get("zoom") or 6)
+
+with perf.span("map_build"):
+    # 지도 초기화 (필터링된 데이터의 중앙을 기준으로)
+    if len(positions):
+        center_lat = store.lat[positions].mean()
+        center_lon = store.lon[positions].mean()
+        m = folium.Map(location=[center_lat, center_lon], zoom_start=6)
+    else:
+        m = folium.Map(location=[36.7783, -119.4179], zoom_start=6) # 캘리포니아 중앙
+
+    # 마커 추가 (관광지는 파란색, 맛집은 빨간색, 숙소는 초록색)
+    # 장소가 많으면 마커를 하나씩 만들지 않고, 브라우저에서 그리는 클러스터 레이어 하나로 보냄
+    # 마커는 기본 지도와 분리된 레이어로 보내, 화면을 옮길 때 지도를 다시 만들지 않고 마커만 바꿈
+    # 같은 장소 집합을 이미 그린 적이 있으면 렌더링해 둔 레이어를 그대로 씀
+    markers, high_volume = marker_layers.get(visible_positions)
+
+    # 여행 동선은 방문 순서대로 이은 선 하나로 기본 지도에 그림
+    if route is not None:
+        folium.PolyLine(
+            np.column_stack([store.lat[route], store.lon[route]]).tolist(),
+            color="#8e44ad", weight=4, opacity=0.8, tooltip="여행 동선"
+        ).add_to(m)
+
+with perf.span("map_render"):
+    st_data = st_folium(
+        m, key="poi_map", feature_group_to_add=markers,
+        returned_objects=["bounds", "zoom"], # 화면을 옮기거나 확대할 때만 다시 실행
+        width=1000, height=600
+    )
+if len(visible_positions) < len(positions):
+    st.caption(f"지도에는 현재 화면 범위의 장소 {len(visible_positions):,}곳을 표시합니다 (전체 {len(positions):,}곳). 지도를 옮기거나 확대하면 그 범위의 장소를 불러와요.")
+elif high_volume:
+    st.caption(f"장소가 {len(positions):,}곳이라 가까운 장소끼리 묶어서 표시합니다. 지도를 확대하면 개별 장소가 보여요.")
+if route is not None:
+    st.markdown(f"#### 🧭 추천 방문 순서 ({len(route_stops):,}곳, 총 직선거리 약 {route_km:,.0f}km)")
+    with st.expander("방문 순서 보기"):
+        st.markdown("\n".join(f"{step}. {names.iat[i]}" for step, i in enumerate(route, start=1)))
 
 st.markdown("---")
 
 ## ✨ 세부 정보 및 추천
 
 # 필터링된 결과 목록 출력
-if not filtered_df.empty:
+if len(positions):
     st.markdown("### 📝 선택된 장소 목록:")
-    for idx, row in filtered_df.iterrows():
-        st.markdown(f"- **{row['name']}** ({row['type']}): {row['desc']}")
+    with perf.span("list_render"):
+        # 행마다 st.markdown을 부르지 않고, 현재 쪽의 목록을 한 번에 만들어 요소 하나로 보냄
+        render_poi_list(store, positions, key="poi_list_page")
 else:
     st.info("선택하신 조건에 해당하는 장소가 없습니다. 다른 필터를 시도해 보세요.")
 
@@ -153,3 +175,6 @@ st.markdown("---")
 
 st.markdown("### ℹ️ Tip")
 st.info("지도에서 마커를 클릭하면 설명이 나와요. 맛집은 **빨간색**, 관광지는 **파란색**, **숙소는 초록색**이에요. 왼쪽 사이드바에서 원하는 **도시**와 **카테고리**를 선택하여 맞춤 정보를 확인해 보세요!")
+
+perf.finish()
+preload_modules() # 다른 페이지로 처음 이동할 때 기다리지 않도록, 화면을 다 그린 뒤 무거운 모듈을 백그라운드에서 불러 둠
@@ -1,8 +1,11 @@
 import streamlit as st
-import yfinance as yf
-import pandas as pd
 import datetime
+import os
 import time
+import random
+from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError as FuturesTimeoutError
+
+from utils.perf import start_rerun
 
 # --- Streamlit 페이지 기본 설정 ---
 st.set_page_config(
@@ -10,6 +13,7 @@ st.set_page_config(
     page_icon="📈",
     layout="wide" # 넓은 화면 레이아웃 사용
 )
+perf = start_rerun("01_stocks") # 재실행 구간별 시간 측정 (PERF_TRACE=1 또는 ?perf=1 일 때만 동작)
 
 st.title('글로벌 시총 Top 기업 주가 변화 시각화 (2023년 ~ 2024년)')
 st.markdown("""
@@ -17,6 +21,16 @@ st.markdown("""
 `Apple` 데이터는 제외되었습니다. 데이터 로딩에 문제가 있을 경우 자동으로 재시도하며, 캐싱을 통해 빠른 로딩을 지원합니다.
 """)
 
+# pandas와 데이터 모듈은 불러오는 데 오래 걸리므로(pandas만 0.3초 이상) 제목과 소개 글을 먼저 보낸 뒤 불러옴
+import pandas as pd
+
+from utils.fetch_coordinator import FetchCoordinator
+from utils.live_feed import LiveFeed, poll_interval
+from utils.market_data import DEFAULT_PROVIDER, get_provider, synthetic_watchlist
+from utils.price_store import PRICE_STORE_DIR, PriceStore
+from utils.price_transforms import compute_price_metrics
+from utils.downsample import CHART_WIDTH_PX, downsample_long
+
 # --- 기업 티커 목록 정의 (Apple 제외) ---
 # 이 리스트는 실시간 시가총액 순위를 반영하지 않습니다.
 # 2023-2024년 기간에 의미 있는 데이터를 가질 수 있는 기업들로 구성했습니다.
@@ -34,104 +48,320 @@ TOP_COMPANIES_TICKERS = {
     "Berkshire Hathaway": "BRK-B" # 워렌 버핏 회사 (B주)
 }
 
+# --- 데이터 제공자 설정 ---
+# 네트워크가 없는 환경에서는 MARKET_DATA_PROVIDER=local 로 로컬 파일/합성 데이터를 사용합니다.
+# 이때 SYNTHETIC_TICKER_COUNT 를 지정하면 합성 종목 N개로 처리·렌더링 성능을 측정할 수 있습니다.
+MARKET_DATA_PROVIDER_NAME = DEFAULT_PROVIDER
+if os.environ.get("SYNTHETIC_TICKER_COUNT"):
+    TOP_COMPANIES_TICKERS = synthetic_watchlist(int(os.environ["SYNTHETIC_TICKER_COUNT"]))
+
 # --- 데이터 조회 기간 고정 ---
 START_DATE_FIXED = datetime.date(2023, 1, 1)
 END_DATE_FIXED = datetime.date(2024, 12, 31)
 
 st.info(f"✨ **고정된 조회 기간:** `{START_DATE_FIXED}` 부터 `{END_DATE_FIXED}` 까지")
 
-# --- 주가 데이터 로딩 함수 (캐싱 및 재시도 로직 포함) ---
-@st.cache_data(ttl=3600, show_spinner=False) # 1시간 캐시, 내장 스피너 끔
-def load_stock_data(tickers_dict, start_date_obj, end_date_obj, max_retries=5, retry_delay_sec=7):
+# --- 개별 티커 재시도 설정 ---
+MAX_FETCH_WORKERS = 4 # 동시에 실행할 개별 다운로드 작업 수 (Yahoo 요청 제한을 고려해 작게 유지)
+FETCH_TIMEOUT_SEC = 60 # 개별 재시도 단계 전체에 허용하는 최대 시간
+STOCK_DATA_TTL_SEC = 3600 # 이보다 오래된 데이터는 먼저 보여 준 뒤 백그라운드에서 새로 받음
+
+# --- 실시간 모드 설정 ---
+LIVE_DEFAULT_COMPANIES = 5 # 실시간 차트에 기본으로 보여줄 기업 수 (관심 종목 앞에서부터)
+LIVE_MAX_COMPANIES = 10 # 실시간 차트에 한 번에 그릴 수 있는 최대 기업 수
+LIVE_REBASE_BARS = 60 # 기준 데이터 뒤에 쌓인 최근 봉이 이만큼 되면 기준 데이터를 새로 잡음
+
+# --- 개별 티커 다운로드 함수 (지수 백오프 재시도) ---
+def fetch_close_with_backoff(provider, ticker, start_date_obj, end_date_obj, max_retries=5, backoff_base_sec=1.0, backoff_max_sec=30.0):
     """
-    yfinance를 사용하여 주가 데이터를 로드하고, 실패 시 재시도합니다.
+    단일 티커의 'Close' Series를 지터가 포함된 지수 백오프로 재시도하며 가져옵니다.
+    작업 스레드에서 실행되므로 Streamlit 요소를 직접 그리지 않고, (Series 또는 None, 시도별 메시지 목록)을 반환합니다.
+    """
+    messages = [] # (수준, 메시지) 튜플 목록. 메인 스레드에서 화면에 출력합니다.
+    for attempt in range(max_retries):
+        try:
+            close = provider.fetch_close(ticker, start_date_obj, end_date_obj)
+            if close is not None:
+                return close, messages
+            messages.append(("warning", f"⚠️ 시도 {attempt + 1}/{max_retries}: `{ticker}` 데이터가 비어있거나 'Close' 컬럼을 찾을 수 없습니다. (데이터가 없을 수 있습니다.)"))
+        except Exception as e:
+            messages.append(("error", f"❌ 시도 {attempt + 1}/{max_retries}: `{ticker}` 데이터 로딩 중 오류 발생: {e}"))
+
+        if attempt + 1 < max_retries: # 마지막 시도에서는 대기하지 않음
+            # 전체 지터 방식: 0 ~ min(최대 대기, 기본 대기 * 2^시도) 사이에서 무작위 대기
+            # 이 스레드만 잠들기 때문에 다른 티커의 다운로드는 계속 진행됩니다.
+            time.sleep(random.uniform(0, min(backoff_max_sec, backoff_base_sec * 2 ** attempt)))
+    return None, messages
+
+# --- 주가 데이터 로딩 함수 (재시도 로직 포함) ---
+def load_stock_data(tickers_dict, start_date_obj, end_date_obj, max_retries=5, max_workers=MAX_FETCH_WORKERS, timeout_sec=FETCH_TIMEOUT_SEC, provider_name=MARKET_DATA_PROVIDER_NAME, report=None):
+    """
+    데이터 제공자(기본값: yfinance)를 사용하여 주가 데이터를 로드하고, 실패 시 재시도합니다.
+    로컬 가격 저장소에 있는 티커는 네트워크 없이 읽고, 뒷부분만 빠진 티커는 빠진 날짜만 받아 이어 붙입니다.
+    나머지는 한 번에 요청한 뒤 비어 있는 티커만 제한된 스레드 풀에서 동시에 다시 요청합니다.
+    여러 세션이 결과를 공유하도록 작업 스레드에서 실행되므로 Streamlit 요소를 직접 그리지 않습니다.
+    ({기업명: 종가 Series}, 메시지 목록)을 반환하고, 진행 상황은 report(진행률, 메시지)로 알립니다.
     """
     all_close_data = {} # 성공적으로 로드된 주가 데이터를 저장할 딕셔너리
-    
-    # 진행률 바 및 메시지 초기화
-    progress_text = "🚀 **주식 데이터를 불러오고 있습니다...**"
-    progress_bar = st.progress(0, text=progress_text)
-    
+    messages = [] # (수준, 메시지) 튜플 목록. 결과를 받은 세션이 각자 화면에 출력합니다.
+    report = report or (lambda fraction, text=None: None)
+    provider = get_provider(provider_name)
+    # 프로세스 재시작이나 캐시 만료 후에도 남아 있는 디스크 저장소 (제공자마다 따로 보관해 합성 데이터가 섞이지 않게 함)
+    price_store = PriceStore(PRICE_STORE_DIR / provider.name)
+
+    def save_to_store(company_name, ticker, close):
+        try:
+            price_store.write(ticker, close, start_date_obj, end_date_obj)
+        except Exception as e: # 저장 실패는 화면 표시에 영향을 주지 않으므로 경고만 표시
+            messages.append(("warning", f"⚠️ {company_name} (`{ticker}`) 데이터를 로컬 저장소에 저장하지 못했습니다: {e}"))
+
     total_tickers = len(tickers_dict)
-    
-    for i, (company_name, ticker) in enumerate(tickers_dict.items()):
-        attempts = 0
-        data_loaded_successfully = False # 현재 기업의 데이터 로딩 성공 여부 플래그
-        
-        while attempts < max_retries:
-            try:
-                data = yf.download(
-                    ticker,
-                    start=start_date_obj,
-                    end=end_date_obj,
-                    auto_adjust=True, # 배당 및 분할 조정된 'Close' 가격 반환
-                    progress=False # 다운로드 진행 메시지 숨김
-                )
-                
-                if not data.empty and 'Close' in data.columns:
-                    all_close_data[company_name] = data['Close'].rename(company_name)
-                    st.success(f"✔️ **{company_name}** (`{ticker}`) 데이터 로드 성공!")
-                    data_loaded_successfully = True
-                    break # 성공적으로 로드했으므로 현재 기업의 재시도 루프 탈출
+    completed = 0
+
+    # 0단계: 로컬 저장소에 요청 기간 전체가 있는 티커는 네트워크 요청 없이 사용
+    network_companies = {} # 전체 기간을 네트워크에서 받아야 하는 기업
+    tail_companies = {} # 저장된 이력 뒤에 빠진 날짜만 받으면 되는 기업: {기업명: (티커, 다운로드 시작일)}
+    for company_name, ticker in tickers_dict.items():
+        try:
+            stored_close = price_store.read(ticker, start_date_obj, end_date_obj)
+        except Exception as e: # 손상된 파일 등은 저장소에 없는 것으로 취급
+            messages.append(("warning", f"⚠️ {company_name} (`{ticker}`) 로컬 저장소 데이터를 읽지 못했습니다: {e}"))
+            stored_close = None
+
+        if stored_close is not None and not stored_close.empty:
+            all_close_data[company_name] = stored_close.rename(company_name)
+            messages.append(("success", f"✔️ **{company_name}** (`{ticker}`) 데이터 로드 성공! (로컬 저장소)"))
+            completed += 1
+            continue
+
+        try:
+            tail_start_date = price_store.tail_start(ticker, start_date_obj, end_date_obj)
+        except Exception:
+            tail_start_date = None
+        if tail_start_date is not None:
+            tail_companies[company_name] = (ticker, tail_start_date)
+        else:
+            network_companies[company_name] = ticker
+    report(completed / total_tickers)
+
+    # 0-1단계: 뒷부분만 빠진 티커는 빠진 날짜만 받아 저장된 이력에 이어 붙임 (시작일이 같은 티커끼리 일괄 요청)
+    tickers_by_tail_start = {}
+    for company_name, (ticker, tail_start_date) in tail_companies.items():
+        tickers_by_tail_start.setdefault(tail_start_date, []).append(ticker)
+    tail_results = {}
+    for tail_start_date, tail_tickers in tickers_by_tail_start.items():
+        try:
+            tail_results.update(provider.download_close_batch(tail_tickers, tail_start_date, end_date_obj))
+        except Exception as e:
+            messages.append(("warning", f"⚠️ 최신 데이터 추가 다운로드 중 오류 발생: {e}. 전체 기간을 다시 받습니다."))
+
+    for company_name, (ticker, _) in tail_companies.items():
+        try:
+            appended = ticker in tail_results and price_store.append_tail(ticker, tail_results[ticker], end_date_obj)
+            merged_close = price_store.read(ticker, start_date_obj, end_date_obj) if appended else None
+        except Exception as e:
+            messages.append(("warning", f"⚠️ {company_name} (`{ticker}`) 로컬 저장소 갱신 중 오류 발생: {e}"))
+            merged_close = None
+
+        if merged_close is not None and not merged_close.empty:
+            all_close_data[company_name] = merged_close.rename(company_name)
+            messages.append(("success", f"✔️ **{company_name}** (`{ticker}`) 데이터 로드 성공! (새 거래일만 추가)"))
+            completed += 1
+        else: # 분할/배당으로 과거 가격이 바뀌었거나 추가 다운로드에 실패한 경우 전체 기간을 다시 받음
+            network_companies[company_name] = ticker
+    report(completed / total_tickers)
+
+    # 1단계: 저장소에 없는 티커를 한 번의 요청으로 일괄 다운로드
+    batch_results = {}
+    if network_companies:
+        try:
+            batch_results = provider.download_close_batch(network_companies.values(), start_date_obj, end_date_obj)
+        except Exception as e:
+            messages.append(("warning", f"⚠️ 일괄 다운로드 중 오류 발생: {e}. 기업별로 다시 시도합니다."))
+
+    pending_companies = {} # 일괄 다운로드에서 비어 있던 기업 (개별 재시도 대상)
+    for company_name, ticker in network_companies.items():
+        if ticker in batch_results:
+            all_close_data[company_name] = batch_results[ticker].rename(company_name)
+            save_to_store(company_name, ticker, batch_results[ticker])
+            messages.append(("success", f"✔️ **{company_name}** (`{ticker}`) 데이터 로드 성공!"))
+            completed += 1
+        else:
+            pending_companies[company_name] = ticker
+    report(completed / total_tickers)
+
+    # 2단계: 비어 있던 티커만 제한된 스레드 풀에서 동시에 재시도
+    if pending_companies:
+        executor = ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(pending_companies))))
+        futures = {
+            executor.submit(fetch_close_with_backoff, provider, ticker, start_date_obj, end_date_obj, max_retries): company_name
+            for company_name, ticker in pending_companies.items()
+        }
+        try:
+            # 끝난 순서대로 결과를 처리하므로 느린 티커 하나가 나머지 메시지와 진행률을 막지 않습니다.
+            for future in as_completed(futures, timeout=timeout_sec):
+                company_name = futures[future]
+                ticker = pending_companies[company_name]
+                close, fetch_messages = future.result()
+                messages.extend((level, f"{message} ({company_name})") for level, message in fetch_messages)
+
+                if close is not None:
+                    all_close_data[company_name] = close.rename(company_name)
+                    save_to_store(company_name, ticker, close)
+                    messages.append(("success", f"✔️ **{company_name}** (`{ticker}`) 데이터 로드 성공!"))
                 else:
-                    st.warning(f"⚠️ 시도 {attempts + 1}/{max_retries}: {company_name} (`{ticker}`) 데이터가 비어있거나 'Close' 컬럼을 찾을 수 없습니다. (데이터가 없을 수 있습니다.)")
-            except Exception as e:
-                st.error(f"❌ 시도 {attempts + 1}/{max_retries}: {company_name} (`{ticker}`) 데이터 로딩 중 오류 발생: {e}")
-            
-            attempts += 1
-            if attempts < max_retries: # 마지막 시도에서는 대기하지 않음
-                time.sleep(retry_delay_sec) # 재시도 전 잠시 대기 (서버 부하 감소 목적)
-        
-        if not data_loaded_successfully:
-            st.error(f"🔴 **{company_name}** (`{ticker}`) 데이터를 {max_retries}번 시도 후에도 가져오지 못했습니다. 티커를 확인해주세요.")
-        
-        # 진행률 바 업데이트
-        progress_bar.progress((i + 1) / total_tickers, text=f"✨ **{company_name}** 데이터 로딩 중...")
-    
-    progress_bar.empty() # 모든 작업 완료 후 진행률 바 제거
-    return all_close_data
+                    messages.append(("error", f"🔴 **{company_name}** (`{ticker}`) 데이터를 {max_retries}번 시도 후에도 가져오지 못했습니다. 티커를 확인해주세요."))
+
+                # 진행률 바 업데이트
+                completed += 1
+                report(completed / total_tickers, f"✨ **{company_name}** 데이터 로딩 완료")
+        except FuturesTimeoutError:
+            for future, company_name in futures.items():
+                if not future.done():
+                    messages.append(("error", f"⏱️ **{company_name}** (`{pending_companies[company_name]}`) 데이터가 {timeout_sec}초 안에 로드되지 않아 건너뜁니다."))
+        finally:
+            # 남은 작업은 기다리지 않고 정리 (이미 실행 중인 다운로드는 백그라운드에서 끝남)
+            executor.shutdown(wait=False, cancel_futures=True)
+    return all_close_data, messages
+
+# --- 주가 데이터 불러오기 조율 (프로세스 전체에서 공유) ---
+@st.cache_resource(show_spinner=False)
+def get_stock_fetches():
+    """
+    같은 종목·기간을 여러 세션이 동시에 요청해도 다운로드는 한 번만 하고 결과를 함께 씁니다.
+    STOCK_DATA_TTL_SEC가 지난 데이터는 바로 보여 준 뒤 백그라운드에서 한 번만 새로 받아 교체합니다.
+    """
+    return FetchCoordinator(ttl_sec=STOCK_DATA_TTL_SEC)
+
+# --- 파생 지표 계산 함수 (데이터셋당 한 번만 계산) ---
+@st.cache_data(show_spinner=False)
+def build_price_metrics(raw_prices_df):
+    """
+    정규화 가격과 수익률, 변동성, 낙폭, 상관 행렬을 계산합니다.
+    같은 원시 데이터에 대해서는 다시 실행되어도 캐시된 결과를 돌려줍니다.
+    """
+    return compute_price_metrics(raw_prices_df)
+
+# --- 차트용 다운샘플링 함수 ---
+@st.cache_data(show_spinner=False)
+def build_chart_frame(prices_df, max_points_per_series, value_name):
+    """시리즈별로 LTTB 다운샘플링한 긴 형태의 차트용 데이터를 만듭니다. 원본 데이터는 그대로 둡니다."""
+    return downsample_long(prices_df, max_points_per_series, var_name="기업", value_name=value_name)
+
+def render_line_chart(prices_df, value_name="값", max_points_per_series=CHART_WIDTH_PX):
+    """
+    데이터가 차트의 가로 픽셀 수보다 길면 시리즈별로 다운샘플링한 뒤 그립니다.
+    화면에 보이는 선 모양은 거의 같지만 브라우저로 보내는 데이터 양은 크게 줄어듭니다.
+    """
+    if len(prices_df) <= max_points_per_series:
+        st.line_chart(prices_df)
+        return
+    chart_df = build_chart_frame(prices_df, max_points_per_series, value_name)
+    st.line_chart(chart_df, x=prices_df.index.name or "index", y=value_name, color="기업")
+
+@st.cache_data(show_spinner=False)
+def export_csv(prices_df):
+    """다운로드용 전체 해상도 CSV를 만듭니다."""
+    return prices_df.to_csv().encode("utf-8")
+
+# --- 실시간 시세 (관심 종목 전체를 프로세스당 하나의 시세 창으로 공유) ---
+@st.cache_resource(show_spinner=False)
+def get_live_feed(watchlist_items, provider_name):
+    return LiveFeed(get_provider(provider_name), dict(watchlist_items))
+
+# 차트 조각은 시세 창이 제공자에 요청하는 간격(LIVE_POLL_SEC와 제공자의 봉 간격 중 큰 값)마다 다시 실행
+LIVE_REFRESH_SEC = poll_interval(get_provider(MARKET_DATA_PROVIDER_NAME))
+
+@st.fragment(run_every=LIVE_REFRESH_SEC)
+def render_live_chart(live_feed, companies):
+    """
+    이 조각만 LIVE_REFRESH_SEC마다 다시 실행되어, 페이지의 나머지(과거 데이터 차트와 표)는 다시 그리지 않습니다.
+    차트는 '기준 데이터' 차트와 그 뒤에 쌓이는 '최근 봉' 차트로 나눠 그립니다. 기준 데이터는 바뀌지 않으므로 Streamlit이 같은 메시지를
+    해시 참조로만 보내고(브라우저에 이미 있음), 실제로 전송되는 것은 최근 봉 차트뿐입니다. (이 버전의 Streamlit에는 add_rows가 없음)
+    최근 봉이 LIVE_REBASE_BARS만큼 쌓이면 기준 데이터에 합쳐 새로 잡습니다.
+    """
+    live_feed.poll()
+    frame = live_feed.frame # 한 시점의 데이터 (다른 세션의 poll이 바꿔 끼워도 이 실행에서는 그대로)
+    if frame.empty:
+        st.info("⏳ 실시간 시세를 기다리는 중입니다...")
+        return
+
+    # 기준 데이터는 세션마다 보관 (시세 창의 오래된 봉이 잘려 나가도 기준 데이터는 그대로 두어야 같은 메시지가 됨)
+    # 기업 선택이 바뀌었거나, 새 봉이 많이 쌓였거나, 기준 데이터의 마지막 봉이 시세 창에서 밀려났으면 새로 잡음
+    base = st.session_state.get("live_chart_base")
+    if (
+        base is None or base["companies"] != companies or base["end"] not in frame.index
+        or (frame.index > base["end"]).sum() >= LIVE_REBASE_BARS
+    ):
+        base = {"companies": companies, "end": frame.index[-1], "data": live_feed.percent_change(frame, companies)}
+        st.session_state["live_chart_base"] = base
+
+    base_column, recent_column = st.columns([4, 1])
+    with base_column:
+        st.line_chart(base["data"], y_label="기준가 대비 변화율 (%)")
+    with recent_column:
+        new_bars = frame.loc[frame.index > base["end"]]
+        if new_bars.empty:
+            st.caption("새 봉을 기다리는 중...")
+        else:
+            st.line_chart(live_feed.percent_change(new_bars, companies), y_label="최근 봉 (%)")
+    st.caption(f"🕒 마지막 봉: {frame.index[-1]:%Y-%m-%d %H:%M:%S} · {live_feed.poll_sec:g}초마다 새 봉을 확인합니다. (데이터 제공자: {live_feed.provider.name})")
+
+st.subheader("⚡ 실시간 시세")
+if st.toggle("실시간 모드 켜기", key="live_mode", help="관심 종목의 최근 봉을 주기적으로 받아 차트에 덧붙입니다. 네트워크가 없으면 MARKET_DATA_PROVIDER=local 로 합성 시세를 씁니다."):
+    live_companies = st.multiselect(
+        "실시간으로 볼 기업:", list(TOP_COMPANIES_TICKERS),
+        default=list(TOP_COMPANIES_TICKERS)[:LIVE_DEFAULT_COMPANIES], max_selections=LIVE_MAX_COMPANIES, key="live_companies"
+    )
+    if live_companies:
+        with perf.span("live_chart"):
+            render_live_chart(get_live_feed(tuple(TOP_COMPANIES_TICKERS.items()), MARKET_DATA_PROVIDER_NAME), live_companies)
+st.markdown("---")
 
 # --- 데이터 로딩 실행 ---
-with st.spinner("⏳ 주식 데이터를 불러오는 중입니다... 잠시만 기다려 주세요."):
-    stock_data_results = load_stock_data(TOP_COMPANIES_TICKERS, START_DATE_FIXED, END_DATE_FIXED)
+# 진행률과 메시지는 세션마다 따로 그리고, 불러온 데이터만 모든 세션이 공유
+progress_text = "🚀 **주식 데이터를 불러오고 있습니다...**"
+progress_slot = st.empty() # 데이터를 기다릴 때만 진행률 바를 표시
+with st.spinner("⏳ 주식 데이터를 불러오는 중입니다... 잠시만 기다려 주세요."), perf.span("data_load"):
+    stock_fetch = get_stock_fetches().get(
+        (tuple(TOP_COMPANIES_TICKERS.items()), START_DATE_FIXED, END_DATE_FIXED, MARKET_DATA_PROVIDER_NAME),
+        lambda report: load_stock_data(TOP_COMPANIES_TICKERS, START_DATE_FIXED, END_DATE_FIXED, report=report),
+        on_progress=lambda fraction, text: progress_slot.progress(fraction, text=text or progress_text),
+        is_usable=lambda loaded: bool(loaded[0]), # 모든 종목이 실패한 새 결과로 이전 데이터를 덮어쓰지 않음
+    )
+progress_slot.empty() # 모든 작업 완료 후 진행률 바 제거
+stock_data_results, load_messages = stock_fetch.value
+for level, message in load_messages:
+    getattr(st, level)(message)
+if stock_fetch.stale:
+    loaded_at = datetime.datetime.fromtimestamp(stock_fetch.loaded_at).strftime("%Y-%m-%d %H:%M")
+    st.caption(f"🔄 {loaded_at}에 불러온 데이터를 먼저 보여 드려요. 최신 데이터는 백그라운드에서 받는 중이며, 다시 실행하면 반영됩니다.")
 
 # --- 데이터 처리 및 시각화 ---
 if stock_data_results: # 하나라도 성공적으로 로드된 데이터가 있다면
     # 딕셔너리의 Series들을 합쳐 DataFrame 생성
     # pd.concat은 Series들의 인덱스(날짜)를 자동으로 정렬하고, 누락된 날짜에는 NaN을 채워 넣습니다.
-    raw_prices_df = pd.concat(stock_data_results.values(), axis=1)
-    raw_prices_df.columns = stock_data_results.keys() # 컬럼 이름을 기업 이름으로 설정
-    
-    # 모든 값이 NaN인 행은 제거 (예: 주말, 공휴일 등 거래가 없는 날짜)
-    raw_prices_df = raw_prices_df.dropna(how='all')
+    with perf.span("frame_build"):
+        raw_prices_df = pd.concat(stock_data_results.values(), axis=1)
+        raw_prices_df.columns = stock_data_results.keys() # 컬럼 이름을 기업 이름으로 설정
+        
+        # 모든 값이 NaN인 행은 제거 (예: 주말, 공휴일 등 거래가 없는 날짜)
+        raw_prices_df = raw_prices_df.dropna(how='all')
 
     if not raw_prices_df.empty:
         # 주가 데이터를 정규화 (각 기업의 첫 번째 유효한 값을 100으로 기준)
-        normalized_prices_df = pd.DataFrame()
-        
-        initial_values = pd.Series(dtype='float64')
-        for col in raw_prices_df.columns:
-            first_valid_idx = raw_prices_df[col].first_valid_index()
-            if first_valid_idx is not None:
-                initial_values[col] = raw_prices_df.loc[first_valid_idx, col]
-            else:
-                initial_values[col] = pd.NA # 유효한 값이 없으면 NA 처리
-        
-        valid_initial_values = initial_values.dropna() # 초기값이 있는 컬럼만 선택
-
-        if not valid_initial_values.empty:
-            # 정규화: 현재 가격 / 초기값 * 100
-            # raw_prices_df에서 유효한 초기값이 있는 컬럼만 선택하여 정규화
-            normalized_prices_df = raw_prices_df[valid_initial_values.index] / valid_initial_values * 100
-            # 정규화 후에도 모든 값이 NaN인 컬럼이 있다면 제거 (데이터 로딩 실패한 기업 등)
-            normalized_prices_df = normalized_prices_df.dropna(axis=1, how='all')
-        else:
+        # 정규화 및 파생 지표는 벡터 연산으로 한 번에 계산되어 캐시됩니다.
+        with perf.span("transform"):
+            price_metrics = build_price_metrics(raw_prices_df)
+        normalized_prices_df = price_metrics.normalized
+        if normalized_prices_df.empty:
             st.warning("경고: 주가 정규화를 위한 초기 유효값을 찾을 수 없습니다. 모든 데이터가 NaN일 수 있습니다.")
         
         # --- 시각화 섹션 ---
         if not normalized_prices_df.empty:
             st.subheader('📊 2023년 ~ 2024년 글로벌 Top 기업 주가 변화 (정규화)')
-            st.line_chart(normalized_prices_df)
+            with perf.span("chart_overview"):
+                render_line_chart(normalized_prices_df, value_name="정규화 주가")
 
             st.subheader('🔍 개별 기업 주가 변화 상세 보기 (정규화)')
             # 정규화된 데이터프레임의 실제 컬럼에서 선택 가능한 기업 리스트 생성
@@ -139,12 +369,31 @@ if stock_data_results: # 하나라도 성공적으로 로드된 데이터가 있
             if selectable_companies:
                 selected_company = st.selectbox('기업을 선택하세요:', selectable_companies)
                 if selected_company: # 사용자가 기업을 선택했을 경우에만 차트 표시
-                    st.line_chart(normalized_prices_df[[selected_company]])
+                    with perf.span("chart_detail"):
+                        render_line_chart(normalized_prices_df[[selected_company]], value_name="정규화 주가")
             else:
                 st.warning("선택할 수 있는 기업 데이터가 없습니다. 모든 기업의 데이터 로딩에 실패했을 수 있습니다.")
 
+            st.subheader('📉 위험 지표')
+            volatility_tab, drawdown_tab, correlation_tab = st.tabs(["롤링 변동성 (연율화)", "최고가 대비 낙폭", "수익률 상관관계"])
+            with perf.span("chart_risk"):
+                with volatility_tab:
+                    render_line_chart(price_metrics.volatility.dropna(how='all'), value_name="연율화 변동성")
+                with drawdown_tab:
+                    render_line_chart(price_metrics.drawdown, value_name="낙폭")
+                with correlation_tab:
+                    st.dataframe(price_metrics.correlation.round(2))
+
             st.subheader('📋 원시 주가 데이터 (조정 종가)')
-            st.dataframe(raw_prices_df)
+            with perf.span("table_render"):
+                st.dataframe(raw_prices_df)
+                # 차트는 다운샘플링되지만, 전체 해상도 데이터는 그대로 내려받을 수 있습니다.
+                st.download_button(
+                    "📥 원시 주가 데이터 CSV 다운로드 (전체 해상도)",
+                    data=export_csv(raw_prices_df),
+                    file_name=f"prices_{START_DATE_FIXED}_{END_DATE_FIXED}.csv",
+                    mime="text/csv"
+                )
         else:
             st.info("⚠️ 정규화된 주가 데이터를 생성할 수 없습니다. 원시 데이터를 확인해주세요.")
     else:
@@ -158,7 +407,10 @@ st.markdown("""
 ### 💡 참고 사항
 
 * **기간 고정:** 이 앱은 2023년 1월 1일부터 2024년 12월 31일까지의 데이터를 조회합니다.
+* **실시간 모드:** 켜면 위쪽 실시간 차트만 몇 초마다 새로 그려지고, 아래의 과거 데이터 차트와 표는 다시 그리지 않습니다. 장이 열려 있지 않으면 새 봉이 들어오지 않을 수 있습니다.
 * **`SyntaxError` 발생 시:** 이 코드는 파이썬 문법에 맞게 작성되었습니다. 만약 `SyntaxError`가 계속 발생한다면, 코드를 복사-붙여넣기 할 때 **줄바꿈, 들여쓰기, 따옴표, 괄호** 등이 정확하게 유지되었는지 다시 한번 확인해야 합니다. 가장 좋은 방법은 코드를 로컬 환경에서 실행하여 정확한 오류 위치를 파악하는 것입니다.
 * **`yfinance` 버전:** `requirements.txt` 파일에 `streamlit`, `yfinance==0.2.38`, `pandas`가 명시되어 있는지 확인해주세요.
 * **티커 정확성:** `yfinance`는 모든 주식 시장의 모든 티커를 지원하지 않을 수 있습니다. 특히 한국 주식(`005930.KS`)이나 사우디 아람코(`2222.SR`)와 같은 미국 외 주식의 경우 데이터 로딩에 실패할 수 있습니다.
 """)
+
+perf.finish()
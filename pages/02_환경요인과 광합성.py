@@ -1,30 +1,10 @@
 import streamlit as st
 import numpy as np
-import matplotlib.pyplot as plt
 
-st.set_page_config(layout="centered", page_title="광합성량 시뮬레이션")
-
-def calculate_photosynthesis(light_intensity, temperature, co2_concentration):
-    """
-    주어진 환경 요인에 따른 광합성량을 계산합니다.
-    이 모델은 단순화된 시뮬레이션이며, 실제 생물학적 과정과 정확히 일치하지 않을 수 있습니다.
-    """
-    # 각 요인이 광합성에 미치는 영향 (예시 값)
-    # 실제 생물학적 모델은 훨씬 복잡합니다.
-
-    # 빛의 세기 영향: 특정 세기까지는 증가하다가 포화
-    light_effect = 1 - np.exp(-0.05 * light_intensity)
-
-    # 온도 영향: 최적 온도(예: 25도)에서 최고, 너무 높거나 낮으면 감소
-    optimal_temp = 25
-    temp_effect = np.exp(-0.01 * (temperature - optimal_temp)**2)
-
-    # 이산화 탄소 농도 영향: 특정 농도까지는 증가하다가 포화
-    co2_effect = 1 - np.exp(-0.02 * co2_concentration)
+from utils.perf import start_rerun
 
-    # 모든 요인의 곱으로 광합성량 결정 (단순화된 모델)
-    photosynthesis_rate = 100 * light_effect * temp_effect * co2_effect
-    return photosynthesis_rate
+st.set_page_config(layout="centered", page_title="광합성량 시뮬레이션")
+perf = start_rerun("02_photosynthesis") # 재실행 구간별 시간 측정 (PERF_TRACE=1 또는 ?perf=1 일 때만 동작)
 
 st.title("🌱 환경 요인에 따른 광합성량 시뮬레이션")
 
@@ -33,6 +13,14 @@ st.markdown("""
 아래 슬라이더를 조절하여 각 환경 요인을 변경하고, 그에 따른 광합성량 변화를 그래프로 확인해보세요.
 """)
 
+# 그래프 모듈은 불러오는 데 오래 걸리므로(matplotlib만 0.5초 이상) 제목과 소개 글을 먼저 보낸 뒤 불러옴
+import plotly.graph_objects as go
+from plotly.subplots import make_subplots
+
+from utils.curve_renderer import MarkedCurveRenderer
+from utils.photosynthesis import build_response_grid, calculate_photosynthesis
+from utils.sensitivity import FACTORS, HISTOGRAM_BINS, curve_bands, make_spec, run_monte_carlo
+
 st.markdown("---")
 
 ## 환경 요인 조절 및 개별 그래프
@@ -44,6 +32,149 @@ default_light = 500
 default_temp = 25
 default_co2 = 400
 
+# --- 3차원 반응 격자 및 plotly 그래프 설정 ---
+SURFACE_MAX_POINTS = 100 # 곡면 그래프 한 축에 보낼 최대 점 개수 (브라우저로 보내는 데이터 양 제한)
+ISOSURFACE_MAX_POINTS = 30 # 등치면 그래프 한 축에 보낼 최대 점 개수 (30³ ≈ 2.7만 점)
+
+@st.cache_resource(show_spinner=False)
+def get_response_grid():
+    """빛 × 온도 × CO2 반응 격자를 프로세스당 한 번만 만들고(디스크에 있으면 메모리 맵으로 열고) 공유합니다."""
+    return build_response_grid()
+
+# 그래프 객체는 읽기만 하므로 복사(피클) 비용이 없는 cache_resource로 공유
+@st.cache_resource(show_spinner=False, max_entries=64)
+def build_surface_figure(co2_index):
+    """CO2 농도를 격자의 co2_index 위치에 고정한 빛 × 온도 곡면 그래프를 만듭니다."""
+    grid = get_response_grid()
+    co2_value = grid.co2_values[co2_index]
+    surface = np.asarray(grid.values[:, :, co2_index]) # (빛, 온도)
+    step = max(1, int(np.ceil(max(surface.shape) / SURFACE_MAX_POINTS)))
+    fig = go.Figure(go.Surface(
+        x=grid.temp_values[::step], y=grid.light_values[::step], z=surface[::step, ::step],
+        colorscale="Viridis", colorbar=dict(title="광합성량")
+    ))
+    fig.update_layout(
+        title=f"CO2 {co2_value:.0f} ppm에서의 빛 × 온도 반응 곡면",
+        scene=dict(xaxis_title="온도 (°C)", yaxis_title="빛의 세기 (lux)", zaxis_title="광합성량"),
+        height=550, margin=dict(l=0, r=0, t=40, b=0)
+    )
+    return fig
+
+@st.cache_resource(show_spinner=False)
+def build_isosurface_figure():
+    """격자 전체의 광합성량 등치면 그래프를 만듭니다."""
+    grid = get_response_grid().strided(ISOSURFACE_MAX_POINTS)
+    light, temp, co2 = np.meshgrid(grid.light_values, grid.temp_values, grid.co2_values, indexing="ij")
+    values = np.asarray(grid.values)
+    fig = go.Figure(go.Isosurface(
+        x=light.ravel(), y=temp.ravel(), z=co2.ravel(), value=values.ravel(),
+        isomin=float(values.max()) * 0.2, isomax=float(values.max()) * 0.9, surface_count=5,
+        colorscale="Viridis", caps=dict(x_show=False, y_show=False, z_show=False),
+        colorbar=dict(title="광합성량")
+    ))
+    fig.update_layout(
+        title="광합성량 등치면 (빛 × 온도 × CO2)",
+        scene=dict(xaxis_title="빛의 세기 (lux)", yaxis_title="온도 (°C)", zaxis_title="CO2 (ppm)"),
+        height=550, margin=dict(l=0, r=0, t=40, b=0)
+    )
+    return fig
+
+@st.cache_resource(show_spinner=False)
+def build_marginal_figure():
+    """각 요인에 대해 나머지 두 요인을 전체 범위에서 평균한 주변 곡선 그래프를 만듭니다."""
+    grid = get_response_grid()
+    fig = make_subplots(rows=1, cols=3, subplot_titles=("빛의 세기 (lux)", "온도 (°C)", "CO2 (ppm)"))
+    for col, (axis, color) in enumerate([("light", "orange"), ("temp", "red"), ("co2", "green")], start=1):
+        fig.add_trace(go.Scatter(x=grid.axis_values(axis), y=grid.marginal(axis), line=dict(color=color), showlegend=False), row=1, col=col)
+    fig.update_yaxes(title_text="평균 광합성량", row=1, col=1)
+    fig.update_layout(title="요인별 주변 평균 곡선 (나머지 두 요인 전체 범위 평균)", height=350, margin=dict(l=0, r=0, t=60, b=0))
+    return fig
+
+# --- 몬테카를로 민감도 분석 설정 ---
+DISTRIBUTION_LABELS = {"fixed": "고정", "normal": "정규 분포 (잡음)", "uniform": "균등 분포", "swing": "일교차 (주기 변동)"}
+FACTOR_LABELS = {"light": "빛의 세기", "temp": "온도", "co2": "CO2"}
+CURVE_AXES = {"light": np.linspace(0, 1000, 100), "temp": np.linspace(0, 40, 100), "co2": np.linspace(0, 1000, 100)}
+
+# 분포 설정과 표본 수가 같으면 다시 계산하지 않음 (결과는 요약 통계뿐이라 작음)
+@st.cache_data(show_spinner="표본을 뽑아 분석하는 중...", max_entries=32)
+def run_sensitivity_analysis(specs, n_samples):
+    return run_monte_carlo(specs, n_samples)
+
+def build_histogram_figure(result):
+    bin_centers = (HISTOGRAM_BINS[:-1] + HISTOGRAM_BINS[1:]) / 2
+    fig = go.Figure(go.Bar(x=bin_centers, y=result.histogram / result.n_samples, marker_color="seagreen"))
+    for percent, dash in [(5, "dot"), (50, "dash"), (95, "dot")]:
+        fig.add_vline(x=result.quantiles[percent], line_dash=dash, annotation_text=f"{percent}%")
+    fig.update_layout(
+        title=f"광합성량 분포 (표본 {result.n_samples:,}개)", xaxis_title="광합성량", yaxis_title="비율",
+        bargap=0, height=350, margin=dict(l=0, r=0, t=40, b=0)
+    )
+    return fig
+
+def build_sobol_figure(result):
+    labels = [FACTOR_LABELS[factor] for factor in FACTORS]
+    fig = go.Figure([
+        go.Bar(name="1차 지수", x=labels, y=[result.first_order[factor] for factor in FACTORS]),
+        go.Bar(name="전체 지수", x=labels, y=[result.total_order[factor] for factor in FACTORS]),
+    ])
+    fig.update_layout(title="요인별 Sobol 민감도 지수", yaxis_title="분산 기여 비율", yaxis_range=[0, 1.05], height=350, margin=dict(l=0, r=0, t=40, b=0))
+    return fig
+
+# 분포 설정이 같으면 신뢰 구간 곡선을 다시 계산하지 않음
+@st.cache_data(show_spinner=False, max_entries=32)
+def compute_curve_bands(specs):
+    return {axis: curve_bands(specs, axis, x_values) for axis, x_values in CURVE_AXES.items()}
+
+def build_band_figure(specs):
+    bands = compute_curve_bands(specs)
+    fig = make_subplots(rows=1, cols=3, subplot_titles=("빛의 세기 (lux)", "온도 (°C)", "CO2 (ppm)"))
+    for col, (axis, color) in enumerate([("light", "orange"), ("temp", "red"), ("co2", "green")], start=1):
+        x_values = CURVE_AXES[axis]
+        fig.add_trace(go.Scatter(x=x_values, y=bands[axis][95], line=dict(width=0), showlegend=False, hoverinfo="skip"), row=1, col=col)
+        fig.add_trace(go.Scatter(
+            x=x_values, y=bands[axis][5], line=dict(width=0), fill="tonexty", fillcolor="rgba(128, 128, 128, 0.3)",
+            name="5~95% 범위", showlegend=col == 1, hoverinfo="skip"
+        ), row=1, col=col)
+        fig.add_trace(go.Scatter(x=x_values, y=bands[axis][50], line=dict(color=color), name="중앙값", showlegend=False), row=1, col=col)
+    fig.update_yaxes(title_text="광합성량", row=1, col=1)
+    fig.update_layout(title="요인별 광합성량 곡선과 신뢰 구간", height=350, margin=dict(l=0, r=0, t=60, b=0))
+    return fig
+
+# --- 곡선 그래프 렌더러 (정적인 곡선은 한 번만 그리고, 슬라이더 위치의 세로선만 다시 그림) ---
+# 고정값이 같으면 모든 세션이 같은 렌더러와 PNG 캐시를 공유합니다.
+@st.cache_resource(show_spinner=False)
+def get_light_curve_renderer(fixed_temp, fixed_co2):
+    light_values = np.linspace(0, 1000, 100)
+    # 빛의 세기만 바꾸고 temperature와 co2_concentration은 기본값으로 고정
+    photosynthesis_vs_light = calculate_photosynthesis(light_values, fixed_temp, fixed_co2) # 곡선 전체를 한 번에 계산
+    return MarkedCurveRenderer(
+        light_values, photosynthesis_vs_light, color='orange',
+        title=f"빛의 세기에 따른 광합성량 (온도: {fixed_temp}°C, CO2: {fixed_co2} ppm 고정)",
+        xlabel="빛의 세기 (lux)", ylabel="광합성량", marker_label="현재 설정: {} lux"
+    )
+
+@st.cache_resource(show_spinner=False)
+def get_temp_curve_renderer(fixed_light, fixed_co2):
+    temp_values = np.linspace(0, 40, 100)
+    # 온도만 바꾸고 light_intensity와 co2_concentration은 기본값으로 고정
+    photosynthesis_vs_temp = calculate_photosynthesis(fixed_light, temp_values, fixed_co2)
+    return MarkedCurveRenderer(
+        temp_values, photosynthesis_vs_temp, color='red',
+        title=f"온도에 따른 광합성량 (빛: {fixed_light} lux, CO2: {fixed_co2} ppm 고정)",
+        xlabel="온도 (°C)", ylabel="광합성량", marker_label="현재 설정: {} °C"
+    )
+
+@st.cache_resource(show_spinner=False)
+def get_co2_curve_renderer(fixed_light, fixed_temp):
+    co2_values = np.linspace(0, 1000, 100)
+    # CO2 농도만 바꾸고 light_intensity와 temperature는 기본값으로 고정
+    photosynthesis_vs_co2 = calculate_photosynthesis(fixed_light, fixed_temp, co2_values)
+    return MarkedCurveRenderer(
+        co2_values, photosynthesis_vs_co2, color='green',
+        title=f"이산화 탄소 농도에 따른 광합성량 (빛: {fixed_light} lux, 온도: {fixed_temp}°C 고정)",
+        xlabel="이산화 탄소 농도 (ppm)", ylabel="광합성량", marker_label="현재 설정: {} ppm"
+    )
+
 # 1. 빛의 세기 조절 및 그래프
 st.markdown("### 💡 빛의 세기")
 light_intensity = st.slider(
@@ -57,19 +188,8 @@ light_intensity = st.slider(
 )
 
 # 빛의 세기 변화에 따른 광합성량 그래프
-fig_light, ax_light = plt.subplots(figsize=(10, 4))
-light_values = np.linspace(0, 1000, 100)
-# 현재 light_intensity는 슬라이더 값, temperature와 co2_concentration은 기본값 또는 다른 슬라이더의 현재 값을 사용
-photosynthesis_vs_light = [calculate_photosynthesis(l, default_temp, default_co2) for l in light_values]
-ax_light.plot(light_values, photosynthesis_vs_light, color='orange')
-ax_light.axvline(x=light_intensity, color='r', linestyle='--', label=f'현재 설정: {light_intensity} lux')
-ax_light.set_title(f"빛의 세기에 따른 광합성량 (온도: {default_temp}°C, CO2: {default_co2} ppm 고정)")
-ax_light.set_xlabel("빛의 세기 (lux)")
-ax_light.set_ylabel("광합성량")
-ax_light.grid(True)
-ax_light.legend()
-st.pyplot(fig_light)
-plt.close(fig_light) # 메모리 해제
+with perf.span("plot_light"):
+    st.image(get_light_curve_renderer(default_temp, default_co2).render(light_intensity), output_format="PNG")
 
 st.markdown("---")
 
@@ -86,19 +206,8 @@ temperature = st.slider(
 )
 
 # 온도 변화에 따른 광합성량 그래프
-fig_temp, ax_temp = plt.subplots(figsize=(10, 4))
-temp_values = np.linspace(0, 40, 100)
-# 현재 temperature는 슬라이더 값, light_intensity와 co2_concentration은 기본값 또는 다른 슬라이더의 현재 값을 사용
-photosynthesis_vs_temp = [calculate_photosynthesis(default_light, t, default_co2) for t in temp_values]
-ax_temp.plot(temp_values, photosynthesis_vs_temp, color='red')
-ax_temp.axvline(x=temperature, color='r', linestyle='--', label=f'현재 설정: {temperature} °C')
-ax_temp.set_title(f"온도에 따른 광합성량 (빛: {default_light} lux, CO2: {default_co2} ppm 고정)")
-ax_temp.set_xlabel("온도 (°C)")
-ax_temp.set_ylabel("광합성량")
-ax_temp.grid(True)
-ax_temp.legend()
-st.pyplot(fig_temp)
-plt.close(fig_temp) # 메모리 해제
+with perf.span("plot_temp"):
+    st.image(get_temp_curve_renderer(default_light, default_co2).render(temperature), output_format="PNG")
 
 st.markdown("---")
 
@@ -115,19 +224,8 @@ co2_concentration = st.slider(
 )
 
 # CO2 농도 변화에 따른 광합성량 그래프
-fig_co2, ax_co2 = plt.subplots(figsize=(10, 4))
-co2_values = np.linspace(0, 1000, 100)
-# 현재 co2_concentration은 슬라이더 값, light_intensity와 temperature는 기본값 또는 다른 슬라이더의 현재 값을 사용
-photosynthesis_vs_co2 = [calculate_photosynthesis(default_light, default_temp, c) for c in co2_values]
-ax_co2.plot(co2_values, photosynthesis_vs_co2, color='green')
-ax_co2.axvline(x=co2_concentration, color='r', linestyle='--', label=f'현재 설정: {co2_concentration} ppm')
-ax_co2.set_title(f"이산화 탄소 농도에 따른 광합성량 (빛: {default_light} lux, 온도: {default_temp}°C 고정)")
-ax_co2.set_xlabel("이산화 탄소 농도 (ppm)")
-ax_co2.set_ylabel("광합성량")
-ax_co2.grid(True)
-ax_co2.legend()
-st.pyplot(fig_co2)
-plt.close(fig_co2) # 메모리 해제
+with perf.span("plot_co2"):
+    st.image(get_co2_curve_renderer(default_light, default_temp).render(co2_concentration), output_format="PNG")
 
 st.markdown("---")
 
@@ -135,6 +233,89 @@ st.markdown("---")
 final_photosynthesis = calculate_photosynthesis(light_intensity, temperature, co2_concentration)
 st.subheader(f"✅ 현재 설정된 모든 환경 요인으로 계산된 총 광합성량: **{final_photosynthesis:.2f}** 단위")
 
+st.markdown("---")
+
+## 요인 간 상호작용 (3차원 반응 곡면)
+st.markdown("### 🧊 빛 × 온도 × CO2 상호작용 살펴보기")
+st.markdown("미리 계산해 둔 반응 격자에서 단면과 곡면을 읽어 그립니다. 그래프를 돌리거나 값에 마우스를 올리는 동작은 브라우저에서 처리되므로 페이지가 다시 실행되지 않습니다.")
+
+with perf.span("response_grid"):
+    response_grid = get_response_grid()
+    co2_index = response_grid.nearest_index("co2", co2_concentration)
+    co2_slice = response_grid.values[:, :, co2_index]
+    best_light_index, best_temp_index = np.unravel_index(int(np.argmax(co2_slice)), co2_slice.shape)
+st.markdown(
+    f"현재 CO2 농도(**{response_grid.co2_values[co2_index]:.0f} ppm**)에서 광합성량이 가장 큰 조건은 "
+    f"빛의 세기 **{response_grid.light_values[best_light_index]:.0f} lux**, 온도 **{response_grid.temp_values[best_temp_index]:.1f}°C** "
+    f"(광합성량 {float(co2_slice[best_light_index, best_temp_index]):.2f})입니다."
+)
+
+with perf.span("plot_surface"):
+    surface_tab, isosurface_tab, marginal_tab = st.tabs(["빛 × 온도 곡면 (현재 CO2)", "등치면", "주변 평균 곡선"])
+    with surface_tab:
+        st.plotly_chart(build_surface_figure(co2_index))
+    with isosurface_tab:
+        st.plotly_chart(build_isosurface_figure())
+    with marginal_tab:
+        st.plotly_chart(build_marginal_figure())
+
+st.markdown("---")
+
+## 몬테카를로 민감도 분석
+st.markdown("### 🎲 몬테카를로 민감도 분석")
+if st.toggle("민감도 분석 모드 켜기", key="sensitivity_mode", help="환경 요인이 흔들릴 때 광합성량이 얼마나 달라지는지 표본을 뽑아 분석합니다."):
+    with perf.span("sensitivity_analysis"):
+        st.markdown("위 슬라이더 값을 중심으로 각 요인이 흔들리는 방식을 정하고 **분석 실행**을 누르세요. 같은 설정의 결과는 저장해 두었다가 바로 보여줍니다.")
+        with st.form("sensitivity_form"):
+            columns = st.columns(3)
+            factor_inputs = {}
+            for column, (factor, label, center, default_kind, default_spread, max_spread) in zip(columns, [
+                ("light", "💡 빛의 세기 (lux)", light_intensity, "normal", 150.0, 500.0),
+                ("temp", "🌡️ 온도 (°C)", temperature, "swing", 8.0, 20.0),
+                ("co2", "💨 CO2 (ppm)", co2_concentration, "normal", 50.0, 500.0),
+            ]):
+                with column:
+                    st.markdown(f"**{label}** 중심값: {center}")
+                    kind = st.selectbox(
+                        "분포", list(DISTRIBUTION_LABELS), index=list(DISTRIBUTION_LABELS).index(default_kind),
+                        format_func=DISTRIBUTION_LABELS.get, key=f"sensitivity_{factor}_kind"
+                    )
+                    spread = st.number_input(
+                        "퍼짐 정도 (표준편차/반폭/진폭)", min_value=0.0, max_value=max_spread, value=default_spread,
+                        key=f"sensitivity_{factor}_spread"
+                    )
+                    factor_inputs[factor] = make_spec(kind, center, spread)
+            n_samples = st.select_slider(
+                "표본 수", options=[100_000, 300_000, 1_000_000, 3_000_000], value=1_000_000,
+                format_func=lambda n: f"{n:,}개", key="sensitivity_samples"
+            )
+            submitted = st.form_submit_button("분석 실행")
+
+        # 폼을 제출해야 분석하고, 이후 다른 위젯으로 재실행될 때는 마지막으로 제출한 설정을 다시 보여줌
+        if submitted:
+            st.session_state["sensitivity_specs"] = (factor_inputs, n_samples)
+        if "sensitivity_specs" in st.session_state:
+            specs, n_samples = st.session_state["sensitivity_specs"]
+            result = run_sensitivity_analysis(specs, n_samples)
+
+            metric_columns = st.columns(4)
+            metric_columns[0].metric("평균 광합성량", f"{result.mean:.2f}")
+            metric_columns[1].metric("표준편차", f"{result.std:.2f}")
+            metric_columns[2].metric("하위 5%", f"{result.quantiles[5]:.2f}")
+            metric_columns[3].metric("상위 5%", f"{result.quantiles[95]:.2f}")
+
+            histogram_tab, sobol_tab, band_tab = st.tabs(["광합성량 분포", "Sobol 민감도 지수", "신뢰 구간 곡선"])
+            with histogram_tab:
+                st.plotly_chart(build_histogram_figure(result))
+            with sobol_tab:
+                st.plotly_chart(build_sobol_figure(result))
+                st.caption("1차 지수는 그 요인 하나만으로 설명되는 분산의 비율, 전체 지수는 다른 요인과의 상호작용까지 포함한 비율입니다.")
+            with band_tab:
+                st.plotly_chart(build_band_figure(specs))
+                st.caption("각 곡선은 해당 요인만 바꾸고 나머지 두 요인은 위 분포에서 뽑았을 때의 중앙값과 5~95% 범위입니다.")
+
 st.markdown("---")
 st.info("이 시뮬레이션은 광합성 원리를 이해하기 위한 **매우 단순화된 모델**입니다. 실제 식물의 광합성은 훨씬 더 복잡하며, 다양한 생화학적 과정과 환경 요인들이 상호작용합니다.")
 st.markdown("궁금한 점이 있으시면 언제든지 질문해주세요!")
+
+perf.finish()
@@ -0,0 +1,57 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.downsample import downsample_long, lttb_indices
+
+
+@pytest.mark.parametrize("n, n_out", [(1000, 100), (1000, 3), (101, 50), (10, 9)])
+def test_lttb_keeps_endpoints_and_size(n, n_out):
+    rng = np.random.default_rng(n_out)
+    y = rng.normal(size=n).cumsum()
+    keep = lttb_indices(np.arange(n), y, n_out)
+
+    assert len(keep) == n_out
+    assert keep[0] == 0 and keep[-1] == n - 1
+    assert np.all(np.diff(keep) > 0)
+
+
+@pytest.mark.parametrize("n_out", [2, 10, 11])
+def test_lttb_returns_everything_when_nothing_to_drop(n_out):
+    keep = lttb_indices(np.arange(10), np.arange(10.0), n_out)
+    assert keep.tolist() == list(range(10))
+
+
+def test_lttb_keeps_spike():
+    y = np.zeros(1000)
+    y[437] = 50.0
+    assert 437 in lttb_indices(np.arange(1000), y, 20)
+
+
+def test_lttb_2d_matches_per_series():
+    rng = np.random.default_rng(0)
+    x = np.arange(500)
+    y = rng.normal(size=(500, 4)).cumsum(axis=0)
+    keep = lttb_indices(x, y, 60)
+
+    assert keep.shape == (60, 4)
+    for column in range(4):
+        assert keep[:, column].tolist() == lttb_indices(x, y[:, column], 60).tolist()
+
+
+def test_downsample_long_per_series_sizes_and_endpoints():
+    index = pd.bdate_range("2020-01-01", periods=300, name="Date")
+    rng = np.random.default_rng(1)
+    df = pd.DataFrame(rng.normal(size=(300, 3)).cumsum(axis=0), index=index, columns=["A", "B", "C"])
+    df.iloc[:100, 1] = np.nan # B는 늦게 상장
+
+    long = downsample_long(df, 50, var_name="기업", value_name="가격")
+
+    assert list(long.columns) == ["Date", "기업", "가격"]
+    assert list(long["기업"].unique()) == ["A", "B", "C"]
+    for company, part in long.groupby("기업"):
+        series = df[company].dropna()
+        assert len(part) == 50
+        assert part["Date"].iloc[0] == series.index[0]
+        assert part["Date"].iloc[-1] == series.index[-1]
+        assert part["가격"].tolist() == series.loc[part["Date"]].tolist()
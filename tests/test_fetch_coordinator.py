@@ -0,0 +1,138 @@
+import threading
+import time
+
+import pytest
+
+from utils import fetch_coordinator
+from utils.fetch_coordinator import FAILED_REFRESH_RETRY_SEC, FetchCoordinator
+
+TTL_SEC = 3600
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(fetch_coordinator, "time", fake)
+    return fake
+
+
+class Loader:
+    """호출 횟수를 세고, 미리 정해 둔 값을 차례로 돌려주는 불러오기 함수"""
+
+    def __init__(self, *values):
+        self.values = list(values)
+        self.calls = 0
+
+    def __call__(self, report):
+        self.calls += 1
+        value = self.values.pop(0)
+        if isinstance(value, Exception):
+            raise value
+        return value
+
+
+def wait_for_flights(coordinator, timeout=5):
+    deadline = time.monotonic() + timeout
+    while coordinator._flights:
+        assert time.monotonic() < deadline, "불러오기가 끝나지 않음"
+        time.sleep(0.01)
+
+
+def test_cold_unusable_result_is_retried_soon(clock):
+    coordinator = FetchCoordinator(ttl_sec=TTL_SEC)
+    loader = Loader([], ["AAPL"])
+
+    assert coordinator.get("k", loader).value == []
+    assert coordinator.get("k", loader).stale is False
+    assert loader.calls == 1
+
+    clock.now += FAILED_REFRESH_RETRY_SEC + 1 # TTL보다 훨씬 이르지만 다시 불러와야 함
+    result = coordinator.get("k", loader)
+    assert result.value == [] and result.stale is True
+    wait_for_flights(coordinator)
+
+    assert loader.calls == 2
+    result = coordinator.get("k", loader)
+    assert result.value == ["AAPL"] and result.stale is False
+
+
+def test_usable_result_is_kept_for_ttl(clock):
+    coordinator = FetchCoordinator(ttl_sec=TTL_SEC)
+    loader = Loader(["AAPL"])
+
+    coordinator.get("k", loader)
+    clock.now += TTL_SEC - 1
+    assert coordinator.get("k", loader).stale is False
+    assert loader.calls == 1
+
+
+def test_unusable_refresh_keeps_last_good_result(clock):
+    coordinator = FetchCoordinator(ttl_sec=TTL_SEC)
+    loader = Loader(["AAPL"], [], ["MSFT"])
+
+    first = coordinator.get("k", loader)
+    clock.now += TTL_SEC + 1
+    assert coordinator.get("k", loader).stale is True
+    wait_for_flights(coordinator)
+
+    kept = coordinator.get("k", loader)
+    assert kept.value == ["AAPL"] and kept.loaded_at == first.loaded_at and kept.stale is False
+    assert loader.calls == 2
+
+    clock.now += FAILED_REFRESH_RETRY_SEC + 1
+    coordinator.get("k", loader)
+    wait_for_flights(coordinator)
+    assert coordinator.get("k", loader).value == ["MSFT"]
+
+
+def test_failed_refresh_keeps_last_good_result(clock):
+    coordinator = FetchCoordinator(ttl_sec=TTL_SEC)
+    loader = Loader(["AAPL"], RuntimeError("요청 제한"))
+
+    coordinator.get("k", loader)
+    clock.now += TTL_SEC + 1
+    coordinator.get("k", loader)
+    wait_for_flights(coordinator)
+
+    assert coordinator.get("k", loader).value == ["AAPL"]
+    assert loader.calls == 2
+
+
+def test_cold_failure_is_raised_and_not_cached(clock):
+    coordinator = FetchCoordinator(ttl_sec=TTL_SEC)
+    loader = Loader(RuntimeError("네트워크 오류"), ["AAPL"])
+
+    with pytest.raises(RuntimeError):
+        coordinator.get("k", loader)
+    assert coordinator.get("k", loader).value == ["AAPL"]
+
+
+def test_concurrent_cold_requests_load_once(clock):
+    coordinator = FetchCoordinator(ttl_sec=TTL_SEC)
+    release = threading.Event()
+    calls = []
+
+    def loader(report):
+        calls.append(1)
+        release.wait(5)
+        return ["AAPL"]
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(coordinator.get("k", loader))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.1)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert len(calls) == 1
+    assert [r.value for r in results] == [["AAPL"]] * 8
@@ -0,0 +1,57 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from utils.itinerary import (
+    EXACT_ROUTE_MAX_STOPS,
+    distance_matrix,
+    nearest_neighbor_route,
+    plan_route,
+    route_length,
+)
+
+
+def random_stops(n, seed):
+    rng = np.random.default_rng(seed)
+    return distance_matrix(rng.uniform(32.5, 42.0, n), rng.uniform(-124.5, -114.0, n)), int(rng.integers(n))
+
+
+def brute_force_length(dist, start, round_trip):
+    others = [i for i in range(len(dist)) if i != start]
+    return min(
+        route_length(dist, [start, *order, *([start] if round_trip else [])])
+        for order in itertools.permutations(others)
+    )
+
+
+@pytest.mark.parametrize("round_trip", [False, True])
+@pytest.mark.parametrize("n", [1, 2, 5, EXACT_ROUTE_MAX_STOPS + 1, 60])
+def test_route_visits_every_stop_once_from_start(n, round_trip):
+    dist, start = random_stops(n, seed=n)
+    route = plan_route(dist, start=start, round_trip=round_trip)
+
+    assert route[0] == start
+    if round_trip:
+        assert len(route) == n + 1 and route[-1] == start
+        route = route[:-1]
+    assert sorted(route.tolist()) == list(range(n))
+
+
+@pytest.mark.parametrize("round_trip", [False, True])
+@pytest.mark.parametrize("n", range(2, EXACT_ROUTE_MAX_STOPS + 1))
+def test_small_routes_are_optimal(n, round_trip):
+    for seed in range(20):
+        dist, start = random_stops(n, seed=seed)
+        route = plan_route(dist, start=start, round_trip=round_trip)
+        assert route_length(dist, route) == pytest.approx(brute_force_length(dist, start, round_trip))
+
+
+@pytest.mark.parametrize("round_trip", [False, True])
+def test_large_routes_improve_on_nearest_neighbor(round_trip):
+    dist, start = random_stops(200, seed=1)
+    greedy = nearest_neighbor_route(dist, start)
+    if round_trip:
+        greedy = np.append(greedy, start)
+
+    assert route_length(dist, plan_route(dist, start=start, round_trip=round_trip)) < route_length(dist, greedy)
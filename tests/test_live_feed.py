@@ -0,0 +1,87 @@
+import sys
+import types
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.live_feed import LiveFeed, poll_interval
+from utils.market_data import LocalProvider, YFinanceProvider
+
+
+class FakeProvider:
+    """요청받은 since를 기록하고, 미리 넣어 둔 봉 중 since 이후만 돌려주는 제공자"""
+    name = "fake"
+    bar_seconds = 60
+
+    def __init__(self):
+        self.bars = pd.DataFrame(index=pd.DatetimeIndex([]), dtype="float64")
+        self.requests = []
+
+    def add(self, start, closes):
+        index = pd.date_range(start, periods=len(closes[0]), freq="1min")
+        rows = pd.DataFrame({ticker: values for ticker, values in zip(["AAA", "BBB"], closes)}, index=index)
+        self.bars = pd.concat([self.bars.loc[self.bars.index < index[0]], rows])
+
+    def fetch_recent_bars(self, tickers, since=None, max_bars=390):
+        self.requests.append(since)
+        bars = self.bars if since is None else self.bars.loc[self.bars.index >= since]
+        return {ticker: bars[ticker] for ticker in tickers if not bars.empty}
+
+
+def poll_now(feed):
+    feed._last_poll = float("-inf") # 요청 간격 제한을 건너뜀
+    return feed.poll()
+
+
+@pytest.fixture
+def feed():
+    return LiveFeed(FakeProvider(), {"A사": "AAA", "B사": "BBB"}, poll_sec=5)
+
+
+def test_poll_interval_is_at_least_bar_seconds(feed):
+    assert feed.poll_sec == 60
+    assert poll_interval(LocalProvider(), poll_sec=5) == LocalProvider.bar_seconds
+    assert poll_interval(LocalProvider(), poll_sec=30) == 30
+
+
+def test_poll_requests_only_bars_after_last_received(feed):
+    feed.provider.add("2024-06-03 09:30", [[100, 101, 102], [50, 51, 52]])
+    assert poll_now(feed)
+    feed.provider.add("2024-06-03 09:32", [[103, 104], [53, 54]]) # 진행 중이던 09:32 봉이 바뀌고 새 봉 추가
+    assert poll_now(feed)
+
+    assert feed.provider.requests == [None, pd.Timestamp("2024-06-03 09:32")]
+    assert feed.frame["A사"].tolist() == [100, 101, 103, 104]
+    assert feed.reference.to_dict() == {"A사": 100, "B사": 50}
+
+
+def test_reference_resets_each_trading_day(feed):
+    feed.provider.add("2024-06-03 15:58", [[100, 110], [50, 55]])
+    poll_now(feed)
+    feed.provider.add("2024-06-04 09:30", [[200, 210], [40, 44]])
+    poll_now(feed)
+
+    assert feed.frame.index.min() == pd.Timestamp("2024-06-04 09:30") # 전날 봉은 버림
+    assert feed.reference.to_dict() == {"A사": 200, "B사": 40}
+    change = feed.percent_change(feed.frame, ["A사", "B사"])
+    np.testing.assert_allclose(change.iloc[-1].to_numpy(), [5.0, 10.0])
+
+
+def test_yfinance_requests_only_new_bars(monkeypatch):
+    calls = []
+
+    def download(tickers, **kwargs):
+        calls.append(kwargs)
+        index = pd.DatetimeIndex(["2024-06-03 09:31", "2024-06-03 09:32"], tz="America/New_York")
+        return pd.DataFrame({("Close", t): [1.0, 2.0] for t in tickers}, index=index)
+
+    monkeypatch.setitem(sys.modules, "yfinance", types.SimpleNamespace(download=download))
+    provider = YFinanceProvider()
+
+    provider.fetch_recent_bars(["AAA", "BBB"])
+    bars = provider.fetch_recent_bars(["AAA", "BBB"], since=pd.Timestamp("2024-06-03 09:32"))
+
+    assert calls[0]["period"] == "1d" and "start" not in calls[0]
+    assert "period" not in calls[1] and pd.Timestamp(calls[1]["start"]) == pd.Timestamp("2024-06-03 09:32")
+    assert bars["AAA"].tolist() == [2.0]
@@ -0,0 +1,22 @@
+import datetime
+
+import pandas as pd
+
+from utils.market_data import LocalProvider
+
+
+def test_local_provider_is_deterministic_across_end_dates():
+    provider = LocalProvider()
+    start = datetime.date(2023, 1, 1)
+    short = provider.fetch_close("MSFT", start, datetime.date(2023, 6, 1))
+    long = provider.fetch_close("MSFT", start, datetime.date(2024, 12, 31))
+
+    shared = short.index.intersection(long.index)
+    assert len(shared) == len(short)
+    pd.testing.assert_series_equal(short.loc[shared], long.loc[shared])
+
+
+def test_local_provider_differs_between_tickers():
+    provider = LocalProvider()
+    start, end = datetime.date(2023, 1, 1), datetime.date(2023, 2, 1)
+    assert not provider.fetch_close("MSFT", start, end).equals(provider.fetch_close("NVDA", start, end))
@@ -0,0 +1,37 @@
+import sys
+
+import pandas as pd
+from streamlit.testing.v1 import AppTest
+
+from utils.poi_list import format_poi_lines
+
+
+def test_format_poi_lines():
+    rows = pd.DataFrame({"name": ["금문교", "인앤아웃"], "type": ["관광지", "맛집"], "desc": ["다리", "버거"]})
+    assert format_poi_lines(rows) == "- **금문교** (관광지): 다리\n- **인앤아웃** (맛집): 버거"
+
+
+def paged_list_app():
+    import numpy as np
+    import pandas as pd
+
+    from utils.poi_list import render_poi_list
+
+    class Store:
+        def rows(self, positions):
+            return pd.DataFrame({"name": [f"장소{p}" for p in positions], "type": "관광지", "desc": ""})
+
+    render_poi_list(Store(), np.arange(120), key="poi_page", page_size=50)
+
+
+def test_render_poi_list_sends_only_current_page(monkeypatch):
+    # AppTest는 실행한 스크립트를 __main__으로 남겨 두므로, 이후 테스트의 프로세스 풀이 그 스크립트를 불러오지 않도록 되돌림
+    monkeypatch.setitem(sys.modules, "__main__", sys.modules["__main__"])
+    at = AppTest.from_function(paged_list_app).run()
+    assert at.markdown[0].value.count("\n") == 49
+    assert "장소0**" in at.markdown[0].value
+
+    at.number_input(key="poi_page").set_value(3).run()
+    lines = at.markdown[0].value.splitlines()
+    assert len(lines) == 20 and lines[0].startswith("- **장소100**")
+    assert at.caption[0].value == "전체 120곳 중 101~120번째 장소"
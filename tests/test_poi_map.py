@@ -0,0 +1,44 @@
+import threading
+
+from utils import poi_map, warmup
+from utils.poi_map import MarkerLayerCache
+
+
+def test_prewarm_runs_once_per_cache_object(monkeypatch):
+    monkeypatch.setattr(warmup, "WARMUP_ON_START", True)
+    done = threading.Event()
+    calls = []
+
+    def prewarm(position_sets):
+        calls.append(position_sets)
+        done.set()
+
+    first = MarkerLayerCache(store=None)
+    monkeypatch.setattr(first, "prewarm", prewarm)
+    assert first.prewarm_in_background([]) is True
+    assert first.prewarm_in_background([]) is False
+    assert done.wait(5)
+
+    # 캐시를 비운 뒤 새로 만든 객체는 다시 예열해야 함
+    done.clear()
+    rebuilt = MarkerLayerCache(store=None)
+    monkeypatch.setattr(rebuilt, "prewarm", prewarm)
+    assert rebuilt.prewarm_in_background([]) is True
+    assert done.wait(5)
+    assert len(calls) == 2
+
+
+def test_prewarm_disabled(monkeypatch):
+    monkeypatch.setattr(warmup, "WARMUP_ON_START", False)
+    assert MarkerLayerCache(store=None).prewarm_in_background([]) is False
+
+
+def test_marker_layer_cache_reuses_layers():
+    store = poi_map.get_poi_store()
+    cache = MarkerLayerCache(store, max_entries=2)
+    positions = store.select(None, ["맛집"])[:5]
+
+    layer, high_volume = cache.get(positions)
+    again, _ = cache.get(positions.copy())
+    assert again.script is layer.script
+    assert high_volume is False
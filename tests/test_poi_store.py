@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+
+from utils.poi_store import CITY_AREAS, load_poi_store
+
+# 장소 저장소를 도입하기 전 페이지에 하드코딩되어 있던 도시별 장소 이름 목록 (pages/00 기준, main.py는 숙소를 뺀 부분집합)
+LEGACY_CITY_NAMES = {
+    "샌프란시스코": {"샌프란시스코 금문교", "인앤아웃 버거 (In-N-Out)", "필즈 커피 (Philz Coffee)", "페어몬트 샌프란시스코"},
+    "로스앤젤레스": {"디즈니랜드 리조트", "Roscoe's Chicken and Waffles", "그리피스 천문대", "산타모니카 피어", "게티 센터", "더 비벌리 힐스 호텔"},
+    "요세미티": {"요세미티 국립공원", "요세미티 밸리 롯지"},
+    "샌디에이고": {"샌디에이고 라호야 비치", "맨체스터 그랜드 하얏트 샌디에이고"},
+}
+
+
+@pytest.fixture(scope="module")
+def store():
+    return load_poi_store(synthetic_count=0)
+
+
+def names(store, positions):
+    return set(store.rows(positions)["name"])
+
+
+def test_city_areas_cover_legacy_cities():
+    assert set(CITY_AREAS) == set(LEGACY_CITY_NAMES)
+
+
+@pytest.mark.parametrize("city", sorted(LEGACY_CITY_NAMES))
+def test_city_filter_matches_legacy_lists(store, city):
+    assert names(store, store.select(city)) == LEGACY_CITY_NAMES[city]
+
+
+@pytest.mark.parametrize("city", sorted(LEGACY_CITY_NAMES))
+def test_city_and_type_filter_matches_legacy_lists(store, city):
+    # main.py는 관광지와 맛집만 보여 줌
+    expected = {name for name in LEGACY_CITY_NAMES[city] if name in names(store, store.select(None, ["관광지", "맛집"]))}
+    assert names(store, store.select(city, ["관광지", "맛집"])) == expected
+
+
+def test_city_column_matches_positions(store):
+    for city, positions in store.city_positions.items():
+        assert np.array_equal(np.flatnonzero(store.frame["city"] == city), positions)
+    assert store.frame["city"].notna().all() # 기본 데이터의 모든 장소는 어느 한 도시에 속함
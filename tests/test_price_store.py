@@ -0,0 +1,130 @@
+import datetime
+import threading
+
+import numpy as np
+import pandas as pd
+
+from utils.price_store import PriceStore
+
+START = datetime.date(2024, 1, 1)
+END = datetime.date(2024, 3, 1)
+
+
+def make_close(start, end, scale=1.0):
+    dates = pd.bdate_range(start, end - datetime.timedelta(days=1), name="Date")
+    return pd.Series(scale * np.linspace(100, 120, len(dates)), index=dates, name="Close")
+
+
+def test_write_then_read_round_trip(tmp_path):
+    store = PriceStore(tmp_path)
+    close = make_close(START, END)
+    store.write("AAPL", close, START, END)
+
+    assert store.coverage("AAPL") == (START, END)
+    pd.testing.assert_series_equal(store.read("AAPL", START, END), close, check_freq=False)
+    assert store.read("AAPL", START, END + datetime.timedelta(days=5)) is None
+
+
+def test_concurrent_writes_leave_a_complete_file(tmp_path):
+    store = PriceStore(tmp_path)
+    closes = [make_close(START, END, scale=1 + i / 10) for i in range(8)]
+    errors = []
+    barrier = threading.Barrier(len(closes))
+
+    def write(close):
+        try:
+            barrier.wait()
+            for _ in range(5):
+                store.write("AAPL", close, START, END)
+        except Exception as e: # 임시 파일이 겹치면 다른 스레드가 이미 옮긴 파일을 찾지 못해 실패함
+            errors.append(e)
+
+    threads = [threading.Thread(target=write, args=(close,)) for close in closes]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    stored = store.read("AAPL", START, END)
+    assert any(stored.equals(close.rename_axis("Date")) for close in closes)
+    assert list(tmp_path.glob("*.tmp")) == []
+
+
+def test_append_tail_extends_history(tmp_path):
+    store = PriceStore(tmp_path)
+    store.write("AAPL", make_close(START, END), START, END)
+    new_end = datetime.date(2024, 4, 1)
+    tail_start = store.tail_start("AAPL", START, new_end)
+    full = make_close(START, new_end)
+    # make_close는 기간에 따라 값 간격이 달라지므로, 저장된 마지막 날 값을 맞춘 꼬리를 만듦
+    stored = store.read("AAPL", START, END)
+    tail = pd.concat([stored.iloc[-1:], full.loc[full.index > stored.index[-1]]])
+
+    assert tail_start == stored.index[-1].date()
+    assert store.append_tail("AAPL", tail, new_end)
+    assert store.coverage("AAPL") == (START, new_end)
+    assert len(store.read("AAPL", START, new_end)) == len(full)
+
+
+def test_append_tail_rejects_adjusted_prices(tmp_path):
+    store = PriceStore(tmp_path)
+    store.write("AAPL", make_close(START, END), START, END)
+    stored = store.read("AAPL", START, END)
+    new_end = datetime.date(2024, 4, 1)
+    adjusted_tail = make_close(stored.index[-1].date(), new_end, scale=0.5) # 분할로 과거 가격이 절반이 된 경우
+
+    assert not store.append_tail("AAPL", adjusted_tail, new_end)
+    assert store.coverage("AAPL") == (START, END) # 저장소는 그대로 두고 호출하는 쪽이 전체를 다시 받음
+
+
+def test_append_tail_without_overlap_is_rejected(tmp_path):
+    store = PriceStore(tmp_path)
+    store.write("AAPL", make_close(START, END), START, END)
+    new_end = datetime.date(2024, 5, 1)
+
+    assert not store.append_tail("AAPL", make_close(datetime.date(2024, 4, 1), new_end), new_end)
+
+
+def test_reader_never_pairs_prices_with_another_writes_coverage(tmp_path):
+    store = PriceStore(tmp_path)
+    long_end = datetime.date(2024, 6, 1)
+    short, long = make_close(START, END), make_close(START, long_end)
+    store.write("AAPL", short, START, END)
+    stop = threading.Event()
+    mismatches = []
+
+    def writer():
+        while not stop.is_set():
+            store.write("AAPL", long, START, long_end)
+            store.write("AAPL", short, START, END)
+
+    def reader():
+        while not stop.is_set():
+            try:
+                close = store.read("AAPL", START, long_end)
+            except Exception as e: # 교체 중인 파일을 섞어 읽은 경우
+                mismatches.append(e)
+                continue
+            if close is not None and len(close) != len(long): # 짧은 가격을 긴 기간으로 잘못 본 경우
+                mismatches.append(len(close))
+
+    threads = [threading.Thread(target=writer), *(threading.Thread(target=reader) for _ in range(3))]
+    for thread in threads:
+        thread.start()
+    threading.Event().wait(1.0)
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    assert mismatches == []
+
+
+def test_file_without_coverage_metadata_is_not_trusted(tmp_path):
+    close = make_close(START, END)
+    close.to_frame().to_parquet(tmp_path / "AAPL.parquet") # 기간 정보가 없는 이전 형식 파일
+    store = PriceStore(tmp_path)
+
+    assert store.coverage("AAPL") is None
+    assert store.read("AAPL", START, END) is None
+    assert store.tail_start("AAPL", START, END) is None
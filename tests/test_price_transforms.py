@@ -0,0 +1,87 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.price_transforms import (
+    TRADING_DAYS_PER_YEAR,
+    compute_price_metrics,
+    drawdown,
+    log_returns,
+    rebase_to_first_valid,
+    rolling_volatility,
+)
+
+# float32로 계산하므로 float64 pandas 계산과는 유효숫자 약 7자리까지만 일치
+RTOL = 1e-5
+RETURN_ATOL = 1e-6 # 일간 수익률은 0에 가까우므로 절대 오차로 비교
+
+
+@pytest.fixture
+def prices():
+    rng = np.random.default_rng(5)
+    index = pd.bdate_range("2023-01-02", periods=300, name="Date")
+    frame = pd.DataFrame(
+        rng.uniform(20, 500, 4) * np.exp(np.cumsum(rng.normal(0.0003, 0.02, size=(300, 4)), axis=0)),
+        index=index, columns=["AAPL", "LATE", "GONE", "BOTH"],
+    )
+    frame.iloc[:40, 1] = np.nan # 늦게 상장
+    frame.iloc[-25:, 2] = np.nan # 상장 폐지
+    frame.iloc[:10, 3] = np.nan
+    frame.iloc[-10:, 3] = np.nan
+    return frame
+
+
+def legacy_rebase(prices, base=100.0):
+    """price_transforms 이전 페이지의 컬럼별 정규화"""
+    initial_values = pd.Series(dtype="float64")
+    for col in prices.columns:
+        first_valid_idx = prices[col].first_valid_index()
+        initial_values[col] = prices.loc[first_valid_idx, col] if first_valid_idx is not None else np.nan
+    initial_values = initial_values.dropna()
+    return (prices[initial_values.index] / initial_values * base).dropna(axis=1, how="all")
+
+
+def legacy_log_returns(prices):
+    return pd.DataFrame({col: np.log(prices[col] / prices[col].shift(1)) for col in prices.columns})
+
+
+def assert_frames_close(actual, expected, atol=0.0):
+    assert list(actual.columns) == list(expected.columns)
+    assert actual.index.equals(expected.index)
+    np.testing.assert_array_equal(np.isnan(actual.to_numpy()), np.isnan(expected.to_numpy()))
+    np.testing.assert_allclose(actual.to_numpy(dtype=np.float64), expected.to_numpy(), rtol=RTOL, atol=atol, equal_nan=True)
+
+
+def test_rebase_matches_per_column_loop(prices):
+    assert_frames_close(rebase_to_first_valid(prices), legacy_rebase(prices))
+
+
+def test_rebase_drops_empty_and_zero_columns(prices):
+    prices["EMPTY"] = np.nan
+    prices["ZERO"] = 0.0
+    assert list(rebase_to_first_valid(prices).columns) == ["AAPL", "LATE", "GONE", "BOTH"]
+
+
+def test_log_returns_match_per_column(prices):
+    assert_frames_close(log_returns(prices), legacy_log_returns(prices), atol=RETURN_ATOL)
+
+
+def test_rolling_volatility_matches_per_column(prices):
+    expected = pd.DataFrame({
+        col: returns.rolling(21, min_periods=21).std() * np.sqrt(TRADING_DAYS_PER_YEAR)
+        for col, returns in legacy_log_returns(prices).items()
+    })
+    assert_frames_close(rolling_volatility(log_returns(prices), window=21), expected, atol=RETURN_ATOL)
+
+
+def test_drawdown_matches_per_column(prices):
+    expected = pd.DataFrame({col: prices[col] / prices[col].cummax() - 1 for col in prices.columns})
+    assert_frames_close(drawdown(prices), expected, atol=RETURN_ATOL)
+    assert (drawdown(prices).max() <= 0).all()
+
+
+def test_correlation_matches_pandas(prices):
+    metrics = compute_price_metrics(prices)
+    expected = legacy_log_returns(prices).corr()
+    np.testing.assert_allclose(metrics.correlation.to_numpy(dtype=np.float64), expected.to_numpy(), rtol=1e-4, atol=1e-5)
+    assert list(metrics.correlation.columns) == list(prices.columns)
@@ -0,0 +1,30 @@
+import pytest
+
+from utils import sensitivity
+from utils.sensitivity import make_spec, run_monte_carlo
+
+SPECS = {
+    "light": make_spec("normal", 600, 150),
+    "temp": make_spec("swing", 25, 5),
+    "co2": make_spec("uniform", 500, 100),
+}
+
+
+@pytest.fixture(scope="module")
+def inline_result():
+    return run_monte_carlo(SPECS, 4000, chunk_size=1000, max_workers=1, seed=3)
+
+
+def test_pool_uses_requested_worker_count(inline_result):
+    result = run_monte_carlo(SPECS, 4000, chunk_size=1000, max_workers=2, seed=3)
+
+    assert sensitivity._pools[2]._max_workers == 2
+    assert result.mean == pytest.approx(inline_result.mean)
+    assert result.histogram.tolist() == inline_result.histogram.tolist()
+
+
+def test_result_summary(inline_result):
+    assert inline_result.n_samples == 4000
+    assert inline_result.histogram.sum() == 4000
+    assert set(inline_result.first_order) == set(sensitivity.FACTORS)
+    assert list(inline_result.quantiles.values()) == sorted(inline_result.quantiles.values())
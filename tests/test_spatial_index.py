@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+
+from utils.spatial_index import GridIndex, haversine_km
+
+
+@pytest.fixture(scope="module")
+def points():
+    rng = np.random.default_rng(7)
+    lat = rng.uniform(32.5, 42.0, 5000) # 캘리포니아 범위
+    lon = rng.uniform(-124.5, -114.0, 5000)
+    return lat, lon
+
+
+@pytest.mark.parametrize("cell_deg", [0.05, 0.5, 3.0])
+def test_query_bbox_matches_brute_force(points, cell_deg):
+    lat, lon = points
+    index = GridIndex(lat, lon, cell_deg=cell_deg)
+    rng = np.random.default_rng(int(cell_deg * 100))
+    for _ in range(50):
+        south, north = np.sort(rng.uniform(31.0, 43.5, 2)) # 점 범위를 벗어나는 상자도 포함
+        west, east = np.sort(rng.uniform(-126.0, -112.5, 2))
+        expected = np.flatnonzero((lat >= south) & (lat <= north) & (lon >= west) & (lon <= east))
+        assert index.query_bbox(south, west, north, east).tolist() == expected.tolist()
+
+
+@pytest.mark.parametrize("radius_km", [1.0, 25.0, 300.0])
+def test_query_radius_matches_brute_force(points, radius_km):
+    lat, lon = points
+    index = GridIndex(lat, lon)
+    rng = np.random.default_rng(int(radius_km))
+    for center_lat, center_lon in zip(rng.uniform(32.5, 42.0, 30), rng.uniform(-124.5, -114.0, 30)):
+        expected = np.flatnonzero(haversine_km(center_lat, center_lon, lat, lon) <= radius_km)
+        assert index.query_radius(center_lat, center_lon, radius_km).tolist() == expected.tolist()
+
+
+def test_whole_extent_and_empty_queries(points):
+    lat, lon = points
+    index = GridIndex(lat, lon)
+
+    assert index.query_bbox(-90, -180, 90, 180).tolist() == list(range(len(lat)))
+    assert len(index.query_bbox(40, -120, 35, -118)) == 0 # 남쪽이 북쪽보다 큼
+    assert len(GridIndex([], []).query_bbox(-90, -180, 90, 180)) == 0
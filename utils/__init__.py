@@ -0,0 +1 @@
+# 여러 페이지에서 함께 사용하는 데이터 로딩/가공 도구 모음
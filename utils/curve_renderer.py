@@ -0,0 +1,73 @@
+import io
+import threading
+from collections import OrderedDict
+
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+import matplotlib.image as mpimg
+
+FIGURE_SIZE = (10, 4)
+FIGURE_DPI = 140 # 1400px 폭: Streamlit이 이미지를 다시 줄이고 인코딩하는 최대 폭(1460px)보다 작게 유지
+MAX_CACHED_IMAGES = 128 # 곡선 하나당 보관할 PNG 개수 (가장 오래 쓰이지 않은 것부터 제거)
+
+
+class MarkedCurveRenderer:
+    """
+    고정된 곡선 위에 '현재 설정' 세로선 하나만 움직이는 그래프를 PNG로 그립니다.
+    곡선·축·격자 같은 정적인 부분은 처음 한 번만 그려 배경 이미지로 보관하고,
+    요청마다 배경을 복원한 뒤 세로선과 범례만 덧그립니다(블리팅).
+    만든 PNG는 세로선 위치를 키로 LRU 방식으로 캐시합니다.
+    """
+
+    def __init__(self, x_values, y_values, color, title, xlabel, ylabel, marker_label, max_cached=MAX_CACHED_IMAGES):
+        self.marker_label = marker_label # 예: "현재 설정: {} lux"
+        self.max_cached = max_cached
+        self._images = OrderedDict()
+        self._lock = threading.Lock() # matplotlib 객체는 스레드 안전하지 않으므로 세션 간 동시 접근을 막음
+
+        self.figure = Figure(figsize=FIGURE_SIZE, dpi=FIGURE_DPI)
+        self.canvas = FigureCanvasAgg(self.figure)
+        self.axes = self.figure.add_subplot()
+        self.axes.plot(x_values, y_values, color=color)
+        self.axes.set_title(title)
+        self.axes.set_xlabel(xlabel)
+        self.axes.set_ylabel(ylabel)
+        self.axes.grid(True)
+
+        # 움직이는 부분은 animated로 지정해 배경을 그릴 때 제외
+        self.marker = self.axes.axvline(x=x_values[0], color='r', linestyle='--', label=marker_label.format(x_values[0]))
+        self.legend = self.axes.legend()
+        self.marker.set_animated(True)
+        self.legend.set_animated(True)
+
+        self.figure.tight_layout()
+        self.canvas.draw()
+        self._background = self.canvas.copy_from_bbox(self.figure.bbox)
+
+    def render(self, marker_x):
+        """
+        세로선을 marker_x에 둔 그래프의 PNG 바이트를 반환합니다.
+        Streamlit이 다시 인코딩하지 않도록 st.image(..., output_format="PNG")로 표시하세요.
+        """
+        with self._lock:
+            png = self._images.get(marker_x)
+            if png is not None:
+                self._images.move_to_end(marker_x)
+                return png
+
+            self.canvas.restore_region(self._background)
+            self.marker.set_xdata([marker_x, marker_x])
+            self.legend.get_texts()[0].set_text(self.marker_label.format(marker_x))
+            self.axes.draw_artist(self.marker)
+            self.axes.draw_artist(self.legend)
+
+            buffer = io.BytesIO()
+            # 압축 수준을 낮춰 인코딩 시간을 줄임 (그래프는 단색 영역이 많아 크기 차이가 작음)
+            mpimg.imsave(buffer, np.asarray(self.canvas.buffer_rgba())[..., :3], format="png", pil_kwargs={"compress_level": 1})
+            png = buffer.getvalue()
+
+            self._images[marker_x] = png
+            if len(self._images) > self.max_cached:
+                self._images.popitem(last=False)
+            return png
@@ -0,0 +1,82 @@
+import numpy as np
+import pandas as pd
+
+# 넓은 레이아웃에서 차트가 차지하는 대략적인 가로 픽셀 수 (시리즈당 최대 점 개수로 사용. 주식 페이지와 벤치마크가 함께 씀)
+CHART_WIDTH_PX = 1200
+
+
+def lttb_indices(x, y, n_out):
+    """
+    Largest-Triangle-Three-Buckets(LTTB) 알고리즘으로 남길 점의 위치를 고릅니다.
+    첫 점과 마지막 점은 항상 남기고, 나머지 구간을 n_out - 2개의 버킷으로 나누어
+    버킷마다 이전 선택점·다음 버킷 평균점과 만드는 삼각형 넓이가 가장 큰 점 하나를 고릅니다.
+    y가 (점 개수, 시리즈 수) 2차원 배열이면 같은 x를 쓰는 시리즈들을 한 번에 처리해 (n_out, 시리즈 수) 배열을 반환합니다.
+    버킷 사이의 순서 의존(이전 선택점)만 반복문으로 처리하고, 버킷 안의 계산은 모든 시리즈에 대해 한 번에 합니다.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.broadcast_to(np.arange(n).reshape((n,) + (1,) * (y.ndim - 1)), (n,) + y.shape[1:]).copy()
+
+    y2 = y.reshape(n, -1)
+    columns = np.arange(y2.shape[1])
+    bucket_edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64) # 첫/마지막 점을 뺀 구간의 버킷 경계
+    next_ends = np.append(bucket_edges[2:], n)
+    # 다음 버킷의 평균점은 이전 선택과 무관하므로 누적합으로 모든 버킷을 한 번에 계산
+    x_cumsum = np.concatenate(([0.0], np.cumsum(x)))
+    y_cumsum = np.vstack((np.zeros((1, y2.shape[1])), np.cumsum(y2, axis=0)))
+    counts = next_ends - bucket_edges[1:]
+    avg_x = (x_cumsum[next_ends] - x_cumsum[bucket_edges[1:]]) / counts
+    avg_y = (y_cumsum[next_ends] - y_cumsum[bucket_edges[1:]]) / counts[:, None]
+
+    selected = np.empty((n_out, y2.shape[1]), dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    prev = selected[0]
+    for i in range(n_out - 2):
+        start, end = bucket_edges[i], bucket_edges[i + 1]
+        prev_x, prev_y = x[prev], y2[prev, columns]
+        area = np.abs(
+            (prev_x - avg_x[i]) * (y2[start:end] - prev_y)
+            - (prev_x - x[start:end, None]) * (avg_y[i] - prev_y)
+        )
+        prev = start + area.argmax(axis=0)
+        selected[i + 1] = prev
+    return selected.reshape((n_out,) + y.shape[1:])
+
+
+def downsample_long(df, max_points_per_series, var_name="series", value_name="value"):
+    """
+    넓은 형태(컬럼 = 시리즈)의 DataFrame을 시리즈별로 LTTB 다운샘플링해 긴 형태로 반환합니다.
+    시리즈마다 남는 날짜가 다르기 때문에, 값이 비는 칸 없이 `x`, `color` 인코딩으로 그릴 수 있는 긴 형태를 사용합니다.
+    값이 있는 날짜가 같은 시리즈끼리(대개 상장일이 같은 종목들) 묶어 한 번에 다운샘플링합니다.
+    """
+    index_name = df.index.name or "index"
+    x_all = df.index.to_numpy()
+    x_numeric = x_all.astype("datetime64[ns]").astype(np.int64) if isinstance(df.index, pd.DatetimeIndex) else x_all
+    values = df.to_numpy(dtype=np.float64)
+    columns = df.columns.to_numpy()
+
+    groups = {}
+    for position, valid in enumerate(~np.isnan(values.T)):
+        groups.setdefault(valid.tobytes(), (valid, []))[1].append(position)
+
+    parts = []
+    for valid, positions in groups.values():
+        rows = np.flatnonzero(valid)
+        if len(rows) == 0:
+            continue
+        group_values = values[rows][:, positions]
+        keep = lttb_indices(x_numeric[rows], group_values, max_points_per_series) # (남길 점 수, 시리즈 수)
+        parts.append(pd.DataFrame({
+            index_name: x_all[rows[keep.T.ravel()]],
+            var_name: np.repeat(columns[positions], len(keep)),
+            value_name: np.take_along_axis(group_values, keep, axis=0).T.ravel(),
+        }))
+
+    if not parts:
+        return pd.DataFrame(columns=[index_name, var_name, value_name])
+    result = pd.concat(parts, ignore_index=True)
+    # 원래 컬럼 순서대로 정렬 (묶음 순서와 무관하게 같은 결과가 나오도록)
+    order = pd.Categorical(result[var_name], categories=list(dict.fromkeys(columns)), ordered=True)
+    return result.iloc[np.argsort(order.codes, kind="stable")].reset_index(drop=True)
@@ -0,0 +1,120 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, TimeoutError as FuturesTimeoutError
+from dataclasses import dataclass
+
+DEFAULT_TTL_SEC = 3600 # 이보다 오래된 결과는 오래된(stale) 것으로 보고 백그라운드에서 다시 불러옴
+DEFAULT_MAX_ENTRIES = 16 # 보관할 결과 수 (가장 오래 쓰이지 않은 것부터 제거)
+FAILED_REFRESH_RETRY_SEC = 300 # 불러온 결과를 쓸 수 없거나 실패했을 때 다시 시도하기까지 기다리는 시간
+PROGRESS_POLL_SEC = 0.2 # 불러오기를 기다리는 세션이 진행률을 확인하는 간격
+
+logger = logging.getLogger("fetch")
+
+
+@dataclass(frozen=True)
+class FetchResult:
+    """FetchCoordinator.get()의 반환값. value는 모든 세션이 공유하므로 읽기 전용으로만 쓰세요."""
+    value: object
+    loaded_at: float # 불러오기를 마친 시각 (time.time())
+    stale: bool # TTL이 지난 결과를 먼저 돌려주고 백그라운드에서 새로 불러오는 중이면 True
+
+
+class _Flight:
+    """진행 중인 불러오기 하나. 기다리는 세션들이 같은 Future와 진행률을 봅니다."""
+
+    def __init__(self):
+        self.future = Future()
+        self.progress = (0.0, None) # (0~1 진행률, 진행 메시지)
+
+    def report(self, fraction, text=None):
+        self.progress = (fraction, text)
+
+
+class FetchCoordinator:
+    """
+    여러 세션이 같은 데이터를 동시에 요청할 때 실제 불러오기는 키마다 한 번만 실행되도록 조율합니다. (single-flight)
+    - 결과가 없으면: 처음 요청한 세션이 작업 스레드에서 불러오기를 시작하고, 같은 키를 요청한 다른 세션은 그 결과를 함께 기다립니다.
+    - 결과가 TTL보다 오래됐으면: 마지막으로 받은 결과를 바로 돌려주고, 백그라운드에서 한 번만 새로 불러와 교체합니다. (stale-while-revalidate)
+    불러오기는 요청한 세션의 스크립트 스레드가 아닌 별도 스레드에서 실행되므로, 세션이 재실행되거나 닫혀도 다른 세션의 결과에 영향이 없습니다.
+    진행률·메시지 같은 화면 표시는 각 세션이 on_progress 콜백과 결과값으로 직접 그립니다.
+    """
+
+    def __init__(self, ttl_sec=DEFAULT_TTL_SEC, max_entries=DEFAULT_MAX_ENTRIES):
+        self.ttl_sec = ttl_sec
+        self.max_entries = max_entries
+        self._results = OrderedDict() # {키: (값, 불러온 시각, 다시 불러올 시각)}
+        self._flights = {} # {키: _Flight}
+        self._lock = threading.Lock()
+
+    def get(self, key, loader, on_progress=None, is_usable=bool):
+        """
+        key의 결과를 FetchResult로 반환합니다. loader(report)는 결과를 만드는 함수로, report(진행률, 메시지)로 진행 상황을 알릴 수 있습니다.
+        결과를 기다리는 동안에는 호출한 스레드에서 on_progress(진행률, 메시지)를 주기적으로 부릅니다.
+        새로 불러온 결과가 is_usable을 만족하지 않으면(예: 모든 종목 다운로드 실패) 마지막으로 받은 좋은 결과를 유지합니다.
+        """
+        with self._lock:
+            cached = self._results.get(key)
+            if cached is not None:
+                self._results.move_to_end(key)
+                value, loaded_at, refresh_at = cached
+                if time.time() < refresh_at:
+                    return FetchResult(value, loaded_at, stale=False)
+            flight = self._flights.get(key)
+            if flight is None:
+                flight = self._start_flight(key, loader, is_usable)
+        if cached is not None:
+            return FetchResult(cached[0], cached[1], stale=True)
+        return self._wait(flight, on_progress)
+
+    def _start_flight(self, key, loader, is_usable):
+        # self._lock을 잡은 상태에서 호출
+        flight = _Flight()
+        self._flights[key] = flight
+        threading.Thread(target=self._run_flight, args=(key, flight, loader, is_usable), name="fetch-flight", daemon=True).start()
+        return flight
+
+    def _run_flight(self, key, flight, loader, is_usable):
+        try:
+            value = loader(flight.report)
+        except Exception as e:
+            logger.exception("불러오기 실패: %r", key)
+            with self._lock:
+                self._flights.pop(key, None)
+                previous = self._results.get(key)
+                if previous is not None: # 이전 결과는 그대로 두고 조금 뒤에 다시 시도
+                    self._results[key] = (*previous[:2], time.time() + FAILED_REFRESH_RETRY_SEC)
+            flight.future.set_exception(e)
+            return
+
+        loaded_at = time.time()
+        with self._lock:
+            self._flights.pop(key, None)
+            previous = self._results.get(key)
+            if previous is not None and not is_usable(value):
+                # 새로 받은 결과를 쓸 수 없으면 마지막 좋은 결과를 계속 보여 주고, 조금 뒤에 다시 시도 (요청 제한 중에 계속 두드리지 않도록)
+                value, loaded_at, _ = previous
+                self._results[key] = (value, loaded_at, time.time() + FAILED_REFRESH_RETRY_SEC)
+            else:
+                # 처음 받은 결과를 쓸 수 없으면 보관은 하되 TTL 전체가 아니라 조금 뒤에 다시 시도
+                retry_after = self.ttl_sec if is_usable(value) else FAILED_REFRESH_RETRY_SEC
+                self._results[key] = (value, loaded_at, loaded_at + retry_after)
+                self._results.move_to_end(key)
+                while len(self._results) > self.max_entries:
+                    self._results.popitem(last=False)
+        flight.future.set_result(FetchResult(value, loaded_at, stale=False))
+
+    def _wait(self, flight, on_progress):
+        while True:
+            if on_progress is not None:
+                on_progress(*flight.progress)
+            try:
+                return flight.future.result(timeout=PROGRESS_POLL_SEC)
+            except FuturesTimeoutError:
+                continue
+
+    def clear(self):
+        """보관한 결과를 모두 지웁니다. (진행 중인 불러오기는 끝까지 실행됨)"""
+        with self._lock:
+            self._results.clear()
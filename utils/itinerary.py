@@ -0,0 +1,94 @@
+import itertools
+
+import numpy as np
+
+from utils.spatial_index import haversine_km
+
+MAX_ROUTE_STOPS = 500 # 동선을 계산할 최대 장소 수 (거리 행렬 크기가 N²이므로 제한)
+MAX_TWO_OPT_PASSES = 50 # 2-opt 개선을 반복할 최대 횟수 (대개 10회 안에 더 줄일 곳이 없어짐)
+EXACT_ROUTE_MAX_STOPS = 8 # 장소가 이 수 이하이면 모든 방문 순서를 비교해 최적 경로를 구함 (출발지 제외 7! = 5040가지)
+
+
+def distance_matrix(lat, lon):
+    """장소들 사이의 대원 거리(km) 행렬을 브로드캐스팅으로 한 번에 계산합니다."""
+    lat = np.asarray(lat, dtype=np.float64)
+    lon = np.asarray(lon, dtype=np.float64)
+    return haversine_km(lat[:, None], lon[:, None], lat[None, :], lon[None, :])
+
+
+def route_length(dist, route):
+    """route(방문 순서) 순서대로 이동할 때의 총 거리(km)"""
+    route = np.asarray(route)
+    return float(dist[route[:-1], route[1:]].sum())
+
+
+def nearest_neighbor_route(dist, start=0):
+    """start에서 출발해 아직 가지 않은 가장 가까운 장소로 차례로 이동하는 방문 순서를 만듭니다."""
+    n = len(dist)
+    route = np.empty(n, dtype=np.int64)
+    visited = np.zeros(n, dtype=bool)
+    current = start
+    for step in range(n):
+        route[step] = current
+        visited[current] = True
+        if step < n - 1:
+            candidates = np.where(visited, np.inf, dist[current])
+            current = int(np.argmin(candidates))
+    return route
+
+
+def two_opt(dist, route, max_passes=MAX_TWO_OPT_PASSES):
+    """
+    경로의 한 구간을 뒤집어 총 거리가 줄어드는 동안 반복합니다. 양 끝(출발지와 도착지)은 고정합니다.
+    구간 시작 i마다 가능한 모든 끝 j의 개선량을 한 번에 계산해 가장 많이 줄어드는 j를 고릅니다.
+    """
+    route = np.array(route, dtype=np.int64)
+    n = len(route)
+    for _ in range(max_passes):
+        improved = False
+        for i in range(1, n - 2):
+            a, b = route[i - 1], route[i]
+            c, d = route[i + 1:n - 1], route[i + 2:n]
+            # (a→b, c→d) 두 간선을 (a→c, b→d)로 바꾸면 route[i..j]가 뒤집힘
+            delta = dist[a, c] + dist[b, d] - dist[a, b] - dist[c, d]
+            best = int(np.argmin(delta))
+            if delta[best] < -1e-9:
+                j = i + 1 + best
+                route[i:j + 1] = route[i:j + 1][::-1]
+                improved = True
+        if not improved:
+            break
+    return route
+
+
+def exact_route(dist, start=0, round_trip=False):
+    """start에서 출발하는 모든 방문 순서의 총 거리를 한 번에 계산해 가장 짧은 순서를 반환합니다. (장소가 적을 때만 사용)"""
+    n = len(dist)
+    others = [i for i in range(n) if i != start]
+    orders = np.array(list(itertools.permutations(others)), dtype=np.int64).reshape(-1, n - 1)
+    ends = [np.full((len(orders), 1), start)] if round_trip else []
+    routes = np.hstack([np.full((len(orders), 1), start), orders, *ends])
+    lengths = dist[routes[:, :-1], routes[:, 1:]].sum(axis=1)
+    return routes[int(np.argmin(lengths))]
+
+
+def plan_route(dist, start=0, round_trip=False):
+    """
+    거리 행렬 dist로 start에서 출발해 모든 장소를 한 번씩 들르는 짧은 방문 순서(행렬의 위치 배열)를 구합니다.
+    round_trip이면 마지막에 출발지로 돌아오는 경로(끝에 start가 한 번 더 붙음)를 반환합니다.
+    장소가 EXACT_ROUTE_MAX_STOPS 이하이면 최적 경로를 구하고, 그보다 많으면 가장 가까운 이웃 순서로 시작해 2-opt로 다듬는
+    근사 해법을 쓰므로 최적 경로를 보장하지는 않습니다.
+    """
+    n = len(dist)
+    if n <= 1:
+        return np.full(n + (n and round_trip), start, dtype=np.int64)
+    if n <= EXACT_ROUTE_MAX_STOPS:
+        return exact_route(dist, start, round_trip)
+    if round_trip:
+        route = np.append(nearest_neighbor_route(dist, start), start)
+        return two_opt(dist, route)
+    # 도착지가 정해지지 않은 경로는, 모든 장소와의 거리가 0인 가상 도착지를 두고 양 끝 고정 문제로 풀어 마지막에 뺌
+    padded = np.zeros((n + 1, n + 1))
+    padded[:n, :n] = dist
+    route = np.append(nearest_neighbor_route(dist, start), n)
+    return two_opt(padded, route)[:-1]
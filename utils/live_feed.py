@@ -0,0 +1,74 @@
+import logging
+import os
+import threading
+import time
+
+import pandas as pd
+
+# --- 실시간 모드 설정 ---
+LIVE_POLL_SEC = float(os.environ.get("LIVE_POLL_SEC") or 5) # 새 봉을 확인하는 최소 간격(초). 제공자의 봉 간격보다 자주 확인하지는 않음
+LIVE_WINDOW_BARS = 390 # 보관할 최근 봉 수 (1분봉이면 정규장 하루)
+
+logger = logging.getLogger("live")
+
+
+def poll_interval(provider, poll_sec=LIVE_POLL_SEC):
+    """
+    provider에 새 봉을 요청할 간격(초). 봉 간격보다 자주 물어도 새 봉이 없으므로 봉 간격 이상으로 둡니다.
+    LiveFeed와 차트 조각(fragment)의 run_every가 같은 값을 쓰세요.
+    """
+    return max(poll_sec, provider.bar_seconds, 1.0)
+
+
+class LiveFeed:
+    """
+    관심 종목 전체의 최근 봉 종가를 프로세스 전체에서 공유하는 실시간 시세 창입니다.
+    여러 세션이 동시에 poll()을 불러도 제공자에는 poll_sec(제공자의 봉 간격 이상)마다 한 번만 요청하고,
+    마지막으로 받은 봉부터만 요청해 덧붙입니다. (마지막 봉은 진행 중일 수 있어 다시 받아 교체)
+    시세 창과 기준가는 거래일마다 새로 시작하므로, 변화율은 항상 그날 첫 봉 대비입니다.
+    frame은 새로 받을 때마다 통째로 바꿔 끼우므로, 읽는 쪽은 잠금 없이 한 시점의 데이터를 볼 수 있습니다. (읽기 전용으로만 쓰세요)
+    """
+
+    def __init__(self, provider, watchlist, window_bars=LIVE_WINDOW_BARS, poll_sec=LIVE_POLL_SEC):
+        self.provider = provider
+        self.watchlist = dict(watchlist) # {기업명: 티커}
+        self.window_bars = window_bars
+        self.poll_sec = poll_interval(provider, poll_sec)
+        self.frame = pd.DataFrame(columns=list(self.watchlist), dtype="float64") # 인덱스: 봉 시각, 컬럼: 기업명
+        self.reference = pd.Series(dtype="float64") # 기업별 기준가 (그 거래일에 처음 받은 봉). 변화율 계산에 사용
+        self.trading_day = None # frame과 reference가 속한 거래일 (봉 시각의 날짜)
+        self._poll_lock = threading.Lock()
+        self._last_poll = float("-inf")
+
+    def poll(self):
+        """마지막 요청 후 poll_sec가 지났고 다른 세션이 요청 중이 아니면 새 봉을 받아 덧붙입니다. 새 봉을 받았으면 True"""
+        if time.monotonic() - self._last_poll < self.poll_sec or not self._poll_lock.acquire(blocking=False):
+            return False
+        try:
+            self._last_poll = time.monotonic()
+            since = self.frame.index[-1] if len(self.frame) else None
+            bars = self.provider.fetch_recent_bars(self.watchlist.values(), since=since, max_bars=self.window_bars)
+            new_rows = pd.DataFrame({company: bars[ticker] for company, ticker in self.watchlist.items() if ticker in bars})
+            if new_rows.empty:
+                return False
+            new_rows = new_rows.reindex(columns=self.frame.columns).sort_index()
+            frame, reference = self.frame, self.reference
+            day = new_rows.index[-1].normalize()
+            if day != self.trading_day: # 새 거래일: 전날 봉과 기준가를 버리고 오늘 첫 봉을 기준으로 다시 시작
+                frame, reference = frame.iloc[:0], pd.Series(dtype="float64")
+                new_rows = new_rows.loc[new_rows.index >= day]
+            frame = pd.concat([frame.loc[frame.index < new_rows.index[0]], new_rows]) if len(frame) else new_rows
+            # 읽는 쪽이 잠금 없이 보므로, 기준가를 먼저 바꾸고 frame을 마지막에 바꿔 끼움
+            self.trading_day = day
+            self.reference = reference.combine_first(new_rows.bfill().iloc[0].dropna())
+            self.frame = frame.iloc[-self.window_bars:]
+            return True
+        except Exception: # 일시적인 오류는 다음 주기에 다시 시도하고, 화면에는 마지막으로 받은 시세를 계속 보여 줌
+            logger.exception("실시간 시세 요청 실패")
+            return False
+        finally:
+            self._poll_lock.release()
+
+    def percent_change(self, frame, companies):
+        """frame의 companies 컬럼을 기준가 대비 변화율(%)로 바꿉니다."""
+        return (frame[companies] / self.reference.reindex(companies) - 1) * 100
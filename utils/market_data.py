@@ -0,0 +1,202 @@
+import datetime
+import os
+import time
+import zlib
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# --- 데이터 제공자 선택 ---
+# MARKET_DATA_PROVIDER=local 로 지정하면 네트워크 없이 로컬 파일/합성 데이터를 사용합니다. (CI, 벤치마크용)
+DEFAULT_PROVIDER = os.environ.get("MARKET_DATA_PROVIDER", "yfinance")
+# 로컬 제공자가 `<티커>.parquet` 또는 `<티커>.csv` 파일을 찾는 폴더 (없으면 합성 데이터 생성)
+MARKET_DATA_DIR = os.environ.get("MARKET_DATA_DIR")
+SYNTHETIC_EPOCH = datetime.date(2000, 1, 3) # 합성 가격이 시작되는 기준일
+LOCAL_BAR_SEC = 5 # 로컬 제공자의 실시간(합성) 시세 봉 간격(초). 오프라인 시연에서도 선이 움직이도록 짧게 둠
+
+
+class MarketDataProvider:
+    """
+    주가 데이터 제공자의 공통 인터페이스입니다.
+    모든 메서드는 배당·분할이 조정된 종가(Close)를 시간대 정보 없는 날짜 인덱스의 Series로 돌려줍니다.
+    end_date_obj는 yfinance와 같이 포함하지 않는 날짜입니다.
+    """
+    name = "base"
+    bar_seconds = 60 # fetch_recent_bars가 돌려주는 봉 간격(초)
+
+    def download_close_batch(self, tickers, start_date_obj, end_date_obj):
+        """여러 티커를 한 번에 받아 {티커: Close Series}로 반환합니다. 비어 있는 티커는 결과에서 빠집니다."""
+        raise NotImplementedError
+
+    def fetch_close(self, ticker, start_date_obj, end_date_obj):
+        """
+        단일 티커를 한 번 요청합니다. 데이터가 없으면 None을 반환하고, 통신 오류는 예외로 전달합니다.
+        여러 스레드에서 동시에 호출될 수 있습니다.
+        """
+        raise NotImplementedError
+
+    def fetch_recent_bars(self, tickers, since=None, max_bars=390):
+        """
+        실시간 모드용 최근 봉 종가를 {티커: Series}로 반환합니다. 인덱스는 시간대 정보 없는 봉 시작 시각입니다.
+        since가 있으면 그 시각의 봉(아직 진행 중일 수 있음)과 이후 봉만, 없으면 최근 max_bars개를 돌려줍니다.
+        """
+        raise NotImplementedError
+
+
+def _close_columns(data, tickers):
+    """yf.download 결과에서 티커별 'Close' Series를 꺼냅니다. 비어 있는 티커는 빠집니다."""
+    if data.empty:
+        return {}
+    if isinstance(data.columns, pd.MultiIndex):
+        if 'Close' not in data.columns.get_level_values(0):
+            return {}
+        close_df = data['Close']
+    else: # 티커가 하나뿐이면 yfinance가 단일 레벨 컬럼을 반환함
+        if 'Close' not in data.columns:
+            return {}
+        close_df = data[['Close']].set_axis(tickers, axis=1)
+
+    close_by_ticker = {}
+    for ticker in close_df.columns:
+        series = close_df[ticker].dropna()
+        if not series.empty:
+            close_by_ticker[ticker] = series
+    return close_by_ticker
+
+
+class YFinanceProvider(MarketDataProvider):
+    """Yahoo Finance(yfinance)에서 데이터를 받는 기본 제공자입니다."""
+    name = "yfinance"
+
+    def download_close_batch(self, tickers, start_date_obj, end_date_obj):
+        import yfinance as yf # 로컬 제공자만 쓰는 환경에서는 불러오지 않음
+
+        tickers = list(tickers)
+        data = yf.download(
+            tickers,
+            start=start_date_obj,
+            end=end_date_obj,
+            auto_adjust=True, # 배당 및 분할 조정된 'Close' 가격 반환
+            group_by='column', # 컬럼이 (가격 종류, 티커) 형태의 MultiIndex로 반환됨
+            progress=False # 다운로드 진행 메시지 숨김
+        )
+        return _close_columns(data, tickers)
+
+    def fetch_close(self, ticker, start_date_obj, end_date_obj):
+        import yfinance as yf
+
+        # yf.download는 전역 상태를 공유하므로 여러 스레드에서 동시에 호출하지 않고 Ticker.history를 사용
+        data = yf.Ticker(ticker).history(
+            start=start_date_obj,
+            end=end_date_obj,
+            auto_adjust=True # 배당 및 분할 조정된 'Close' 가격 반환
+        )
+        if data.empty or 'Close' not in data.columns:
+            return None
+        close = data['Close']
+        if close.index.tz is not None: # 일괄 다운로드 결과와 맞추기 위해 시간대 정보 제거
+            close.index = close.index.tz_localize(None)
+        return close
+
+    def fetch_recent_bars(self, tickers, since=None, max_bars=390):
+        import yfinance as yf
+
+        tickers = list(tickers)
+        # 처음에는 최근 거래일의 1분봉 전체를, 이후에는 since(마지막으로 받은 봉, 장중에 계속 바뀜)부터만 요청
+        # since는 거래소 현지 시각이며, yfinance는 시간대 정보 없는 start를 거래소 시간대로 해석함
+        window = {"start": pd.Timestamp(since).to_pydatetime()} if since is not None else {"period": "1d"}
+        data = yf.download(tickers, interval="1m", auto_adjust=True, group_by='column', progress=False, **window)
+        bars = {}
+        for ticker, close in _close_columns(data, tickers).items():
+            if close.index.tz is not None: # 거래소 현지 시각 그대로 시간대 정보만 제거
+                close.index = close.index.tz_localize(None)
+            close = close[close.index >= since] if since is not None else close.iloc[-max_bars:]
+            if not close.empty:
+                bars[ticker] = close
+        return bars
+
+
+class LocalProvider(MarketDataProvider):
+    """
+    네트워크 없이 동작하는 제공자입니다.
+    data_dir에 `<티커>.parquet` 또는 `<티커>.csv`(Date 인덱스, Close 컬럼)가 있으면 그 파일을 읽고,
+    없으면 티커 이름으로 시드를 정한 합성 랜덤 워크 가격을 만들어 항상 같은 결과를 돌려줍니다.
+    """
+    name = "local"
+    bar_seconds = LOCAL_BAR_SEC
+
+    def __init__(self, data_dir=MARKET_DATA_DIR, seed=0):
+        self.data_dir = Path(data_dir) if data_dir else None
+        self.seed = seed
+
+    def _read_file(self, ticker):
+        if self.data_dir is None:
+            return None
+        parquet_path = self.data_dir / f"{ticker}.parquet"
+        csv_path = self.data_dir / f"{ticker}.csv"
+        if parquet_path.exists():
+            return pd.read_parquet(parquet_path)["Close"]
+        if csv_path.exists():
+            return pd.read_csv(csv_path, index_col=0, parse_dates=True)["Close"]
+        return None
+
+    def _synthetic_close(self, ticker, end_date_obj):
+        # 기간의 시작점과 관계없이 같은 날짜에는 같은 가격이 나오도록 고정된 기준일부터 생성 후 잘라냄
+        dates = pd.bdate_range(SYNTHETIC_EPOCH, end_date_obj - datetime.timedelta(days=1), name="Date")
+        rng = np.random.default_rng(zlib.crc32(ticker.encode("utf-8")) ^ self.seed)
+        start_price = rng.uniform(20, 500) # 수익률보다 먼저 뽑아야 기간 끝과 관계없이 같은 값이 나옴
+        daily_returns = rng.normal(loc=0.0003, scale=0.02, size=len(dates))
+        return pd.Series(start_price * np.exp(np.cumsum(daily_returns)), index=dates, name="Close")
+
+    def download_close_batch(self, tickers, start_date_obj, end_date_obj):
+        close_by_ticker = {}
+        for ticker in tickers:
+            close = self.fetch_close(ticker, start_date_obj, end_date_obj)
+            if close is not None:
+                close_by_ticker[ticker] = close
+        return close_by_ticker
+
+    def fetch_close(self, ticker, start_date_obj, end_date_obj):
+        close = self._read_file(ticker)
+        if close is None:
+            close = self._synthetic_close(ticker, end_date_obj)
+        close = close.loc[pd.Timestamp(start_date_obj):pd.Timestamp(end_date_obj) - pd.Timedelta(days=1)].dropna()
+        return close if not close.empty else None
+
+    def fetch_recent_bars(self, tickers, since=None, max_bars=390):
+        # 시각만으로 가격이 정해지는 합성 시세: 느린 파동 두 개 + 봉마다 정해진 잡음. 모든 프로세스·세션에서 같은 봉은 같은 가격
+        last_bar = int(time.time() // self.bar_seconds)
+        first_bar = last_bar - max_bars + 1
+        if since is not None:
+            first_bar = max(first_bar, int(pd.Timestamp(since).timestamp() // self.bar_seconds))
+        bar_numbers = np.arange(first_bar, last_bar + 1, dtype=np.int64)
+        index = pd.to_datetime(bar_numbers * self.bar_seconds, unit="s").rename("Datetime")
+        bars = {}
+        for ticker in tickers:
+            seed = zlib.crc32(ticker.encode("utf-8")) ^ self.seed
+            phase = (seed % 1000) / 1000 * 2 * np.pi
+            noise = ((bar_numbers * 2654435761 + seed) % 65536) / 65536 - 0.5 # 봉 번호로 정해지는 [-0.5, 0.5) 잡음
+            waves = 0.01 * np.sin(2 * np.pi * bar_numbers / 720 + phase) + 0.004 * np.sin(2 * np.pi * bar_numbers / 97 + 2 * phase)
+            base_price = 20 + seed % 480
+            bars[ticker] = pd.Series(base_price * (1 + waves + 0.002 * noise), index=index, name="Close")
+        return bars
+
+
+PROVIDERS = {
+    YFinanceProvider.name: YFinanceProvider,
+    LocalProvider.name: LocalProvider,
+}
+
+
+def get_provider(name=None):
+    """이름(기본값: MARKET_DATA_PROVIDER 환경 변수)에 해당하는 데이터 제공자를 만듭니다."""
+    name = name or DEFAULT_PROVIDER
+    if name not in PROVIDERS:
+        raise ValueError(f"알 수 없는 데이터 제공자입니다: {name} (사용 가능: {', '.join(PROVIDERS)})")
+    return PROVIDERS[name]()
+
+
+def synthetic_watchlist(count):
+    """벤치마크용 합성 관심 종목 목록 {기업명: 티커}를 만듭니다."""
+    return {f"Synthetic {i:04d}": f"SYN{i:04d}" for i in range(count)}
@@ -0,0 +1,84 @@
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import nullcontext
+
+import streamlit as st
+
+# --- 성능 측정 설정 ---
+# PERF_TRACE=1 이면 모든 세션의 재실행 시간을 기록하고, URL에 ?perf=1 을 붙이면 해당 세션에서만 켭니다.
+PERF_TRACE = os.environ.get("PERF_TRACE", "").lower() in ("1", "true", "yes")
+# 지정하면 재실행마다 측정 결과를 JSON Lines 형식으로 이 파일에 덧붙입니다.
+PERF_METRICS_FILE = os.environ.get("PERF_METRICS_FILE")
+
+logger = logging.getLogger("perf")
+if not logger.handlers: # Streamlit은 사용자 로거를 설정하지 않으므로 직접 출력 핸들러를 붙임
+    _handler = logging.StreamHandler()
+    _handler.setFormatter(logging.Formatter("%(asctime)s %(name)s %(message)s"))
+    logger.addHandler(_handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+_NULL_SPAN = nullcontext() # 측정이 꺼져 있을 때 재사용하는 아무 일도 하지 않는 컨텍스트
+_metrics_file_lock = threading.Lock()
+
+
+class _Span:
+    def __init__(self, timer, name):
+        self.timer = timer
+        self.name = name
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.timer.spans.append((self.name, (time.perf_counter() - self.started) * 1000))
+        return False
+
+
+class RerunTimer:
+    """
+    한 번의 스크립트 실행(rerun) 동안 이름 붙은 구간의 시간을 기록합니다.
+    측정이 꺼져 있으면 span()은 미리 만들어 둔 빈 컨텍스트를 돌려주므로 추가 비용이 거의 없습니다.
+    """
+
+    def __init__(self, page, enabled):
+        self.page = page
+        self.enabled = enabled
+        self.spans = [] # (구간 이름, 걸린 시간 ms) 목록. 끝난 순서대로 쌓입니다.
+        self.started = time.perf_counter()
+
+    def span(self, name):
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name)
+
+    def finish(self):
+        """측정 결과를 로그와 메트릭 파일로 내보내고, 사이드바에 디버그 패널을 표시합니다."""
+        if not self.enabled:
+            return
+        total_ms = (time.perf_counter() - self.started) * 1000
+        record = {
+            "ts": round(time.time(), 3),
+            "page": self.page,
+            "total_ms": round(total_ms, 2),
+            "spans": [{"name": name, "ms": round(ms, 2)} for name, ms in self.spans],
+        }
+        line = json.dumps(record, ensure_ascii=False)
+        logger.info(line)
+        if PERF_METRICS_FILE:
+            with _metrics_file_lock, open(PERF_METRICS_FILE, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+
+        with st.sidebar.expander("⏱️ 성능 측정 (이번 실행)", expanded=True):
+            st.markdown(f"**전체:** {total_ms:.1f} ms")
+            st.table({"구간": [name for name, _ in self.spans], "ms": [round(ms, 1) for _, ms in self.spans]})
+
+
+def start_rerun(page):
+    """페이지 맨 위에서 호출해 이번 실행의 측정기를 만듭니다."""
+    enabled = PERF_TRACE or st.query_params.get("perf") == "1"
+    return RerunTimer(page, enabled)
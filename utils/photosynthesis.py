@@ -0,0 +1,138 @@
+import hashlib
+import os
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+# --- 단순화된 광합성 모델의 계수 (예시 값) ---
+# 실제 생물학적 모델은 훨씬 복잡합니다.
+LIGHT_RATE = 0.05 # 빛의 세기 포화 속도
+OPTIMAL_TEMP = 25 # 최적 온도 (°C)
+TEMP_WIDTH = 0.01 # 최적 온도에서 벗어날 때 감소하는 정도
+CO2_RATE = 0.02 # 이산화 탄소 농도 포화 속도
+MAX_RATE = 100 # 모든 요인이 최적일 때의 광합성량
+
+
+def light_effect(light_intensity):
+    """빛의 세기 영향: 특정 세기까지는 증가하다가 포화"""
+    return 1 - np.exp(-LIGHT_RATE * np.asarray(light_intensity))
+
+
+def temp_effect(temperature):
+    """온도 영향: 최적 온도에서 최고, 너무 높거나 낮으면 감소"""
+    return np.exp(-TEMP_WIDTH * (np.asarray(temperature) - OPTIMAL_TEMP) ** 2)
+
+
+def co2_effect(co2_concentration):
+    """이산화 탄소 농도 영향: 특정 농도까지는 증가하다가 포화"""
+    return 1 - np.exp(-CO2_RATE * np.asarray(co2_concentration))
+
+
+def calculate_photosynthesis(light_intensity, temperature, co2_concentration):
+    """
+    주어진 환경 요인에 따른 광합성량을 계산합니다.
+    이 모델은 단순화된 시뮬레이션이며, 실제 생물학적 과정과 정확히 일치하지 않을 수 있습니다.
+    각 인자는 스칼라 또는 NumPy 배열이며, 배열은 브로드캐스팅 규칙에 따라 한 번에 계산됩니다.
+    """
+    # 모든 요인의 곱으로 광합성량 결정 (단순화된 모델)
+    photosynthesis_rate = MAX_RATE * light_effect(light_intensity) * temp_effect(temperature) * co2_effect(co2_concentration)
+    if np.ndim(photosynthesis_rate) == 0:
+        return float(photosynthesis_rate)
+    return photosynthesis_rate
+
+
+def response_grid(light_values, temp_values, co2_values, dtype=np.float32):
+    """
+    빛 × 온도 × CO2 격자 전체의 광합성량을 (빛, 온도, CO2) 모양의 배열로 계산합니다.
+    모델이 요인별 효과의 곱이므로, 축마다 1차원으로 한 번씩만 계산한 뒤 브로드캐스팅으로 곱합니다.
+    """
+    light = light_effect(light_values).astype(dtype)[:, np.newaxis, np.newaxis]
+    temp = temp_effect(temp_values).astype(dtype)[np.newaxis, :, np.newaxis]
+    co2 = co2_effect(co2_values).astype(dtype)[np.newaxis, np.newaxis, :]
+    grid = light * temp # (빛, 온도, 1)
+    grid = grid * co2 # (빛, 온도, CO2)
+    grid *= dtype(MAX_RATE)
+    return grid
+
+
+# --- 3차원 반응 격자 (빛 × 온도 × CO2) ---
+LIGHT_RANGE = (0, 1000) # lux
+TEMP_RANGE = (0, 40) # °C
+CO2_RANGE = (0, 1000) # ppm
+AXIS_NAMES = ("light", "temp", "co2")
+# 격자 한 축의 점 개수. 200이면 200³ float32 = 약 32MB
+GRID_RESOLUTION = int(os.environ.get("PHOTOSYNTHESIS_GRID_RESOLUTION", 200))
+GRID_CACHE_DIR = Path(__file__).resolve().parent.parent / ".cache" / "photosynthesis"
+
+
+@dataclass(frozen=True)
+class ResponseGrid:
+    """
+    미리 계산한 광합성량 격자입니다. values[i, j, k]는 (light_values[i], temp_values[j], co2_values[k])의 광합성량입니다.
+    단면·주변 평균 곡선은 모델을 다시 계산하지 않고 이 배열에서 바로 읽습니다.
+    """
+    light_values: np.ndarray
+    temp_values: np.ndarray
+    co2_values: np.ndarray
+    values: np.ndarray
+
+    def axis_values(self, axis):
+        return (self.light_values, self.temp_values, self.co2_values)[AXIS_NAMES.index(axis)]
+
+    def nearest_index(self, axis, value):
+        """축 위에서 value와 가장 가까운 격자점의 위치를 반환합니다."""
+        return int(np.abs(self.axis_values(axis) - value).argmin())
+
+    def slice_at(self, axis, value):
+        """axis를 value(가장 가까운 격자점)에 고정한 2차원 단면을 반환합니다. 나머지 두 축은 원래 순서를 따릅니다."""
+        index = [slice(None)] * 3
+        index[AXIS_NAMES.index(axis)] = self.nearest_index(axis, value)
+        return self.values[tuple(index)]
+
+    def marginal(self, axis):
+        """나머지 두 축에 대해 평균한 1차원 주변 곡선을 반환합니다."""
+        other_axes = tuple(i for i in range(3) if i != AXIS_NAMES.index(axis))
+        return self.values.mean(axis=other_axes, dtype=np.float64)
+
+    def strided(self, max_points_per_axis):
+        """각 축의 점 개수가 max_points_per_axis 이하가 되도록 일정 간격으로 솎아 낸 격자를 반환합니다 (복사 없는 뷰)."""
+        step = max(1, int(np.ceil(max(self.values.shape) / max_points_per_axis)))
+        return ResponseGrid(
+            self.light_values[::step], self.temp_values[::step], self.co2_values[::step],
+            self.values[::step, ::step, ::step]
+        )
+
+
+def _grid_axes(resolution):
+    return (
+        np.linspace(*LIGHT_RANGE, resolution),
+        np.linspace(*TEMP_RANGE, resolution),
+        np.linspace(*CO2_RANGE, resolution),
+    )
+
+
+def _grid_cache_path(resolution):
+    # 모델 계수나 범위가 바뀌면 다른 파일을 쓰도록 파일 이름에 설정값의 해시를 넣음
+    settings = (LIGHT_RATE, OPTIMAL_TEMP, TEMP_WIDTH, CO2_RATE, MAX_RATE, LIGHT_RANGE, TEMP_RANGE, CO2_RANGE)
+    digest = hashlib.sha1(repr(settings).encode("utf-8")).hexdigest()[:10]
+    return GRID_CACHE_DIR / f"grid_{resolution}_{digest}.npy"
+
+
+def build_response_grid(resolution=GRID_RESOLUTION, use_disk_cache=True):
+    """
+    빛 × 온도 × CO2 반응 격자를 float32로 계산합니다.
+    use_disk_cache가 True이면 .npy 파일로 저장해 두고, 이후에는 메모리 맵으로 열어 여러 프로세스가 같은 파일 내용을 메모리에 한 번만 올려 공유합니다.
+    """
+    light_values, temp_values, co2_values = _grid_axes(resolution)
+    if not use_disk_cache:
+        return ResponseGrid(light_values, temp_values, co2_values, response_grid(light_values, temp_values, co2_values))
+
+    path = _grid_cache_path(resolution)
+    if not path.exists():
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp.npy")
+        np.save(tmp_path, response_grid(light_values, temp_values, co2_values))
+        os.replace(tmp_path, path) # 다른 프로세스가 쓰다 만 파일을 읽지 않도록 원자적으로 교체
+    values = np.load(path, mmap_mode="r")
+    return ResponseGrid(light_values, temp_values, co2_values, values)
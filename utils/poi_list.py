@@ -0,0 +1,29 @@
+import streamlit as st
+
+POI_LIST_PAGE_SIZE = 50 # 한 쪽에 보여줄 장소 수
+
+
+def format_poi_lines(rows):
+    """장소 행들을 '- **이름** (종류): 설명' 형식의 마크다운 목록 하나로 만듭니다. 행을 반복하지 않고 열 단위 문자열 연산으로 처리합니다."""
+    lines = "- **" + rows["name"].astype(str) + "** (" + rows["type"].astype(str) + "): " + rows["desc"].astype(str)
+    return "\n".join(lines.tolist())
+
+
+def render_poi_list(store, positions, key, page_size=POI_LIST_PAGE_SIZE):
+    """
+    store에서 positions 장소 목록을 쪽 단위로 나눠, 현재 쪽만 마크다운 요소 하나로 보냅니다.
+    결과가 많아도 서버에서 현재 쪽의 행만 꺼내 문자열을 만들기 때문에 재실행 비용과 전송량이 쪽 크기에 비례합니다.
+    """
+    total = len(positions)
+    n_pages = max(1, -(-total // page_size))
+    page = 1
+    if n_pages > 1:
+        if st.session_state.get(key, 1) > n_pages: # 필터가 바뀌어 쪽 수가 줄었으면 첫 쪽으로
+            st.session_state[key] = 1
+        page = st.number_input(f"쪽 (전체 {n_pages:,}쪽)", min_value=1, max_value=n_pages, step=1, key=key)
+
+    start = (page - 1) * page_size
+    page_positions = positions[start:start + page_size]
+    st.markdown(format_poi_lines(store.rows(page_positions)))
+    if n_pages > 1:
+        st.caption(f"전체 {total:,}곳 중 {start + 1:,}~{start + len(page_positions):,}번째 장소")
@@ -0,0 +1,273 @@
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from textwrap import dedent
+
+import numpy as np
+import folium
+import streamlit as st
+from branca.element import CssLink, Element, JavascriptLink
+from folium.elements import JSCSSMixin
+from folium.plugins import MarkerCluster
+from folium.template import Template
+
+from utils.poi_store import CITY_AREAS, load_poi_store
+from utils.warmup import start_background
+
+# --- 장소 종류별 마커 색상 ---
+TYPE_COLORS = {"관광지": "blue", "맛집": "red", "숙소": "green"}
+DEFAULT_COLOR = "gray"
+# folium.Icon 색 이름에 해당하는 실제 색상값 (대용량 모드의 원형 마커에 사용)
+COLOR_HEX = {"blue": "#38aadd", "red": "#d63e2a", "green": "#72b026", "gray": "#575757"}
+# 장소가 이보다 많으면 개별 마커 대신 브라우저에서 그리는 클러스터 레이어 하나로 보냅니다.
+HIGH_VOLUME_THRESHOLD = 300
+
+# --- 화면 범위 질의 ---
+# 확대 수준(zoom)이 이 값 이하일 때 지도에 보낼 최대 장소 수. 더 확대하면 MAX_POINTS_CLOSE_ZOOM까지 보냄
+MAX_POINTS_BY_ZOOM = ((6, 5_000), (9, 20_000))
+MAX_POINTS_CLOSE_ZOOM = 50_000
+
+# --- 렌더링한 마커 레이어 캐시 ---
+MAX_CACHED_LAYERS = 64 # 보관할 마커 레이어 수 (가장 오래 쓰이지 않은 것부터 제거)
+LAYER_ID = "feature_group_0" # st_folium이 feature_group_to_add의 첫 번째 레이어에 붙이는 이름
+
+
+class _RawScript(Element):
+    """문자열을 jinja 템플릿으로 다시 해석하지 않고 그대로 출력하는 스크립트 조각"""
+    _template = Template("{{ this.code }}")
+
+    def __init__(self, code):
+        super().__init__()
+        self.code = code
+
+
+class PoiClusterLayer(MarkerCluster):
+    """
+    많은 장소를 한 번에 보내는 클러스터 레이어입니다.
+    folium.plugins.FastMarkerCluster처럼 마커를 브라우저에서 만들지만, 데이터를 행 목록이 아닌 열(위도·경도·종류 코드·이름·설명) 단위 배열로 보내
+    Python 쪽 처리와 전송량이 작고, 색상은 종류 코드로 팔레트에서 고릅니다. 툴팁과 팝업은 마우스를 올리거나 클릭할 때 만듭니다.
+    데이터는 JSON 문자열로 한 번만 만들어 두고, 렌더링한 스크립트를 다시 jinja 템플릿으로 해석하는 folium의 기본 동작(수 MB에서는 1초 가까이 걸림)을 건너뜁니다.
+    """
+
+    _template = Template(
+        """
+        {% macro script(this, kwargs) %}
+            var {{ this.get_name() }} = (function(){
+                var data = {{ this.data_json }};
+                var cluster = L.markerClusterGroup({{ this.options|tojavascript }});
+                var markers = new Array(data.lat.length);
+                for (var i = 0; i < data.lat.length; i++) {
+                    var color = data.palette[data.type[i]];
+                    markers[i] = L.circleMarker([data.lat[i], data.lon[i]], {
+                        radius: 6, color: color, fillColor: color, fillOpacity: 0.8, weight: 1, poiIndex: i
+                    });
+                }
+                cluster.addLayers(markers);
+                cluster.on("mouseover", function (e) {
+                    var i = e.layer.options.poiIndex;
+                    if (!e.layer.getTooltip()) { e.layer.bindTooltip(data.name[i]).openTooltip(); }
+                });
+                cluster.on("click", function (e) {
+                    var i = e.layer.options.poiIndex;
+                    if (!e.layer.getPopup()) { e.layer.bindPopup("<b>" + data.name[i] + "</b><br>" + data.desc[i]).openPopup(); }
+                });
+                cluster.addTo({{ this._parent.get_name() }});
+                return cluster;
+            })();
+        {% endmacro %}"""
+    )
+
+    def __init__(self, pois, name=None, **kwargs):
+        super().__init__(name=name, chunked_loading=True, **kwargs)
+        self._name = "PoiClusterLayer"
+        colors = list(dict.fromkeys([*TYPE_COLORS.values(), DEFAULT_COLOR]))
+        types = pois["type"].astype("category") # 범주형이면 복사 없이 그대로 사용
+        # 범주별 팔레트 번호를 만든 뒤 범주 코드로 한 번에 고름 (코드 -1은 값 없음 → 마지막 칸의 기본 색)
+        palette_codes = np.array([colors.index(TYPE_COLORS.get(t, DEFAULT_COLOR)) for t in types.cat.categories] + [colors.index(DEFAULT_COLOR)])
+        color_codes = palette_codes[types.cat.codes.to_numpy()]
+        data = {
+            "lat": pois["lat"].to_numpy(dtype=np.float64).round(6).tolist(),
+            "lon": pois["lon"].to_numpy(dtype=np.float64).round(6).tolist(),
+            "type": color_codes.tolist(),
+            "palette": [COLOR_HEX[c] for c in colors],
+            "name": pois["name"].astype(str).tolist(),
+            "desc": pois["desc"].astype(str).tolist(),
+        }
+        # <script> 안에 넣어도 안전하도록 jinja의 tojson과 같은 방식으로 <, >, &를 이스케이프
+        self.data_json = json.dumps(data, ensure_ascii=False).replace("<", "\\u003c").replace(">", "\\u003e").replace("&", "\\u0026")
+
+    def render(self, **kwargs):
+        # JSCSSMixin·MacroElement.render와 같은 일을 하되, 스크립트는 템플릿으로 다시 해석하지 않고 그대로 붙임
+        # (지도에 추가하는 코드는 템플릿에 들어 있으므로 Layer.render가 덧붙이는 addTo 문은 필요 없음)
+        figure = self.get_root()
+        for name, url in self.default_js:
+            figure.header.add_child(JavascriptLink(url), name=name)
+        for name, url in self.default_css:
+            figure.header.add_child(CssLink(url), name=name)
+        figure.script.add_child(_RawScript(self._template.module.script(self, kwargs)), name=self.get_name())
+
+
+def add_poi_markers(m, pois, high_volume=None):
+    """
+    pois(name, type, desc, lat, lon 컬럼)를 지도 m에 추가하고, 대용량 모드를 썼는지 반환합니다.
+    high_volume을 지정하지 않으면 장소 수가 HIGH_VOLUME_THRESHOLD를 넘을 때 대용량 모드를 씁니다.
+    """
+    if high_volume is None:
+        high_volume = len(pois) > HIGH_VOLUME_THRESHOLD
+    if high_volume:
+        PoiClusterLayer(pois).add_to(m)
+        return True
+
+    for name, poi_type, desc, lat, lon in zip(pois["name"], pois["type"], pois["desc"], pois["lat"], pois["lon"]):
+        folium.Marker(
+            location=[lat, lon],
+            popup=f"<b>{name}</b><br>{desc}",
+            tooltip=name,
+            icon=folium.Icon(color=TYPE_COLORS.get(poi_type, DEFAULT_COLOR))
+        ).add_to(m)
+    return False
+
+
+def max_points_for_zoom(zoom):
+    for max_zoom, max_points in MAX_POINTS_BY_ZOOM:
+        if zoom <= max_zoom:
+            return max_points
+    return MAX_POINTS_CLOSE_ZOOM
+
+
+def select_visible(index, positions, bounds=None, zoom=6):
+    """
+    positions(정렬된 장소 위치 배열) 중 지도 화면 범위 안에 있는 장소만 골라, 확대 수준별 상한을 넘으면 고르게 솎아 냅니다.
+    bounds는 st_folium이 돌려주는 {"_southWest": {"lat", "lng"}, "_northEast": {"lat", "lng"}} 형식이며, 없으면 전체를 대상으로 합니다.
+    """
+    south_west = (bounds or {}).get("_southWest") or {}
+    north_east = (bounds or {}).get("_northEast") or {}
+    if None not in (south_west.get("lat"), south_west.get("lng"), north_east.get("lat"), north_east.get("lng")):
+        in_view = index.query_bbox(south_west["lat"], south_west["lng"], north_east["lat"], north_east["lng"])
+        positions = np.intersect1d(positions, in_view, assume_unique=True)
+    max_points = max_points_for_zoom(zoom or 6)
+    if len(positions) > max_points:
+        positions = positions[np.linspace(0, len(positions) - 1, max_points).astype(np.int64)]
+    return positions
+
+
+class PrerenderedLayer(JSCSSMixin, folium.FeatureGroup):
+    """
+    미리 렌더링해 둔 마커 레이어 JS를 그대로 내보내는 FeatureGroup입니다. st_folium의 feature_group_to_add 전용입니다.
+    st_folium은 레이어와 그 안의 요소 이름을 고정된 이름으로 바꿔 JS를 만들기 때문에, 같은 장소 집합이면 결과 문자열이 항상 같습니다.
+    """
+
+    _template = Template("{% macro script(this, kwargs) %}{{ this.script }}{% endmacro %}")
+
+    def __init__(self, script, default_js, default_css):
+        super().__init__()
+        self._name = "FeatureGroup"
+        self.script = script
+        self.default_js = default_js # 클러스터 플러그인 등, 원래 레이어 안의 요소들이 필요로 하던 JS/CSS
+        self.default_css = default_css
+
+    def render(self, **kwargs):
+        # 스크립트는 st_folium이 _template에서 직접 꺼내 가므로 머리글의 JS/CSS 링크만 추가
+        figure = self.get_root()
+        for name, url in self.default_js:
+            figure.header.add_child(JavascriptLink(url), name=name)
+        for name, url in self.default_css:
+            figure.header.add_child(CssLink(url), name=name)
+
+
+def _walk(element):
+    yield element
+    for child in element._children.values():
+        yield from _walk(child)
+
+
+def prerender_layer(layer):
+    """
+    FeatureGroup을 st_folium이 feature_group_to_add로 보낼 때와 같은 JS 문자열로 렌더링해, 재사용할 수 있는 PrerenderedLayer 재료를 만듭니다.
+    (st_folium의 _get_feature_group_string이 하는 일 중 뒤에 붙이는 addLayer 부분을 뺀 것과 같습니다.)
+    """
+    from streamlit_folium import generate_leaflet_string
+
+    m = folium.Map()
+    m._id = "div" # st_folium은 기본 지도의 이름을 map_div로 바꿈
+    layer._id = LAYER_ID
+    layer.add_to(m)
+    layer.render()
+    script = dedent(generate_leaflet_string(layer, base_id=LAYER_ID))
+    default_js = list(dict.fromkeys(link for element in _walk(layer) for link in getattr(element, "default_js", [])))
+    default_css = list(dict.fromkeys(link for element in _walk(layer) for link in getattr(element, "default_css", [])))
+    return script, default_js, default_css
+
+
+class MarkerLayerCache:
+    """
+    장소 저장소의 행 위치 배열마다 렌더링한 마커 레이어를 LRU 방식으로 보관합니다.
+    같은 장소 집합(필터가 같거나, 화면을 옮겨도 보이는 장소가 같은 경우)을 다시 그릴 때는 마커를 새로 만들지 않고 사전 조회만 합니다.
+    """
+
+    def __init__(self, store, max_entries=MAX_CACHED_LAYERS):
+        self.store = store
+        self.max_entries = max_entries
+        self._layers = OrderedDict()
+        self._lock = threading.Lock()
+        self._prewarm_started = False
+
+    def _key(self, positions):
+        return hashlib.blake2b(np.ascontiguousarray(positions, dtype=np.int64).tobytes(), digest_size=16).digest()
+
+    def get(self, positions):
+        """positions 장소의 마커 레이어를 (PrerenderedLayer, 대용량 모드 여부)로 반환합니다."""
+        key = self._key(positions)
+        with self._lock:
+            entry = self._layers.get(key)
+            if entry is not None:
+                self._layers.move_to_end(key)
+        if entry is None:
+            layer = folium.FeatureGroup(name="장소")
+            high_volume = add_poi_markers(layer, self.store.rows(positions))
+            entry = (*prerender_layer(layer), high_volume)
+            with self._lock:
+                self._layers[key] = entry
+                if len(self._layers) > self.max_entries:
+                    self._layers.popitem(last=False)
+        script, default_js, default_css, high_volume = entry
+        return PrerenderedLayer(script, default_js, default_css), high_volume
+
+    def prewarm(self, position_sets):
+        """자주 쓰는 장소 집합의 레이어를 미리 렌더링해 둡니다."""
+        for positions in position_sets:
+            self.get(positions)
+
+    def prewarm_in_background(self, position_sets):
+        """
+        prewarm을 백그라운드 스레드에서 캐시 객체당 한 번만 실행합니다. 실행을 시작했으면 True를 반환합니다.
+        캐시를 비워 객체를 새로 만들면(st.cache_resource.clear(), 코드 변경) 새 객체도 다시 예열합니다.
+        """
+        with self._lock:
+            if self._prewarm_started:
+                return False
+            self._prewarm_started = True
+        return start_background("marker_layers", lambda: self.prewarm(position_sets))
+
+
+# --- 페이지 간 공유 자원 ---
+# 지도를 보여 주는 페이지(main.py, pages/00)가 모두 이 함수를 쓰므로, 장소 저장소와 마커 레이어 캐시를 모든 세션과 페이지가 함께 씀
+@st.cache_resource(show_spinner=False)
+def get_poi_store():
+    """장소 저장소를 프로세스당 한 번만 읽어 반환합니다."""
+    return load_poi_store()
+
+
+@st.cache_resource(show_spinner=False)
+def get_marker_layer_cache(types=None):
+    """
+    types(카테고리 튜플, None이면 전체)를 보여 주는 페이지의 마커 레이어 캐시를 반환합니다.
+    자주 쓰는 조합(도시별 전체 카테고리)은 첫 화면을 그리는 동안 백그라운드에서 미리 렌더링해 둡니다.
+    """
+    store = get_poi_store()
+    cache = MarkerLayerCache(store)
+    cache.prewarm_in_background(
+        select_visible(store.index, store.select(city, types)) for city in [None, *CITY_AREAS]
+    )
+    return cache
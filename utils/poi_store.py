@@ -0,0 +1,106 @@
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from utils.spatial_index import GridIndex
+
+# --- 장소(POI) 저장소 설정 ---
+# `.parquet` 또는 `.csv` 파일(name, type, desc, lat, lon 컬럼)을 읽습니다. 기본값은 저장소에 포함된 캘리포니아 장소 목록입니다.
+POI_DATA_PATH = Path(os.environ.get("POI_DATA_PATH", Path(__file__).resolve().parent.parent / "data" / "california_pois.csv"))
+# 지정하면 합성 장소 N개를 더해 대량 데이터에서의 처리·렌더링 성능을 측정할 수 있습니다. (벤치마크용)
+SYNTHETIC_POI_COUNT = int(os.environ.get("SYNTHETIC_POI_COUNT") or 0)
+POI_TYPES = ("관광지", "맛집", "숙소") # 카테고리 순서 (선택 상자에 이 순서로 표시)
+CALIFORNIA_BOUNDS = ((32.5, -124.4), (42.0, -114.1)) # (남서, 북동) 위도·경도
+
+# 도시 구역: 도시 중심(위도, 경도)과 반경(km). 불러올 때 한 번 계산해 city 컬럼과 도시별 위치 배열로 저장합니다.
+CITY_AREAS = {
+    "샌프란시스코": (37.7749, -122.4194, 20),
+    "로스앤젤레스": (34.0522, -118.2437, 60), # 애너하임(디즈니랜드)까지 포함
+    "요세미티": (37.8000, -119.6000, 30),
+    "샌디에이고": (32.7157, -117.1611, 30),
+}
+
+
+def _read_only(array):
+    array.setflags(write=False) # 모든 세션이 공유하므로 실수로 바꾸지 못하게 함
+    return array
+
+
+class PoiStore:
+    """
+    프로세스 전체가 공유하는 읽기 전용 장소 목록입니다.
+    type과 city는 범주형(categorical) 컬럼이고, 도시·카테고리별 행 위치와 공간 색인을 불러올 때 미리 계산해 둡니다.
+    필터는 DataFrame을 복사하지 않고 행 위치 배열을 돌려주며, 화면에 보여줄 행만 rows()로 꺼냅니다.
+    """
+
+    def __init__(self, frame):
+        frame = frame.reset_index(drop=True)
+        types = list(dict.fromkeys([*POI_TYPES, *frame["type"].dropna().unique()]))
+        frame["type"] = pd.Categorical(frame["type"], categories=[t for t in types if (frame["type"] == t).any()])
+        self.index = GridIndex(frame["lat"], frame["lon"])
+
+        # 도시 소속을 반경 질의로 한 번만 계산 (구역이 겹치면 먼저 나온 도시에 속함)
+        city_codes = np.full(len(frame), -1, dtype=np.int8)
+        for code, (lat, lon, radius_km) in reversed(list(enumerate(CITY_AREAS.values()))):
+            city_codes[self.index.query_radius(lat, lon, radius_km)] = code
+        frame["city"] = pd.Categorical.from_codes(city_codes, categories=list(CITY_AREAS))
+
+        self.frame = frame
+        self.lat = _read_only(frame["lat"].to_numpy(dtype=np.float64))
+        self.lon = _read_only(frame["lon"].to_numpy(dtype=np.float64))
+        self.type_codes = _read_only(frame["type"].cat.codes.to_numpy())
+        self.all_positions = _read_only(np.arange(len(frame)))
+        self.city_positions = {city: _read_only(np.flatnonzero(city_codes == code)) for code, city in enumerate(CITY_AREAS)}
+
+    def __len__(self):
+        return len(self.frame)
+
+    @property
+    def types(self):
+        return list(self.frame["type"].cat.categories)
+
+    def select(self, city=None, types=None):
+        """도시(None이면 전체)와 카테고리 목록(None이면 전체)에 맞는 행 위치 배열을 반환합니다."""
+        positions = self.city_positions[city] if city is not None else self.all_positions
+        if types is not None:
+            codes = [self.types.index(t) for t in types if t in self.types]
+            positions = positions[np.isin(self.type_codes[positions], codes)]
+        return positions
+
+    def rows(self, positions):
+        """positions에 해당하는 행을 꺼냅니다. 전체를 고른 경우에는 복사하지 않고 원본을 그대로 돌려주므로 읽기 전용으로만 쓰세요."""
+        if len(positions) == len(self.frame):
+            return self.frame
+        return self.frame.iloc[positions]
+
+
+def read_pois(path=POI_DATA_PATH):
+    path = Path(path)
+    columns = ["name", "type", "desc", "lat", "lon"]
+    if path.suffix == ".parquet":
+        return pd.read_parquet(path, columns=columns)
+    return pd.read_csv(path, usecols=columns, dtype={"lat": np.float64, "lon": np.float64})
+
+
+def synthetic_pois(count, seed=0):
+    """벤치마크용 합성 장소 목록을 캘리포니아 범위 안에 무작위로 만듭니다."""
+    rng = np.random.default_rng(seed)
+    (south, west), (north, east) = CALIFORNIA_BOUNDS
+    types = np.array(POI_TYPES)
+    return pd.DataFrame({
+        "name": pd.Series(np.arange(count)).map("합성 장소 {:05d}".format),
+        "type": types[rng.integers(0, len(types), count)],
+        "desc": "벤치마크용 합성 데이터",
+        "lat": rng.uniform(south, north, count),
+        "lon": rng.uniform(west, east, count),
+    })
+
+
+def load_poi_store(path=POI_DATA_PATH, synthetic_count=SYNTHETIC_POI_COUNT):
+    """장소 파일을 읽어 PoiStore를 만듭니다. 페이지에서는 st.cache_resource로 감싸 프로세스당 한 번만 부르세요."""
+    frame = read_pois(path)
+    if synthetic_count:
+        frame = pd.concat([frame, synthetic_pois(synthetic_count)], ignore_index=True)
+    return PoiStore(frame)
@@ -0,0 +1,126 @@
+import datetime
+import json
+import os
+import threading
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+# --- 저장소 위치 ---
+# 여러 서버(파드)가 같은 볼륨을 공유한다면 PRICE_STORE_DIR 환경 변수로 공유 경로를 지정하세요.
+DEFAULT_STORE_DIR = Path(__file__).resolve().parent.parent / ".cache" / "prices"
+PRICE_STORE_DIR = Path(os.environ.get("PRICE_STORE_DIR", DEFAULT_STORE_DIR))
+
+# 겹치는 날짜의 저장 가격과 새 가격이 이 비율 이상 다르면 분할/배당으로 과거 조정 가격이 바뀐 것으로 판단
+ADJUSTMENT_RTOL = 1e-4
+# 받아 둔 기간을 Parquet 파일 자체의 메타데이터에 이 키로 저장 (가격과 기간이 한 파일이라 한 번의 교체로 함께 바뀜)
+COVERAGE_METADATA_KEY = b"price_store.coverage"
+
+
+def settled_end(end_date_obj):
+    """오늘 이후 날짜는 아직 확정되지 않았으므로, 저장소가 보장할 수 있는 마지막 기간 끝(포함하지 않음)으로 잘라냅니다."""
+    return min(end_date_obj, datetime.date.today())
+
+
+class PriceStore:
+    """
+    티커별 조정 종가(Close) 이력을 Parquet 파일로 디스크에 보관하는 저장소입니다.
+    각 티커는 `<티커>.parquet` 파일 하나로 저장되며, 이미 받아 둔 기간은 같은 파일의 메타데이터에 함께 기록합니다.
+    가격과 기간을 항상 한 파일에서 함께 읽으므로, 다른 세션이 저장하는 중에 읽어도 새 가격과 이전 기간이 섞이지 않습니다.
+    """
+
+    def __init__(self, root=PRICE_STORE_DIR):
+        self.root = Path(root)
+
+    def _path(self, ticker):
+        safe_name = ticker.replace("/", "_") # 파일 이름에 쓸 수 없는 문자 치환
+        return self.root / f"{safe_name}.parquet"
+
+    @staticmethod
+    def _parse_coverage(metadata):
+        raw = (metadata or {}).get(COVERAGE_METADATA_KEY)
+        if raw is None: # 기간 정보가 없는 파일(이전 형식)은 저장되지 않은 것으로 보고 새로 받음
+            return None
+        meta = json.loads(raw)
+        return datetime.date.fromisoformat(meta["start"]), datetime.date.fromisoformat(meta["end"])
+
+    def coverage(self, ticker):
+        """저장된 기간 (start, end)을 반환합니다. end는 yfinance와 같이 포함하지 않는 날짜입니다. 없으면 None."""
+        try:
+            return self._parse_coverage(pq.read_schema(self._path(ticker)).metadata) # 파일 끝의 스키마만 읽음
+        except FileNotFoundError:
+            return None
+
+    def _load(self, ticker):
+        """저장된 Close Series와 기간을 한 번에 읽어 (close, (start, end))로 반환합니다. 없으면 (None, None)."""
+        try:
+            # 파일을 한 번만 열어 읽음. 경로로 읽으면 여러 번 열면서 도중에 교체된 다른 파일의 일부를 섞어 읽을 수 있음
+            with open(self._path(ticker), "rb") as file:
+                table = pq.read_table(file)
+        except FileNotFoundError:
+            return None, None
+        covered = self._parse_coverage(table.schema.metadata)
+        if covered is None:
+            return None, None
+        return table.to_pandas()["Close"], covered
+
+    def read(self, ticker, start_date_obj, end_date_obj):
+        """요청한 기간 전체가 저장되어 있으면 해당 구간의 Close Series를, 아니면 None을 반환합니다."""
+        close, covered = self._load(ticker)
+        if covered is None or covered[0] > start_date_obj or covered[1] < settled_end(end_date_obj):
+            return None
+        return close.loc[pd.Timestamp(start_date_obj):pd.Timestamp(end_date_obj) - pd.Timedelta(days=1)]
+
+    def tail_start(self, ticker, start_date_obj, end_date_obj):
+        """
+        저장된 이력 뒤에 빠진 구간만 받으면 되는 경우, 다운로드를 시작할 날짜를 반환합니다.
+        조정 여부를 확인할 수 있도록 마지막으로 저장된 거래일부터(하루 겹치게) 받습니다.
+        저장된 데이터가 없거나 요청 시작일보다 늦게 시작하면(전체 재다운로드 필요) None을 반환합니다.
+        """
+        close, covered = self._load(ticker)
+        if covered is None or covered[0] > start_date_obj or covered[1] >= settled_end(end_date_obj) or close.empty:
+            return None
+        return close.index[-1].date()
+
+    def append_tail(self, ticker, tail_close, end_date_obj):
+        """
+        새로 받은 뒷부분(tail_close)을 저장된 이력에 이어 붙입니다.
+        겹치는 날짜의 가격이 달라졌다면(분할/배당 조정) 저장하지 않고 False를 반환하므로,
+        호출하는 쪽에서 전체 기간을 다시 받아야 합니다.
+        """
+        stored_close, covered = self._load(ticker)
+        if covered is None:
+            return False
+        overlap = stored_close.index.intersection(tail_close.index)
+        if overlap.empty: # 겹치는 날짜가 없으면 조정 여부를 확인할 수 없음
+            return False
+        if not np.allclose(stored_close.loc[overlap], tail_close.loc[overlap], rtol=ADJUSTMENT_RTOL, equal_nan=True):
+            return False
+
+        new_rows = tail_close.loc[tail_close.index > stored_close.index[-1]]
+        merged_close = pd.concat([stored_close, new_rows]) if not new_rows.empty else stored_close
+        self.write(ticker, merged_close, covered[0], end_date_obj)
+        return True
+
+    def write(self, ticker, close, start_date_obj, end_date_obj):
+        """
+        Close Series와 받아 온 기간을 저장합니다. 다른 프로세스가 읽는 중이어도 안전하도록 임시 파일을 교체합니다.
+        기간은 같은 파일의 메타데이터에 들어가므로 가격과 기간이 한 번의 교체로 함께 바뀝니다.
+        """
+        self.root.mkdir(parents=True, exist_ok=True)
+        data_path = self._path(ticker)
+
+        end_date_obj = settled_end(end_date_obj)
+        frame = close.rename("Close").to_frame()
+        frame.index.name = "Date"
+        table = pa.Table.from_pandas(frame)
+        coverage = json.dumps({"start": start_date_obj.isoformat(), "end": end_date_obj.isoformat()})
+        table = table.replace_schema_metadata({**(table.schema.metadata or {}), COVERAGE_METADATA_KEY: coverage.encode("utf-8")})
+
+        # 같은 프로세스의 여러 스레드가 같은 티커를 동시에 저장해도 임시 파일이 겹치지 않도록 스레드 ID까지 붙임
+        tmp_data_path = data_path.with_suffix(f".parquet.{os.getpid()}.{threading.get_ident()}.tmp")
+        pq.write_table(table, tmp_data_path)
+        os.replace(tmp_data_path, data_path)
@@ -0,0 +1,70 @@
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+TRADING_DAYS_PER_YEAR = 252 # 연율화에 사용하는 연간 거래일 수
+DEFAULT_VOLATILITY_WINDOW = 21 # 롤링 변동성 창 크기 (약 1개월)
+
+
+def rebase_to_first_valid(prices_df, base=100.0):
+    """
+    각 컬럼의 첫 번째 유효값을 base(기본 100)로 맞추어 정규화합니다.
+    컬럼별 반복 없이 float32 배열 한 번의 연산으로 처리하며, 유효값이 없거나 0인 컬럼은 제외합니다.
+    """
+    values = prices_df.to_numpy(dtype=np.float32, copy=True)
+    valid_mask = ~np.isnan(values)
+    first_valid_rows = valid_mask.argmax(axis=0) # 컬럼별 첫 유효값의 행 위치 (bfill().iloc[0]과 같은 결과)
+    initial_values = values[first_valid_rows, np.arange(values.shape[1])]
+    keep = valid_mask.any(axis=0) & (initial_values != 0)
+
+    rebased = values[:, keep]
+    rebased *= (base / initial_values[keep])[np.newaxis, :] # 새 배열에 바로 곱해 중간 복사본을 만들지 않음
+    return pd.DataFrame(rebased, index=prices_df.index, columns=prices_df.columns[keep])
+
+
+def log_returns(prices_df):
+    """일간 로그 수익률을 계산합니다. 첫 행과 가격이 없는 날은 NaN입니다."""
+    values = prices_df.to_numpy(dtype=np.float32)
+    returns = np.full_like(values, np.nan)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        np.log(values[1:] / values[:-1], out=returns[1:])
+    return pd.DataFrame(returns, index=prices_df.index, columns=prices_df.columns)
+
+
+def rolling_volatility(returns_df, window=DEFAULT_VOLATILITY_WINDOW):
+    """로그 수익률의 롤링 표준편차를 연율화한 변동성을 계산합니다."""
+    return returns_df.rolling(window, min_periods=window).std() * np.sqrt(TRADING_DAYS_PER_YEAR)
+
+
+def drawdown(prices_df):
+    """각 시점의 가격이 그때까지의 최고가 대비 얼마나 하락했는지(0 ~ -1)를 계산합니다."""
+    values = prices_df.to_numpy(dtype=np.float32)
+    running_max = np.fmax.accumulate(values, axis=0) # NaN을 건너뛰는 누적 최댓값
+    with np.errstate(divide="ignore", invalid="ignore"):
+        result = values / running_max - 1
+    return pd.DataFrame(result, index=prices_df.index, columns=prices_df.columns)
+
+
+@dataclass(frozen=True)
+class PriceMetrics:
+    """한 데이터셋에서 파생한 지표 묶음. 한 번 계산해 캐시해 두고 화면 곳곳에서 재사용합니다."""
+    normalized: pd.DataFrame
+    log_returns: pd.DataFrame
+    volatility: pd.DataFrame
+    drawdown: pd.DataFrame
+    correlation: pd.DataFrame
+
+
+def compute_price_metrics(prices_df, base=100.0, volatility_window=DEFAULT_VOLATILITY_WINDOW):
+    """정규화 가격, 로그 수익률, 롤링 변동성, 낙폭, 수익률 상관 행렬을 한 번에 계산합니다."""
+    normalized = rebase_to_first_valid(prices_df, base=base)
+    prices_df = prices_df[normalized.columns] # 정규화할 수 없는 컬럼은 다른 지표에서도 제외
+    returns = log_returns(prices_df)
+    return PriceMetrics(
+        normalized=normalized,
+        log_returns=returns,
+        volatility=rolling_volatility(returns, window=volatility_window),
+        drawdown=drawdown(prices_df),
+        correlation=returns.corr(),
+    )
@@ -0,0 +1,172 @@
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+
+import numpy as np
+
+from utils.photosynthesis import MAX_RATE, calculate_photosynthesis
+
+# --- 몬테카를로 민감도 분석 ---
+# 분포 지정 방식: (종류, 값1, 값2) 튜플. 해시 가능한 값이라 결과 캐시의 키로 그대로 쓸 수 있습니다.
+#   ("fixed", 값, 0)            항상 같은 값
+#   ("normal", 평균, 표준편차)   측정 잡음이 있는 값 (예: 흔들리는 빛의 세기)
+#   ("uniform", 최솟값, 최댓값)  범위 안에서 고르게
+#   ("swing", 평균, 진폭)       하루 주기로 오르내리는 값 (예: 일교차가 있는 온도)
+FACTORS = ("light", "temp", "co2")
+NON_NEGATIVE = {"light": True, "temp": False, "co2": True} # 음수가 될 수 없는 요인은 0에서 자름
+HISTOGRAM_BINS = np.linspace(0, MAX_RATE, 201)
+REPORTED_QUANTILES = (5, 25, 50, 75, 95)
+DEFAULT_CHUNK_SIZE = 100_000 # 작업 하나가 한 번에 계산하는 표본 수 (메모리 사용량과 작업 분배의 균형)
+MAX_WORKERS = int(os.environ.get("SENSITIVITY_MAX_WORKERS", os.cpu_count() or 1)) # 기본 작업 프로세스 수
+
+_pools = {} # {작업 프로세스 수: ProcessPoolExecutor}
+_pool_lock = threading.Lock()
+
+
+def make_spec(kind, center, spread):
+    """중심값과 퍼짐 정도로 분포 지정 튜플을 만듭니다. 균등 분포는 중심 ± spread 범위를 씁니다."""
+    if kind == "fixed":
+        return ("fixed", float(center), 0.0)
+    if kind == "uniform":
+        return ("uniform", float(center - spread), float(center + spread))
+    return (kind, float(center), float(spread))
+
+
+def sample_factor(spec, size, rng):
+    """분포 지정 spec에서 size개의 표본을 뽑습니다."""
+    kind, first, second = spec
+    if kind == "fixed":
+        return np.full(size, first, dtype=np.float64)
+    if kind == "normal":
+        return rng.normal(first, second, size)
+    if kind == "uniform":
+        return rng.uniform(first, second, size)
+    if kind == "swing":
+        return first + second * np.sin(2 * np.pi * rng.random(size))
+    raise ValueError(f"알 수 없는 분포 종류입니다: {kind}")
+
+
+def sample_conditions(specs, size, rng):
+    """세 요인의 표본을 (빛, 온도, CO2) 순서의 배열 목록으로 뽑습니다."""
+    samples = []
+    for factor in FACTORS:
+        values = sample_factor(specs[factor], size, rng)
+        if NON_NEGATIVE[factor]:
+            np.maximum(values, 0, out=values)
+        samples.append(values)
+    return samples
+
+
+def _simulate_chunk(specs, size, seed_sequence):
+    """
+    표본 한 묶음을 계산해 합계만 돌려줍니다 (작업 프로세스에서 실행).
+    Sobol 지수는 Saltelli 방식: 독립 표본 A, B와 A의 i번째 요인만 B로 바꾼 AB_i를 사용합니다.
+    """
+    rng = np.random.default_rng(seed_sequence)
+    a = sample_conditions(specs, size, rng)
+    b = sample_conditions(specs, size, rng)
+    f_a = calculate_photosynthesis(*a)
+    f_b = calculate_photosynthesis(*b)
+
+    first_order_sums = np.empty(len(FACTORS))
+    total_order_sums = np.empty(len(FACTORS))
+    for i in range(len(FACTORS)):
+        ab = list(a)
+        ab[i] = b[i]
+        f_ab = calculate_photosynthesis(*ab)
+        first_order_sums[i] = np.sum(f_b * (f_ab - f_a)) # Saltelli (2010) 1차 지수 추정량
+        total_order_sums[i] = 0.5 * np.sum((f_a - f_ab) ** 2) # Jansen 전체 지수 추정량
+
+    return {
+        "count": size,
+        "sum": f_a.sum() + f_b.sum(),
+        "sum_sq": np.square(f_a).sum() + np.square(f_b).sum(),
+        "first_order_sums": first_order_sums,
+        "total_order_sums": total_order_sums,
+        "histogram": np.histogram(f_a, bins=HISTOGRAM_BINS)[0],
+    }
+
+
+def _get_pool(max_workers):
+    """작업 프로세스 수가 max_workers인 풀을 처음 필요할 때 한 번만 만들어 재사용합니다."""
+    with _pool_lock:
+        pool = _pools.get(max_workers)
+        if pool is None:
+            # Streamlit 서버처럼 스레드가 많은 프로세스에서 fork는 안전하지 않으므로 forkserver(없으면 spawn) 사용
+            method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+            pool = _pools[max_workers] = ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context(method))
+        return pool
+
+
+@dataclass(frozen=True)
+class MonteCarloResult:
+    """몬테카를로 분석 결과 요약. 표본 자체는 보관하지 않습니다."""
+    n_samples: int
+    mean: float
+    std: float
+    quantiles: dict # {백분위: 광합성량}
+    histogram: np.ndarray # HISTOGRAM_BINS 구간별 표본 수
+    first_order: dict # {요인: 1차 Sobol 지수}
+    total_order: dict # {요인: 전체 Sobol 지수}
+
+
+def _histogram_quantile(histogram, percent):
+    cumulative = np.cumsum(histogram) / histogram.sum()
+    return float(np.interp(percent / 100, np.concatenate([[0], cumulative]), HISTOGRAM_BINS))
+
+
+def run_monte_carlo(specs, n_samples, chunk_size=DEFAULT_CHUNK_SIZE, max_workers=MAX_WORKERS, seed=0):
+    """
+    specs({요인: 분포 지정})에 따라 환경 조건을 n_samples개 뽑아 광합성량 분포와 Sobol 민감도 지수를 계산합니다.
+    표본은 chunk_size씩 나누어 max_workers개 프로세스의 풀에서 병렬로 계산하고, 묶음마다 합계만 모아 합칩니다.
+    max_workers가 1 이하이면 프로세스 풀 없이 현재 프로세스에서 계산합니다. (기본값은 SENSITIVITY_MAX_WORKERS 환경 변수)
+    """
+    sizes = [chunk_size] * (n_samples // chunk_size)
+    if n_samples % chunk_size:
+        sizes.append(n_samples % chunk_size)
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes)) # 묶음마다 독립적이고 재현 가능한 난수열
+
+    if len(sizes) == 1 or max_workers <= 1:
+        chunks = [_simulate_chunk(specs, size, s) for size, s in zip(sizes, seeds)]
+    else:
+        chunks = list(_get_pool(max_workers).map(_simulate_chunk, [specs] * len(sizes), sizes, seeds))
+
+    count = sum(c["count"] for c in chunks)
+    total = sum(c["sum"] for c in chunks)
+    total_sq = sum(c["sum_sq"] for c in chunks)
+    mean = total / (2 * count)
+    variance = max(total_sq / (2 * count) - mean ** 2, 0.0)
+    first_order_sums = sum(c["first_order_sums"] for c in chunks)
+    total_order_sums = sum(c["total_order_sums"] for c in chunks)
+    histogram = sum(c["histogram"] for c in chunks)
+
+    if variance > 0:
+        first_order = first_order_sums / count / variance
+        total_order = total_order_sums / count / variance
+    else: # 모든 요인이 고정이면 분산이 없어 민감도를 정의할 수 없음
+        first_order = total_order = np.zeros(len(FACTORS))
+
+    return MonteCarloResult(
+        n_samples=count,
+        mean=float(mean),
+        std=float(np.sqrt(variance)),
+        quantiles={q: _histogram_quantile(histogram, q) for q in REPORTED_QUANTILES},
+        histogram=histogram,
+        first_order=dict(zip(FACTORS, first_order.tolist())),
+        total_order=dict(zip(FACTORS, total_order.tolist())),
+    )
+
+
+def curve_bands(specs, axis, x_values, n_samples=2000, percentiles=(5, 50, 95), seed=0):
+    """
+    axis 요인을 x_values로 바꿔 가며, 나머지 두 요인을 분포에서 뽑았을 때의 광합성량 백분위 곡선을 계산합니다.
+    {백분위: x_values와 같은 길이의 배열}을 반환합니다.
+    """
+    rng = np.random.default_rng(seed)
+    conditions = sample_conditions(specs, n_samples, rng)
+    conditions = [values[np.newaxis, :] for values in conditions] # (1, 표본)
+    conditions[FACTORS.index(axis)] = np.asarray(x_values, dtype=np.float64)[:, np.newaxis] # (점, 1)
+    rates = calculate_photosynthesis(*conditions) # (점, 표본)
+    return dict(zip(percentiles, np.percentile(rates, percentiles, axis=1)))
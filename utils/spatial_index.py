@@ -0,0 +1,65 @@
+import numpy as np
+
+EARTH_RADIUS_KM = 6371.0088
+DEFAULT_CELL_DEG = 0.05 # 격자 한 칸의 크기 (위도 0.05° ≈ 5.5km)
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    """두 지점(또는 브로드캐스팅 가능한 배열) 사이의 대원 거리(km)를 계산합니다."""
+    lat1, lon1, lat2, lon2 = (np.radians(np.asarray(v, dtype=np.float64)) for v in (lat1, lon1, lat2, lon2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0, 1)))
+
+
+class GridIndex:
+    """
+    위도·경도 점들을 일정한 크기의 격자 칸으로 나눠 둔 공간 색인입니다.
+    점을 칸 번호 순으로 정렬해 두고, 질의할 때는 겹치는 칸의 구간만 이진 탐색으로 찾은 뒤 정확한 조건으로 걸러냅니다.
+    질의 결과는 원래 배열에서의 위치(정렬된 정수 배열)이므로 DataFrame.iloc 등에 그대로 쓸 수 있습니다.
+    """
+
+    def __init__(self, lat, lon, cell_deg=DEFAULT_CELL_DEG):
+        self.lat = np.asarray(lat, dtype=np.float64)
+        self.lon = np.asarray(lon, dtype=np.float64)
+        self.cell_deg = cell_deg
+        if len(self.lat) == 0:
+            self.lat0 = self.lon0 = 0.0
+            self.n_rows = self.n_cols = 1
+        else:
+            self.lat0, self.lon0 = self.lat.min(), self.lon.min()
+            self.n_rows = int((self.lat.max() - self.lat0) // cell_deg) + 1
+            self.n_cols = int((self.lon.max() - self.lon0) // cell_deg) + 1
+        cell_ids = self._row(self.lat) * self.n_cols + self._col(self.lon)
+        self.order = np.argsort(cell_ids, kind="stable")
+        self.sorted_cells = cell_ids[self.order]
+
+    def __len__(self):
+        return len(self.lat)
+
+    def _row(self, lat):
+        return np.clip(np.floor_divide(np.asarray(lat) - self.lat0, self.cell_deg), 0, self.n_rows - 1).astype(np.int64)
+
+    def _col(self, lon):
+        return np.clip(np.floor_divide(np.asarray(lon) - self.lon0, self.cell_deg), 0, self.n_cols - 1).astype(np.int64)
+
+    def query_bbox(self, south, west, north, east):
+        """경계 상자(남, 서, 북, 동) 안에 있는 점들의 위치를 반환합니다."""
+        if len(self) == 0 or south > north or west > east:
+            return np.empty(0, dtype=np.int64)
+        rows = np.arange(self._row(south), self._row(north) + 1)
+        col_start, col_end = self._col(west), self._col(east)
+        # 격자 한 행에서 겹치는 칸들은 칸 번호가 연속이므로, 행마다 정렬된 배열의 한 구간이 됨
+        starts = np.searchsorted(self.sorted_cells, rows * self.n_cols + col_start, side="left")
+        ends = np.searchsorted(self.sorted_cells, rows * self.n_cols + col_end, side="right")
+        candidates = np.concatenate([self.order[s:e] for s, e in zip(starts, ends)])
+        lat, lon = self.lat[candidates], self.lon[candidates]
+        inside = (lat >= south) & (lat <= north) & (lon >= west) & (lon <= east)
+        return np.sort(candidates[inside])
+
+    def query_radius(self, lat, lon, radius_km):
+        """(lat, lon)에서 radius_km 이내에 있는 점들의 위치를 반환합니다."""
+        dlat = np.degrees(radius_km / EARTH_RADIUS_KM)
+        dlon = dlat / max(np.cos(np.radians(lat)), 1e-6)
+        candidates = self.query_bbox(lat - dlat, lon - dlon, lat + dlat, lon + dlon)
+        distances = haversine_km(lat, lon, self.lat[candidates], self.lon[candidates])
+        return candidates[distances <= radius_km]
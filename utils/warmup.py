@@ -0,0 +1,71 @@
+import importlib
+import logging
+import os
+import threading
+
+# --- 백그라운드 예열 설정 ---
+# 첫 페이지를 그린 뒤, 다른 페이지가 쓸 무거운 모듈을 백그라운드 스레드에서 미리 불러옵니다. WARMUP_ON_START=0 이면 끕니다.
+WARMUP_ON_START = os.environ.get("WARMUP_ON_START", "1").lower() not in ("0", "false", "no")
+# 미리 불러올 모듈 (페이지를 처음 열 때 import에 가장 오래 걸리는 것들)
+WARMUP_MODULES = (
+    "pandas",
+    "altair", # st.line_chart
+    "utils.market_data",
+    "utils.price_store",
+    "folium",
+    "streamlit_folium",
+    "utils.poi_map",
+    "utils.curve_renderer", # matplotlib
+    "plotly.graph_objects",
+    "plotly.subplots",
+    "utils.sensitivity",
+)
+
+logger = logging.getLogger("warmup")
+
+_started = set()
+_started_lock = threading.Lock()
+
+
+def run_in_background(name, func):
+    """
+    func를 데몬 스레드에서 프로세스당 한 번만 실행합니다. (같은 name으로 다시 불러도 무시)
+    모듈 import처럼 프로세스가 살아 있는 동안 결과가 유지되는 작업에만 쓰세요. 다시 만들 수 있는 객체의 예열은 객체마다 start_background로 실행합니다.
+    예열이 꺼져 있거나 이미 시작했으면 False를 반환합니다. 실패해도 페이지에는 영향이 없고 로그만 남깁니다.
+    """
+    if not WARMUP_ON_START:
+        return False
+    with _started_lock:
+        if name in _started:
+            return False
+        _started.add(name)
+    return start_background(name, func)
+
+
+def start_background(name, func):
+    """func를 데몬 스레드에서 실행합니다. 예열이 꺼져 있으면 실행하지 않고 False를 반환합니다. 실패하면 로그만 남깁니다."""
+    if not WARMUP_ON_START:
+        return False
+
+    def target():
+        try:
+            func()
+        except Exception:
+            logger.exception("예열 작업 '%s' 실패", name)
+
+    threading.Thread(target=target, name=f"warmup-{name}", daemon=True).start()
+    return True
+
+
+def _import_modules(names):
+    for name in names:
+        importlib.import_module(name)
+    # plotly는 그래프 종류와 레이아웃 검사기를 처음 쓸 때 불러오므로, 광합성 페이지에서 쓰는 그래프를 한 번 만들어 둠
+    if "plotly.graph_objects" in names:
+        go = importlib.import_module("plotly.graph_objects")
+        go.Figure(data=[go.Scatter(), go.Bar(), go.Surface(), go.Isosurface()])
+
+
+def preload_modules(names=WARMUP_MODULES):
+    """무거운 모듈을 백그라운드에서 미리 불러옵니다. 메인 페이지를 다 그린 뒤에 부르세요."""
+    return run_in_background("modules", lambda: _import_modules(names))